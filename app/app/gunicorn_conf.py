@@ -0,0 +1,164 @@
+"""
+Gunicorn config for production serving.
+
+Serve WSGI with threaded workers:
+
+    gunicorn -c python:app.gunicorn_conf app.wsgi:application
+
+or ASGI, with core.asgi serving the views from WEB_THREADS threads:
+
+    WEB_WORKER_CLASS=uvicorn.workers.UvicornH11Worker \\
+        gunicorn -c python:app.gunicorn_conf app.asgi:application
+
+A Python process keeps one core busy at most, so there is a worker per
+available core. While a request waits on the database or the network its
+thread does not need the core, a worker whose requests wait WEB_IO_RATIO
+times as long as they compute needs 1 + WEB_IO_RATIO threads to keep it
+busy. WEB_WORKERS and WEB_THREADS override the derived counts.
+
+The application is loaded once in the master and forked, so workers share
+its memory copy-on-write. Workers are recycled after about
+WEB_MAX_REQUESTS requests, or gracefully once their resident memory
+exceeds WEB_MAX_WORKER_MEMORY_MB.
+
+Every worker must see the same versions, so with more than one worker
+the VERSION_CACHE_ALIAS cache, and REPLICA_PIN_CACHE_ALIAS with
+replicas, must be shared, e.g. CACHE_BACKEND set to memcached. Gunicorn
+refuses to start while they are local memory caches.
+
+Reloads: SIGHUP starts new workers and lets old ones finish their
+requests for up to WEB_GRACEFUL_TIMEOUT seconds, with the already loaded
+code. To deploy new code without downtime send SIGUSR2, which starts a
+new master next to the old one, then SIGQUIT to the old master.
+"""
+
+import gc
+import math
+import os
+import signal
+import sys
+import threading
+import time
+
+
+def cpu_count():
+    """Return the cores this process may use, honouring cgroup quotas"""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+
+    try:
+        with open('/sys/fs/cgroup/cpu.max') as cpu_max:
+            quota, period = cpu_max.read().split()
+        if quota != 'max':
+            cpus = min(cpus, math.ceil(int(quota) / int(period)))
+    except (OSError, ValueError):
+        pass
+
+    return max(1, cpus)
+
+
+def worker_count(cpus):
+    """Return the number of workers, two at least so one can recycle"""
+    return max(2, cpus)
+
+
+def thread_count(io_ratio):
+    """Return the threads keeping a core busy at an I/O wait to CPU ratio"""
+    return max(1, math.ceil(1 + io_ratio))
+
+
+def local_cache_aliases():
+    """Return the cache aliases workers must share that are per process"""
+    from django.conf import settings
+    aliases = {getattr(settings, 'VERSION_CACHE_ALIAS', 'default')}
+    if getattr(settings, 'DATABASE_REPLICAS', None):
+        aliases.add(
+            getattr(settings, 'REPLICA_PIN_CACHE_ALIAS', None)
+            or getattr(settings, 'VERSION_CACHE_ALIAS', 'default')
+        )
+
+    return sorted(
+        alias for alias in aliases
+        if settings.CACHES[alias]['BACKEND'].endswith('.LocMemCache')
+    )
+
+
+def memory_mb():
+    """Return the resident memory of this process in MB"""
+    with open('/proc/self/statm') as statm:
+        pages = int(statm.read().split()[1])
+
+    return pages * os.sysconf('SC_PAGE_SIZE') / 2 ** 20
+
+
+bind = os.environ.get('WEB_BIND', '0.0.0.0:8000')
+worker_class = os.environ.get('WEB_WORKER_CLASS', 'gthread')
+workers = int(os.environ.get('WEB_WORKERS') or worker_count(cpu_count()))
+threads = int(
+    os.environ.get('WEB_THREADS')
+    or thread_count(float(os.environ.get('WEB_IO_RATIO', 2)))
+)
+# core.asgi reads its pool size from the ASGI_THREADS setting
+raw_env = [f'ASGI_THREADS={threads}']
+
+preload_app = True
+max_requests = int(os.environ.get('WEB_MAX_REQUESTS', 10000))
+max_requests_jitter = max_requests // 10
+max_worker_memory_mb = int(os.environ.get('WEB_MAX_WORKER_MEMORY_MB', 0))
+memory_check_interval = 10
+
+timeout = int(os.environ.get('WEB_TIMEOUT', 30))
+graceful_timeout = int(os.environ.get('WEB_GRACEFUL_TIMEOUT', 30))
+keepalive = int(os.environ.get('WEB_KEEPALIVE', 5))
+# Heartbeat files on tmpfs, a slow overlay filesystem stalls workers
+worker_tmp_dir = '/dev/shm' if os.path.isdir('/dev/shm') else None
+accesslog = os.environ.get('WEB_ACCESS_LOG', '-')
+
+
+def on_starting(server):
+    # A write bumps the versions of the worker that handled it only, the
+    # others would keep answering 304 and serving cached lists
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'app.settings')
+    aliases = local_cache_aliases()
+    if server.num_workers > 1 and aliases:
+        raise RuntimeError(
+            f'{server.num_workers} workers can not share the local memory '
+            f'caches {", ".join(aliases)}, set CACHE_BACKEND to a shared '
+            f'cache or WEB_WORKERS=1'
+        )
+
+
+def pre_fork(server, worker):
+    # Connections opened while loading the application must not be shared
+    # with the workers, and objects alive now are never collected in the
+    # master, so moving them out of the collector's reach keeps the pages
+    # they live on shared
+    from django.db import connections
+    connections.close_all()
+    pooled = sys.modules.get('core.db.backends.postgresql.base')
+    if pooled is not None:
+        pooled.close_pools()
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    if max_worker_memory_mb:
+        threading.Thread(
+            target=_watch_memory, args=(worker,), daemon=True
+        ).start()
+
+
+def _watch_memory(worker):
+    """Stop the worker gracefully once it outgrows its memory limit"""
+    while True:
+        time.sleep(memory_check_interval)
+        usage = memory_mb()
+        if usage > max_worker_memory_mb:
+            worker.log.info(
+                'Worker %s uses %.0fMB, more than %sMB, recycling',
+                worker.pid, usage, max_worker_memory_mb
+            )
+            os.kill(worker.pid, signal.SIGTERM)
+            return
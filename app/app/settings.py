@@ -46,6 +46,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'core.middleware.ReplicaPinMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -78,16 +79,64 @@ WSGI_APPLICATION = 'app.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/3.0/ref/settings/#databases
 
+# Connections are kept open for DB_CONN_MAX_AGE seconds and checked on their
+# first use in every request. Setting DB_POOL_SIZE instead returns them to a
+# pool of at most that many connections per process after every request,
+# for threaded workers, see core.db.backends.postgresql.
+
+DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 0))
+
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.postgresql',
+        'ENGINE': 'core.db.backends.postgresql',
         'HOST': os.environ.get('DB_HOST'),
         'NAME': os.environ.get('DB_NAME'),
         'USER': os.environ.get('DB_USER'),
         'PASSWORD': os.environ.get('DB_PASS'),
+        'CONN_MAX_AGE': 0 if DB_POOL_SIZE else int(
+            os.environ.get('DB_CONN_MAX_AGE', 60)
+        ),
+        'HEALTH_CHECKS': os.environ.get('DB_HEALTH_CHECKS', 'true') == 'true',
+        'POOL': {
+            'MAX_SIZE': DB_POOL_SIZE,
+            'TIMEOUT': float(os.environ.get('DB_POOL_TIMEOUT', 10)),
+            'MAX_IDLE': float(os.environ.get('DB_POOL_MAX_IDLE', 300)),
+            'CHECK_AFTER': float(os.environ.get('DB_POOL_CHECK_AFTER', 10)),
+        } if DB_POOL_SIZE else None,
     }
 }
 
+# Read replicas
+# DB_REPLICA_HOSTS is a comma separated list of host[:port] of replicas of
+# default, added as replica_0, replica_1, ... Reads go to replicas lagging
+# at most REPLICA_MAX_LAG seconds, a client's reads go to the primary for
+# REPLICA_PIN_SECONDS after it wrote, see core.routers. Token clients are
+# pinned through REPLICA_PIN_CACHE_ALIAS, which like VERSION_CACHE_ALIAS
+# must be a cache shared between processes, and defaults to it.
+
+DATABASE_REPLICAS = []
+for _index, _host in enumerate(
+        filter(None, os.environ.get('DB_REPLICA_HOSTS', '').split(','))):
+    _host, _, _port = _host.strip().partition(':')
+    DATABASES[f'replica_{_index}'] = dict(
+        DATABASES['default'],
+        HOST=_host,
+        PORT=_port,
+        TEST={'MIRROR': 'default'},
+    )
+    DATABASE_REPLICAS.append(f'replica_{_index}')
+
+DATABASE_ROUTERS = ['core.routers.ReplicaRouter'] if DATABASE_REPLICAS else []
+REPLICA_MAX_LAG = float(os.environ.get('REPLICA_MAX_LAG', 5))
+REPLICA_LAG_CHECK_INTERVAL = float(
+    os.environ.get('REPLICA_LAG_CHECK_INTERVAL', 1)
+)
+REPLICA_PIN_SECONDS = float(os.environ.get('REPLICA_PIN_SECONDS', 5))
+REPLICA_PIN_COOKIE = os.environ.get('REPLICA_PIN_COOKIE', 'db_pin')
+REPLICA_PIN_CACHE_ALIAS = os.environ.get(
+    'REPLICA_PIN_CACHE_ALIAS', os.environ.get('VERSION_CACHE_ALIAS', 'default')
+)
+
 
 # Password validation
 # https://docs.djangoproject.com/en/3.0/ref/settings/#auth-password-validators
@@ -131,4 +180,142 @@ MEDIA_URL = '/media/'
 MEDIA_ROOT = '/vol/web/media'
 STATIC_ROOT = 'vol/web/static'
 
-AUTH_USER_MODEL = 'core.User'
\ No newline at end of file
+AUTH_USER_MODEL = 'core.User'
+
+
+# Django REST framework
+# https://www.django-rest-framework.org/api-guide/settings/
+
+REST_FRAMEWORK = {
+    'DEFAULT_RENDERER_CLASSES': (
+        'core.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'core.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
+}
+
+
+# Token authentication cache
+# Tokens are cached in-process for TOKEN_CACHE_TTL seconds. Set
+# TOKEN_CACHE_ALIAS to a cache alias shared between processes to add a
+# shared tier, whose token generations make invalidation reach every
+# process at once. Without it, a deleted token or deactivated user keeps
+# authenticating in other processes for up to TOKEN_CACHE_TTL seconds, so
+# the TTL defaults to 5 seconds then.
+
+TOKEN_CACHE_ALIAS = os.environ.get('TOKEN_CACHE_ALIAS')
+TOKEN_CACHE_TTL = int(
+    os.environ.get('TOKEN_CACHE_TTL', 60 if TOKEN_CACHE_ALIAS else 5)
+)
+TOKEN_CACHE_MAX_SIZE = int(os.environ.get('TOKEN_CACHE_MAX_SIZE', 10000))
+TOKEN_CACHE_SHARED_TTL = int(os.environ.get('TOKEN_CACHE_SHARED_TTL', 300))
+
+
+# Post image variants
+# Longest edge in pixels for every size variant, generated in each format
+# by a pool of POST_IMAGE_WORKERS background threads.
+
+POST_IMAGE_VARIANTS = {
+    'thumb': 150,
+    'medium': 600,
+    'large': 1200,
+}
+POST_IMAGE_VARIANT_FORMATS = ('jpeg', 'webp')
+POST_IMAGE_WORKERS = int(os.environ.get('POST_IMAGE_WORKERS', 2))
+
+# Uploads larger than POST_IMAGE_MAX_UPLOAD_SIZE bytes or with more than
+# POST_IMAGE_MAX_PIXELS pixels are rejected while they stream in.
+
+POST_IMAGE_MAX_UPLOAD_SIZE = int(
+    os.environ.get('POST_IMAGE_MAX_UPLOAD_SIZE', 20 * 2 ** 20)
+)
+POST_IMAGE_MAX_PIXELS = int(os.environ.get('POST_IMAGE_MAX_PIXELS', 50000000))
+POST_IMAGE_UPLOAD_FORMATS = ('JPEG', 'MPO', 'PNG', 'WEBP', 'GIF')
+
+
+# Post API list endpoints
+# List rows are read with values() instead of the serializers, set to False
+# to list through the serializers.
+
+POST_VALUES_LIST = True
+
+
+# Conditional GET
+# List and detail responses carry an ETag built from per-user versions kept
+# in the VERSION_CACHE_ALIAS cache. With several processes it must be a
+# cache shared between them.
+
+VERSION_CACHE_ALIAS = os.environ.get('VERSION_CACHE_ALIAS', 'default')
+
+
+# Caches
+# CACHE_BACKEND selects the default cache, e.g. the file based or memcached
+# backends with CACHE_LOCATION. The local memory default is per process.
+
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get(
+            'CACHE_BACKEND',
+            'django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': os.environ.get('CACHE_LOCATION', ''),
+    },
+}
+
+# List responses are cached per user for RESPONSE_CACHE_TIMEOUT seconds in
+# RESPONSE_CACHE_ALIAS. Concurrent misses wait up to RESPONSE_CACHE_LOCK_WAIT
+# seconds for the request that rebuilds the entry.
+
+RESPONSE_CACHE = os.environ.get('RESPONSE_CACHE', 'true') == 'true'
+RESPONSE_CACHE_ALIAS = os.environ.get('RESPONSE_CACHE_ALIAS', 'default')
+RESPONSE_CACHE_TIMEOUT = int(os.environ.get('RESPONSE_CACHE_TIMEOUT', 300))
+RESPONSE_CACHE_LOCK_TIMEOUT = int(
+    os.environ.get('RESPONSE_CACHE_LOCK_TIMEOUT', 10)
+)
+RESPONSE_CACHE_LOCK_WAIT = float(
+    os.environ.get('RESPONSE_CACHE_LOCK_WAIT', 2)
+)
+
+
+# Bulk post creation
+# Largest number of posts accepted by one request to the bulk endpoint.
+
+POST_BULK_MAX_ROWS = int(os.environ.get('POST_BULK_MAX_ROWS', 1000))
+
+
+# Autocomplete
+# The names of a user's tags and items ranked by usage are cached in
+# AUTOCOMPLETE_CACHE_ALIAS under the versions, each process keeps the
+# AUTOCOMPLETE_LOCAL_SIZE most recently used lists in memory as well.
+
+AUTOCOMPLETE_CACHE_ALIAS = os.environ.get('AUTOCOMPLETE_CACHE_ALIAS', 'default')
+AUTOCOMPLETE_CACHE_TIMEOUT = int(
+    os.environ.get('AUTOCOMPLETE_CACHE_TIMEOUT', 3600)
+)
+AUTOCOMPLETE_LOCAL_SIZE = int(os.environ.get('AUTOCOMPLETE_LOCAL_SIZE', 128))
+
+
+# Recommendations
+# The RECOMMENDATION_TOP_K best co-occurring items and tags of every item
+# and tag are cached per user in RECOMMENDATION_CACHE_ALIAS, pairs sharing
+# fewer than RECOMMENDATION_MIN_COUNT posts are ignored.
+
+RECOMMENDATION_TOP_K = int(os.environ.get('RECOMMENDATION_TOP_K', 50))
+RECOMMENDATION_MIN_COUNT = int(os.environ.get('RECOMMENDATION_MIN_COUNT', 2))
+RECOMMENDATION_CACHE_ALIAS = os.environ.get(
+    'RECOMMENDATION_CACHE_ALIAS', 'default'
+)
+RECOMMENDATION_CACHE_TIMEOUT = int(
+    os.environ.get('RECOMMENDATION_CACHE_TIMEOUT', 3600)
+)
+
+
+# ASGI
+# core.asgi serves requests from a pool of ASGI_THREADS threads per process,
+# every thread keeps its own database connection.
+
+ASGI_THREADS = int(os.environ.get('ASGI_THREADS', 16))
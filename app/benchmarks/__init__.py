@@ -0,0 +1,56 @@
+"""Benchmarks, run with `python manage.py benchmark <name>`
+
+Every module in this package exposes `run(stdout, repeat, **options)`,
+options holds `rows` when the seeded data size is configurable. Benchmarks
+write their fixtures inside a transaction that is rolled back afterwards,
+so they can run against any database without leaving data behind.
+"""
+import statistics
+import time
+from contextlib import contextmanager
+
+from django.db import transaction
+
+
+class _Rollback(Exception):
+    pass
+
+
+@contextmanager
+def rolled_back(using=None):
+    """Run the block in a transaction that is always rolled back"""
+    try:
+        with transaction.atomic(using=using):
+            yield
+            raise _Rollback
+    except _Rollback:
+        pass
+
+
+def measure(func, repeat):
+    """Call func repeat times and return the duration of every call"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    return timings
+
+
+def percentile(timings, pct):
+    """Return the pct percentile of a list of timings"""
+    ordered = sorted(timings)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def report(stdout, label, timings):
+    """Write the p50, p99 and mean of a list of timings in microseconds"""
+    stdout.write(
+        f'{label:<40} '
+        f'p50 {percentile(timings, 50) * 1e6:10.1f}us  '
+        f'p99 {percentile(timings, 99) * 1e6:10.1f}us  '
+        f'mean {statistics.mean(timings) * 1e6:10.1f}us  '
+        f'n={len(timings)}'
+    )
@@ -0,0 +1,134 @@
+"""Load test the application servers over HTTP
+
+Starts runserver, gunicorn with threaded workers and gunicorn with uvicorn
+workers in turn, all configured by app.gunicorn_conf, and lets CLIENTS
+keep-alive clients list their tags `--repeat` times in total against each.
+The servers run the current settings module, so the database must be one
+they can all reach, and share a file based cache in a temporary
+directory. The fixtures are committed and deleted afterwards.
+"""
+import http.client
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+
+from rest_framework.authtoken.models import Token
+
+from core.models import Tag
+
+from benchmarks import report
+
+
+CLIENTS = 32
+HOST = '127.0.0.1'
+PORT = 8765
+PATH = '/api/post/tags/'
+GUNICORN = ['gunicorn', '-c', 'python:app.gunicorn_conf']
+
+
+def _servers():
+    yield 'runserver', [
+        sys.executable, 'manage.py', 'runserver', '--noreload',
+        f'{HOST}:{PORT}',
+    ], {}
+    if shutil.which('gunicorn') is None:
+        return
+    yield 'gunicorn gthread', GUNICORN + ['app.wsgi:application'], {}
+    yield 'gunicorn uvicorn', GUNICORN + ['app.asgi:application'], {
+        'WEB_WORKER_CLASS': 'uvicorn.workers.UvicornH11Worker',
+    }
+
+
+def _wait_for_port(process, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError('The server exited on startup')
+        try:
+            socket.create_connection((HOST, PORT), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f'The server did not listen within {timeout}s')
+
+
+def _load(key, requests):
+    timings = []
+    headers = {'Authorization': f'Token {key}'}
+
+    def client(count):
+        connection = http.client.HTTPConnection(HOST, PORT, timeout=30)
+        try:
+            for _ in range(count):
+                start = time.perf_counter()
+                connection.request('GET', PATH, headers=headers)
+                response = connection.getresponse()
+                response.read()
+                if response.status != 200:
+                    raise RuntimeError(f'Status {response.status}')
+                timings.append(time.perf_counter() - start)
+        finally:
+            connection.close()
+
+    clients = [
+        threading.Thread(target=client, args=(requests // CLIENTS,))
+        for _ in range(CLIENTS)
+    ]
+    for thread in clients:
+        thread.start()
+    for thread in clients:
+        thread.join()
+
+    return timings
+
+
+def run(stdout, repeat, **options):
+    requests = max(repeat, CLIENTS)
+    cache_dir = tempfile.TemporaryDirectory()
+    env = dict(
+        os.environ,
+        DJANGO_SETTINGS_MODULE=settings.SETTINGS_MODULE,
+        WEB_BIND=f'{HOST}:{PORT}',
+        WEB_ACCESS_LOG='/dev/null',
+        CACHE_BACKEND='django.core.cache.backends.filebased.FileBasedCache',
+        CACHE_LOCATION=cache_dir.name,
+    )
+    user = get_user_model().objects.create_user(
+        email='benchmark-server@outfitted.com',
+        first_name='Bench',
+        surname='Mark',
+        password='benchmark123',
+    )
+    try:
+        key = Token.objects.create(user=user).key
+        Tag.objects.bulk_create([
+            Tag(user=user, name=f'tag {i}') for i in range(20)
+        ])
+        for label, command, overrides in _servers():
+            process = subprocess.Popen(
+                command,
+                env=dict(env, **overrides),
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+            try:
+                _wait_for_port(process)
+                start = time.perf_counter()
+                timings = _load(key, requests)
+                elapsed = time.perf_counter() - start
+            finally:
+                process.terminate()
+                process.wait()
+            report(stdout, label, timings)
+            stdout.write(f'{"":<40} {len(timings) / elapsed:.1f} requests/s')
+    finally:
+        user.delete()
+        cache_dir.cleanup()
@@ -0,0 +1,143 @@
+"""Compare the pooled ASGI handler with sync WSGI workers under slow clients
+
+CLIENTS concurrent clients list their tags `--repeat` times in total, each
+taking DELAY seconds to deliver a request and DELAY to read the response.
+WSGI is run like sync workers: WORKERS threads each hold a client from its
+first byte to its last. ASGI awaits the clients on the event loop and runs
+the views on a pool of WORKERS threads. The fixtures are committed so every
+thread sees them, and deleted afterwards.
+"""
+import asyncio
+import io
+import threading
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.handlers.wsgi import WSGIHandler
+from django.test import override_settings
+
+from rest_framework.authtoken.models import Token
+
+from core.asgi import ASGIHandler
+from core.models import Tag
+
+from benchmarks import report
+
+
+CLIENTS = 64
+WORKERS = 8
+DELAY = 0.05
+PATH = '/api/post/tags/'
+
+
+def _wsgi(key, requests):
+    handler = WSGIHandler()
+    workers = threading.Semaphore(WORKERS)
+    timings = []
+
+    def start_response(status, headers, exc_info=None):
+        pass
+
+    def client(count):
+        for _ in range(count):
+            start = time.perf_counter()
+            with workers:
+                time.sleep(DELAY)
+                response = handler({
+                    'REQUEST_METHOD': 'GET',
+                    'PATH_INFO': PATH,
+                    'QUERY_STRING': '',
+                    'SERVER_NAME': 'testserver',
+                    'SERVER_PORT': '80',
+                    'HTTP_HOST': 'testserver',
+                    'HTTP_AUTHORIZATION': f'Token {key}',
+                    'wsgi.input': io.BytesIO(),
+                    'wsgi.url_scheme': 'http',
+                }, start_response)
+                b''.join(response)
+                response.close()
+                time.sleep(DELAY)
+            timings.append(time.perf_counter() - start)
+
+    clients = [
+        threading.Thread(target=client, args=(requests // CLIENTS,))
+        for _ in range(CLIENTS)
+    ]
+    for thread in clients:
+        thread.start()
+    for thread in clients:
+        thread.join()
+
+    return timings
+
+
+def _asgi(key, requests):
+    handler = ASGIHandler()
+    timings = []
+    scope = {
+        'type': 'http',
+        'method': 'GET',
+        'path': PATH,
+        'query_string': b'',
+        'headers': [
+            (b'host', b'testserver'),
+            (b'authorization', f'Token {key}'.encode()),
+        ],
+        'server': ('testserver', 80),
+    }
+
+    async def receive():
+        await asyncio.sleep(DELAY)
+        return {'type': 'http.request'}
+
+    async def send(message):
+        if message['type'] == 'http.response.body' and \
+                not message.get('more_body'):
+            await asyncio.sleep(DELAY)
+
+    async def client(count):
+        for _ in range(count):
+            start = time.perf_counter()
+            await handler(scope, receive, send)
+            timings.append(time.perf_counter() - start)
+
+    async def main():
+        await asyncio.gather(*(
+            client(requests // CLIENTS) for _ in range(CLIENTS)
+        ))
+
+    try:
+        asyncio.run(main())
+    finally:
+        handler.executor.shutdown()
+
+    return timings
+
+
+def run(stdout, repeat, **options):
+    requests = max(repeat, CLIENTS)
+    with override_settings(ALLOWED_HOSTS=['testserver'],
+                           RESPONSE_CACHE=False, ASGI_THREADS=WORKERS):
+        user = get_user_model().objects.create_user(
+            email='benchmark-asgi@outfitted.com',
+            first_name='Bench',
+            surname='Mark',
+            password='benchmark123',
+        )
+        try:
+            key = Token.objects.create(user=user).key
+            Tag.objects.bulk_create([
+                Tag(user=user, name=f'tag {i}') for i in range(20)
+            ])
+            for label, serve in (
+                    (f'wsgi, {WORKERS} sync workers', _wsgi),
+                    (f'asgi, {WORKERS} pool threads', _asgi)):
+                start = time.perf_counter()
+                timings = serve(key, requests)
+                elapsed = time.perf_counter() - start
+                report(stdout, label, timings)
+                stdout.write(
+                    f'{"":<40} {len(timings) / elapsed:.1f} requests/s'
+                )
+        finally:
+            user.delete()
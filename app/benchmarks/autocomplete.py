@@ -0,0 +1,49 @@
+"""Time tag and item autocomplete for one user with many names
+
+Seeds one user with `--rows` tags and items (default 100k) and times
+building the ranked name list on a cache miss, then the suggestions for
+prefixes of growing length answered from the cached list.
+"""
+from core.models import Item, Tag
+from post import autocomplete
+
+from benchmarks import fixtures, measure, report, rolled_back
+
+
+def run(stdout, repeat, **options):
+    rows = options.get('rows') or 100000
+    cache = autocomplete._cache()
+
+    def clear():
+        cache.clear()
+        autocomplete._local.clear()
+
+    with rolled_back():
+        user_ids = fixtures.seed(
+            rows,
+            users=1,
+            tags_per_user=rows,
+            items_per_user=rows,
+        )
+        for label, model in (('tags', Tag), ('items', Item)):
+            report(
+                stdout,
+                f'{label} build',
+                measure(
+                    lambda: clear() or autocomplete.ranked_names(
+                        model, user_ids[0]
+                    ),
+                    max(1, repeat // 10)
+                )
+            )
+            for prefix in ('', f'{label[:-1]} 1', f'{label[:-1]} 123'):
+                report(
+                    stdout,
+                    f'{label} {prefix!r}',
+                    measure(lambda: autocomplete.suggest(
+                        autocomplete.ranked_names(model, user_ids[0]),
+                        prefix,
+                        10
+                    ), repeat)
+                )
+    clear()
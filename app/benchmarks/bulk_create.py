@@ -0,0 +1,65 @@
+"""Compare creating posts one request at a time with the bulk endpoint
+
+Creates `--rows` posts (default 500) with 3 tags and 4 items each, either
+as one request per post or as a single bulk request. Every repetition runs
+in its own rolled back transaction.
+"""
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from core.models import Item, Tag
+
+from post.views import PostViewSet
+
+from benchmarks import fixtures, measure, report, rolled_back
+
+
+def run(stdout, repeat, **options):
+    rows = options.get('rows') or 500
+    with rolled_back():
+        user_ids = fixtures.seed(0, users=1)
+        user = get_user_model().objects.get(id=user_ids[0])
+        tag_ids = list(
+            Tag.objects.filter(user=user).values_list('id', flat=True)
+        )
+        item_ids = list(
+            Item.objects.filter(user=user).values_list('id', flat=True)
+        )
+        payload = [
+            {
+                'title': f'post {i}',
+                'tags': [tag_ids[(i + j) % len(tag_ids)] for j in range(3)],
+                'items': [
+                    item_ids[(i + j) % len(item_ids)] for j in range(4)
+                ],
+            }
+            for i in range(rows)
+        ]
+        factory = APIRequestFactory()
+        create = PostViewSet.as_view({'post': 'create'})
+        bulk = PostViewSet.as_view({'post': 'bulk'})
+
+        def call(view, data):
+            request = factory.post('/', data, format='json')
+            force_authenticate(request, user=user)
+            response = view(request)
+            assert response.status_code == 201, response.data
+
+        def sequential():
+            with rolled_back():
+                for row in payload:
+                    call(create, row)
+
+        def bulk_request():
+            with rolled_back():
+                call(bulk, payload)
+
+        with override_settings(POST_BULK_MAX_ROWS=rows):
+            report(stdout, f'{rows} posts: sequential', measure(
+                sequential, repeat
+            ))
+            report(stdout, f'{rows} posts: bulk', measure(
+                bulk_request, repeat
+            ))
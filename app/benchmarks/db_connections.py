@@ -0,0 +1,73 @@
+"""Time requests opening a connection each against reused connections
+
+Runs `--repeat` simulated requests spread over THREADS threads, every one
+sending the request signals Django sends and running one query, with a new
+connection per request, persistent health checked connections and, on the
+core.db.backends.postgresql backend, a pool of THREADS // 2 connections.
+"""
+import threading
+import time
+
+from django.core import signals
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from benchmarks import report
+
+
+THREADS = 8
+
+
+def _modes(settings_dict):
+    yield 'new connection per request', {'CONN_MAX_AGE': 0, 'POOL': None}
+    yield 'persistent, health checked', {
+        'CONN_MAX_AGE': 60, 'HEALTH_CHECKS': True, 'POOL': None,
+    }
+    if settings_dict['ENGINE'] == 'core.db.backends.postgresql':
+        yield f'pool of {THREADS // 2}', {
+            'CONN_MAX_AGE': 0,
+            'POOL': {'MAX_SIZE': THREADS // 2, 'TIMEOUT': 30},
+        }
+
+
+def _worker(requests, timings):
+    connection = connections[DEFAULT_DB_ALIAS]
+    try:
+        for _ in range(requests):
+            start = time.perf_counter()
+            signals.request_started.send(sender=None)
+            try:
+                with connection.cursor() as cursor:
+                    cursor.execute('SELECT 1')
+                    cursor.fetchone()
+            finally:
+                signals.request_finished.send(sender=None)
+            timings.append(time.perf_counter() - start)
+    finally:
+        connection.close()
+
+
+def run(stdout, repeat, **options):
+    settings_dict = connections.databases[DEFAULT_DB_ALIAS]
+    original = dict(settings_dict)
+    connections[DEFAULT_DB_ALIAS].close()
+    try:
+        for label, overrides in _modes(settings_dict):
+            settings_dict.update(overrides)
+            timings = []
+            threads = [
+                threading.Thread(
+                    target=_worker, args=(max(1, repeat // THREADS), timings)
+                )
+                for _ in range(THREADS)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            report(stdout, label, timings)
+            if overrides['POOL']:
+                from core.db.backends.postgresql.base import close_pools
+                close_pools()
+    finally:
+        settings_dict.clear()
+        settings_dict.update(original)
@@ -0,0 +1,94 @@
+"""Synthetic data for benchmarks"""
+import random
+
+from django.contrib.auth import get_user_model
+
+from core.models import Item, Post, Tag
+
+
+BATCH_SIZE = 10000
+
+TITLE_WORDS = (
+    'summer', 'winter', 'autumn', 'spring', 'beach', 'party', 'office',
+    'wedding', 'casual', 'formal', 'linen', 'denim', 'wool', 'leather',
+    'vintage', 'sporty', 'black', 'white', 'navy', 'floral', 'striped',
+    'layered', 'weekend', 'travel', 'evening', 'brunch', 'festival',
+    'hiking', 'rainy', 'minimal',
+)
+
+
+def _bulk_create(model, objects):
+    """Insert objects in batches"""
+    for start in range(0, len(objects), BATCH_SIZE):
+        model.objects.bulk_create(objects[start:start + BATCH_SIZE])
+
+
+def seed(posts, users=100, tags_per_user=20, items_per_user=50,
+         tags_per_post=3, items_per_post=4, title_words=0, seed=0):
+    """Create users that own tags, items and posts linking to them
+
+    Posts are spread evenly across users. With title_words, post titles
+    are that many random words of TITLE_WORDS. Returns the ids of the
+    created users. Passwords are unusable, the benchmarks never log in.
+    """
+    rng = random.Random(seed)
+    user_model = get_user_model()
+    prefix = f'benchmark-{rng.randrange(10 ** 9)}'
+    _bulk_create(user_model, [
+        user_model(
+            email=f'{prefix}-{i}@outfitted.com',
+            first_name='Bench',
+            surname='Mark',
+            password='!',
+        )
+        for i in range(users)
+    ])
+    user_ids = list(
+        user_model.objects.filter(email__startswith=prefix)
+        .order_by('id').values_list('id', flat=True)
+    )
+
+    _bulk_create(Tag, [
+        Tag(user_id=user_id, name=f'tag {i}')
+        for user_id in user_ids for i in range(tags_per_user)
+    ])
+    _bulk_create(Item, [
+        Item(user_id=user_id, name=f'item {i}')
+        for user_id in user_ids for i in range(items_per_user)
+    ])
+    per_user = max(1, posts // users)
+    _bulk_create(Post, [
+        Post(
+            user_id=user_id,
+            title=' '.join(rng.sample(TITLE_WORDS, title_words))
+            if title_words else f'Outfit {i}'
+        )
+        for user_id in user_ids for i in range(per_user)
+    ])
+
+    tag_rows = []
+    item_rows = []
+    for user_id in user_ids:
+        tag_ids = list(
+            Tag.objects.filter(user_id=user_id).values_list('id', flat=True)
+        )
+        item_ids = list(
+            Item.objects.filter(user_id=user_id).values_list('id', flat=True)
+        )
+        post_ids = Post.objects.filter(user_id=user_id) \
+            .values_list('id', flat=True)
+        for post_id in post_ids:
+            for tag_id in rng.sample(
+                    tag_ids, min(tags_per_post, len(tag_ids))):
+                tag_rows.append(
+                    Post.tags.through(post_id=post_id, tag_id=tag_id)
+                )
+            for item_id in rng.sample(
+                    item_ids, min(items_per_post, len(item_ids))):
+                item_rows.append(
+                    Post.items.through(post_id=post_id, item_id=item_id)
+                )
+    _bulk_create(Post.tags.through, tag_rows)
+    _bulk_create(Post.items.through, item_rows)
+
+    return user_ids
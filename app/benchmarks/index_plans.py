@@ -0,0 +1,74 @@
+"""Check the query plans of the per-user queries on a large dataset
+
+Seeds `--rows` posts (default 1M) and prints the plan of every hot query,
+flagging sequential scans and explicit sorts.
+"""
+from django.db import connection
+
+from core.models import Item, Post, Tag
+
+from benchmarks import fixtures, measure, report, rolled_back
+
+
+def plan_problems(plan):
+    """Return the plan lines that scan a whole table or sort rows"""
+    if connection.vendor == 'postgresql':
+        markers = ('Seq Scan', 'Sort')
+    else:
+        markers = ('TEMP B-TREE',)
+
+    problems = [
+        line for line in plan.splitlines()
+        if any(marker in line for marker in markers)
+    ]
+    if connection.vendor == 'sqlite':
+        problems += [
+            line for line in plan.splitlines()
+            if 'SCAN' in line and 'INDEX' not in line
+        ]
+
+    return problems
+
+
+def queries(user_id):
+    """Return the hot queries of the post API for one user"""
+    tag_ids = list(
+        Tag.objects.filter(user_id=user_id).values_list('id', flat=True)[:2]
+    )
+    return {
+        'tag list': Tag.objects.filter(user_id=user_id).order_by('-name'),
+        'item list': Item.objects.filter(user_id=user_id).order_by('-name'),
+        'post page': Post.objects.filter(user_id=user_id).order_by('-id')[:50],
+        'posts by tag': Post.objects.filter(
+            user_id=user_id, tags__id__in=tag_ids
+        ).order_by('-id')[:50],
+        'tags of posts': Tag.objects.filter(
+            post__id__in=Post.objects.filter(user_id=user_id)
+            .order_by('-id').values('id')[:50]
+        ),
+    }
+
+
+def run(stdout, repeat, **options):
+    rows = options.get('rows') or 1000000
+    with rolled_back():
+        user_ids = fixtures.seed(rows, users=max(1, rows // 1000))
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE')
+
+        ok = True
+        for label, queryset in queries(user_ids[0]).items():
+            plan = queryset.explain()
+            problems = plan_problems(plan)
+            ok = ok and not problems
+            stdout.write(f'-- {label}\n{plan}')
+            for line in problems:
+                stdout.write(f'!! {line.strip()}')
+            timings = measure(lambda: list(queryset.all()), repeat)
+            report(stdout, label, timings)
+
+        if ok:
+            stdout.write('All plans use indexes')
+        else:
+            stdout.write('Some plans scan or sort')
@@ -0,0 +1,44 @@
+"""Compare JSONRenderer/JSONParser with the orjson based classes
+
+Renders a list of `PostDetailSerializer` payloads, seeded with `--rows`
+posts (default 1000), and parses the result back.
+"""
+import io
+
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from core.models import Post
+from core.parsers import FastJSONParser
+from core.renderers import FastJSONRenderer
+
+from post.serializers import PostDetailSerializer
+
+from benchmarks import fixtures, measure, report, rolled_back
+
+
+def run(stdout, repeat, **options):
+    rows = options.get('rows') or 1000
+    with rolled_back():
+        user_ids = fixtures.seed(rows, users=1)
+        posts = Post.objects.filter(user_id=user_ids[0]) \
+            .prefetch_related('items', 'tags')
+        data = PostDetailSerializer(posts, many=True).data
+
+    body = JSONRenderer().render(data)
+    stdout.write(f'{len(data)} posts, {len(body)} bytes')
+    for label, renderer in (
+        ('JSONRenderer', JSONRenderer()),
+        ('FastJSONRenderer', FastJSONRenderer()),
+    ):
+        report(stdout, label, measure(lambda: renderer.render(data), repeat))
+
+    for label, parser in (
+        ('JSONParser', JSONParser()),
+        ('FastJSONParser', FastJSONParser()),
+    ):
+        report(
+            stdout,
+            label,
+            measure(lambda: parser.parse(io.BytesIO(body)), repeat)
+        )
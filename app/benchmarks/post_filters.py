@@ -0,0 +1,58 @@
+"""Compare the tag filter modes of the post list on a large dataset"""
+from django.db import connection
+
+from core.models import Post, Tag
+
+from post.views import PostViewSet
+
+from benchmarks import fixtures, measure, report, rolled_back
+
+
+def run(stdout, repeat, **options):
+    rows = options.get('rows') or 1000000
+    with rolled_back():
+        user_ids = fixtures.seed(
+            rows,
+            users=max(1, rows // 10000),
+            tags_per_user=30,
+            tags_per_post=6,
+        )
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE')
+
+        user_id = user_ids[0]
+        posts = Post.objects.filter(user_id=user_id).order_by('-id')
+        view = PostViewSet()
+        tag_ids = list(
+            Tag.objects.filter(user_id=user_id).values_list('id', flat=True)
+        )
+        for count in (1, 3, 10):
+            ids = tag_ids[:count]
+
+            def join():
+                return list(posts.filter(tags__id__in=ids).distinct()[:50])
+
+            def chained():
+                queryset = posts
+                for tag_id in ids:
+                    queryset = queryset.filter(tags__id=tag_id)
+                return list(queryset[:50])
+
+            def tags_any():
+                return list(
+                    view._filter_related(posts, 'tags', ids, False)[:50]
+                )
+
+            def tags_all():
+                return list(
+                    view._filter_related(posts, 'tags', ids, True)[:50]
+                )
+
+            for label, func in (
+                ('join + DISTINCT', join),
+                ('tags_any', tags_any),
+                ('chained joins', chained),
+                ('tags_all', tags_all),
+            ):
+                report(stdout, f'{count} ids: {label}', measure(func, repeat))
@@ -0,0 +1,59 @@
+"""Time title search of the post list on a large dataset
+
+Seeds `--rows` posts (default 1M) with random four word titles and times
+the first page of searches for a common word, two words and a word
+combined with a tag filter, through the view including rendering.
+"""
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import override_settings
+
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from core.models import Post, Tag
+
+from post.search import search_posts
+from post.views import PostViewSet
+
+from benchmarks import fixtures, measure, report, rolled_back
+from benchmarks.index_plans import plan_problems
+
+
+def run(stdout, repeat, **options):
+    rows = options.get('rows') or 1000000
+    with rolled_back():
+        user_ids = fixtures.seed(
+            rows,
+            users=max(1, rows // 10000),
+            title_words=4,
+        )
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE')
+
+        user = get_user_model().objects.get(id=user_ids[0])
+        tag_id = Tag.objects.filter(user=user).values_list('id', flat=True)[0]
+        factory = APIRequestFactory()
+        view = PostViewSet.as_view({'get': 'list'})
+        searches = {
+            'one word': {'search': 'beach'},
+            'two words': {'search': 'beach party'},
+            'word and tag': {'search': 'beach', 'tags': tag_id},
+        }
+        for label, params in searches.items():
+            queryset = search_posts(
+                Post.objects.filter(user=user), params['search']
+            ).order_by(*PostViewSet.search_ordering)[:50]
+            plan = queryset.explain()
+            stdout.write(f'-- {label}\n{plan}')
+            for line in plan_problems(plan):
+                stdout.write(f'!! {line.strip()}')
+
+            def call():
+                request = factory.get('/', {**params, 'page_size': 50})
+                force_authenticate(request, user=user)
+                return view(request).render()
+
+            with override_settings(RESPONSE_CACHE=False,
+                                   ALLOWED_HOSTS=['testserver']):
+                report(stdout, label, measure(call, repeat))
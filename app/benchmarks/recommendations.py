@@ -0,0 +1,41 @@
+"""Time computing and reading co-occurrence recommendations
+
+Seeds synthetic users with `--rows` posts each (default 10k), then times
+the full recomputation of one user's recommendations and a cached read.
+"""
+from django.conf import settings
+from django.db import connection
+
+from core import recommendations
+
+from benchmarks import fixtures, measure, report, rolled_back
+
+
+def run(stdout, repeat, **options):
+    rows = options.get('rows') or 10000
+    with rolled_back():
+        user_ids = fixtures.seed(
+            rows * 3,
+            users=3,
+            tags_per_user=50,
+            items_per_user=300,
+        )
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE')
+
+        user_id = user_ids[0]
+        top_k = getattr(settings, 'RECOMMENDATION_TOP_K', 50)
+        min_count = getattr(settings, 'RECOMMENDATION_MIN_COUNT', 2)
+        report(stdout, f'compute, {rows} posts', measure(
+            lambda: recommendations.compute_recommendations(
+                user_id, top_k, min_count
+            ),
+            repeat
+        ))
+
+        recommendations.user_recommendations(user_id)
+        report(stdout, 'cached read', measure(
+            lambda: recommendations.user_recommendations(user_id),
+            repeat
+        ))
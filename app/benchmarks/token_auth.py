@@ -0,0 +1,48 @@
+"""Compare the stock token authentication with the cached one"""
+from django.contrib.auth import get_user_model
+from django.test import RequestFactory
+
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+from user.authentication import CachedTokenAuthentication, token_cache
+
+from benchmarks import measure, report, rolled_back
+
+
+def run(stdout, repeat, **options):
+    with rolled_back():
+        user = get_user_model().objects.create_user(
+            email='benchmark@outfitted.com',
+            first_name='Bench',
+            surname='Mark',
+            password='benchmark123',
+        )
+        token = Token.objects.create(user=user)
+        request = RequestFactory().get(
+            '/api/user/me/',
+            HTTP_AUTHORIZATION=f'Token {token.key}'
+        )
+
+        stock = TokenAuthentication()
+        report(
+            stdout,
+            'TokenAuthentication',
+            measure(lambda: stock.authenticate(request), repeat)
+        )
+
+        cached = CachedTokenAuthentication()
+        token_cache.clear()
+        report(
+            stdout,
+            'CachedTokenAuthentication (cold)',
+            measure(lambda: (
+                token_cache.clear(), cached.authenticate(request)
+            ), repeat)
+        )
+        report(
+            stdout,
+            'CachedTokenAuthentication (warm)',
+            measure(lambda: cached.authenticate(request), repeat)
+        )
+        token_cache.clear()
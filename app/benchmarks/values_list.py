@@ -0,0 +1,38 @@
+"""Compare the serializer and the values based post list
+
+Lists `--rows` posts (default 10k) of a single user through the view,
+including rendering, with both list implementations. The response
+cache is disabled so every call builds the list.
+"""
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from post.views import ItemViewSet, PostViewSet
+
+from benchmarks import fixtures, measure, report, rolled_back
+
+
+def run(stdout, repeat, **options):
+    rows = options.get('rows') or 10000
+    with rolled_back():
+        user_ids = fixtures.seed(rows, users=1, items_per_user=rows)
+        user = get_user_model().objects.get(id=user_ids[0])
+        factory = APIRequestFactory()
+
+        for label, view in (
+            ('posts', PostViewSet.as_view({'get': 'list'})),
+            ('items', ItemViewSet.as_view({'get': 'list'})),
+        ):
+            def call():
+                request = factory.get('/')
+                force_authenticate(request, user=user)
+                return view(request).render()
+
+            with override_settings(RESPONSE_CACHE=False,
+                                   POST_VALUES_LIST=False):
+                report(stdout, f'{label}: serializer', measure(call, repeat))
+            with override_settings(RESPONSE_CACHE=False,
+                                   POST_VALUES_LIST=True):
+                report(stdout, f'{label}: values', measure(call, repeat))
@@ -0,0 +1,144 @@
+"""ASGI handler serving the synchronous views from a bounded thread pool
+
+Django 3.0 runs synchronous views through asgiref's sync_to_async, which
+current asgiref versions run thread sensitive: a single thread per process
+serves every request in turn. This handler runs every request, from
+request_started to request_finished, on one of ASGI_THREADS pool threads,
+so database connections are reused and closed by the thread owning them.
+The event loop only awaits clients: request bodies are received on it and
+spooled to disk in the default executor once they outgrow
+FILE_UPLOAD_MAX_MEMORY_SIZE, streaming responses are read in the pool.
+"""
+import asyncio
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core import signals
+from django.core.exceptions import RequestAborted
+from django.core.handlers import asgi
+from django.http import FileResponse
+from django.urls import set_script_prefix
+
+
+class ASGIHandler(asgi.ASGIHandler):
+
+    def __init__(self):
+        super().__init__()
+        self.executor = ThreadPoolExecutor(
+            max_workers=getattr(settings, 'ASGI_THREADS', None),
+            thread_name_prefix='asgi-request',
+        )
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            raise ValueError(
+                'Django can only handle ASGI/HTTP connections, not %s.'
+                % scope['type']
+            )
+        try:
+            body_file = await self.read_body(receive)
+        except RequestAborted:
+            return
+
+        loop = asyncio.get_running_loop()
+        response = await loop.run_in_executor(
+            self.executor, self.handle_request, scope, body_file
+        )
+        await self.send_response(response, send)
+
+    def handle_request(self, scope, body_file):
+        """Return the response to a request, on a pool thread"""
+        set_script_prefix(self.get_script_prefix(scope))
+        signals.request_started.send(sender=self.__class__, scope=scope)
+        request, response = self.create_request(scope, body_file)
+        if request is not None:
+            response = self.get_response(request)
+        response._handler_class = self.__class__
+        if isinstance(response, FileResponse):
+            response.block_size = self.chunk_size
+        if not response.streaming:
+            # Sends request_finished on the thread that served the request
+            response.close()
+
+        return response
+
+    async def read_body(self, receive):
+        """Receive the body, writing it to disk off the event loop"""
+        max_size = settings.FILE_UPLOAD_MAX_MEMORY_SIZE
+        body_file = tempfile.SpooledTemporaryFile(
+            max_size=max_size, mode='w+b'
+        )
+        loop = asyncio.get_running_loop()
+        size = 0
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                body_file.close()
+                raise RequestAborted()
+            chunk = message.get('body', b'')
+            if chunk:
+                size += len(chunk)
+                if size > max_size:
+                    await loop.run_in_executor(None, body_file.write, chunk)
+                else:
+                    body_file.write(chunk)
+            if not message.get('more_body', False):
+                break
+        body_file.seek(0)
+
+        return body_file
+
+    async def send_response(self, response, send):
+        """Send a response, reading streaming content on the pool"""
+        headers = []
+        for header, value in response.items():
+            if isinstance(header, str):
+                header = header.encode('ascii')
+            if isinstance(value, str):
+                value = value.encode('latin1')
+            headers.append((bytes(header), bytes(value)))
+        for cookie in response.cookies.values():
+            value = cookie.output(header='').encode('ascii').strip()
+            headers.append((b'Set-Cookie', value))
+        await send({
+            'type': 'http.response.start',
+            'status': response.status_code,
+            'headers': headers,
+        })
+
+        if not response.streaming:
+            for chunk, last in self.chunk_bytes(response.content):
+                await send({
+                    'type': 'http.response.body',
+                    'body': chunk,
+                    'more_body': not last,
+                })
+            return
+
+        loop = asyncio.get_running_loop()
+        parts = iter(response)
+        try:
+            while True:
+                part = await loop.run_in_executor(
+                    self.executor, next, parts, None
+                )
+                if part is None:
+                    break
+                for chunk, _ in self.chunk_bytes(part):
+                    await send({
+                        'type': 'http.response.body',
+                        'body': chunk,
+                        'more_body': True,
+                    })
+            await send({'type': 'http.response.body'})
+        finally:
+            await loop.run_in_executor(self.executor, response.close)
+
+
+def get_asgi_application():
+    """Set up Django and return the pooled ASGI handler"""
+    import django
+    django.setup(set_prefix=False)
+
+    return ASGIHandler()
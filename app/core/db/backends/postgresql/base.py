@@ -0,0 +1,139 @@
+"""PostgreSQL backend with connection health checks and an optional pool
+
+Settings read from the database entry, next to the stock ones:
+
+HEALTH_CHECKS
+    Check a persistent connection (CONN_MAX_AGE > 0) with `SELECT 1` on
+    its first use in every request, so a connection the server dropped
+    while idle is replaced instead of failing the request.
+POOL
+    None, or a dict with MAX_SIZE, TIMEOUT, MAX_IDLE and CHECK_AFTER for
+    a `core.db.pool.ConnectionPool` shared by the threads of the process.
+    Closing a connection returns it to the pool, so CONN_MAX_AGE should
+    be 0 and every request checks a connection out only while it runs.
+"""
+import threading
+
+from django.core.signals import request_started
+from django.db import connections
+from django.db.backends.postgresql import base
+
+from core.db.pool import ConnectionPool
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def _ping(connection):
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT 1')
+
+    return True
+
+
+def get_pool(alias, settings_dict, connect):
+    """Return the pool of a database alias, creating it on first use"""
+    with _pools_lock:
+        pool = _pools.get(alias)
+        if pool is None:
+            options = settings_dict['POOL']
+            pool = _pools[alias] = ConnectionPool(
+                connect,
+                max_size=options.get('MAX_SIZE', 10),
+                timeout=options.get('TIMEOUT', 10),
+                max_idle=options.get('MAX_IDLE', 300),
+                check=_ping,
+                check_after=options.get('CHECK_AFTER', 10),
+            )
+
+    return pool
+
+
+def close_pools():
+    """Close the idle connections of every pool, for tests and shutdown"""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close_all()
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.health_check_done = False
+
+    @property
+    def pool(self):
+        if not self.settings_dict.get('POOL'):
+            return None
+
+        return get_pool(self.alias, self.settings_dict, self._pool_connect)
+
+    def _pool_connect(self):
+        return super().get_new_connection(self.get_connection_params())
+
+    def get_new_connection(self, conn_params):
+        pool = self.pool
+        if pool is None:
+            return super().get_new_connection(conn_params)
+
+        return pool.acquire()
+
+    def connect(self):
+        super().connect()
+        self.health_check_done = True
+
+    def ensure_connection(self):
+        if self.connection is not None and not self.health_check_done:
+            self.close_if_health_check_failed()
+        super().ensure_connection()
+
+    def close_if_health_check_failed(self):
+        """Close a persistent connection that no longer answers"""
+        if self.settings_dict.get('HEALTH_CHECKS') and \
+                not self.in_atomic_block and not self.is_usable():
+            self.close()
+        self.health_check_done = True
+
+    def _close(self):
+        pool = self.pool
+        if pool is None:
+            return super()._close()
+
+        # A connection closed inside atomic() stays referenced by this
+        # wrapper until the block exits, so it is never handed out again
+        reusable = not self.in_atomic_block and self._reset_for_pool()
+        with self.wrap_database_errors:
+            pool.release(self.connection, reusable)
+
+    def _reset_for_pool(self):
+        """Roll back an open transaction, return if the connection is reusable
+
+        A connection in an unknown or broken state is not.
+        """
+        connection = self.connection
+        if connection.closed:
+            return False
+        status = connection.get_transaction_status()
+        if status == base.psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+            return True
+        if status == base.psycopg2.extensions.TRANSACTION_STATUS_UNKNOWN:
+            return False
+        try:
+            connection.rollback()
+        except base.Database.Error:
+            return False
+
+        return True
+
+
+def _reset_health_checks(**kwargs):
+    for connection in connections.all():
+        if hasattr(connection, 'health_check_done'):
+            connection.health_check_done = False
+
+
+request_started.connect(_reset_health_checks)
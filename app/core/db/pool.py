@@ -0,0 +1,108 @@
+"""Bounded pool of DB-API connections shared by the threads of a process
+
+At most `max_size` connections are checked out at once, further callers
+wait up to `timeout` seconds for one to be returned. Idle connections are
+reused last in first out, so the hot ones stay warm and surplus ones age
+out after `max_idle` seconds. A connection that sat idle longer than
+`check_after` seconds is checked with `check(connection)` before it is
+handed out again, broken ones are replaced by a new connection.
+"""
+import collections
+import threading
+import time
+
+
+class PoolTimeout(Exception):
+    """No connection was returned to a full pool in time"""
+
+
+class ConnectionPool:
+    """Bounded pool of connections made by `connect()`"""
+
+    def __init__(self, connect, max_size, timeout=10, max_idle=300,
+                 check=None, check_after=10):
+        self._connect = connect
+        self._check = check
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._lock = threading.Lock()
+        self._idle = collections.deque()
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.check_after = check_after
+
+    @property
+    def idle_count(self):
+        return len(self._idle)
+
+    def acquire(self):
+        """Return an idle or new connection, waiting for a free slot"""
+        if not self._slots.acquire(timeout=self.timeout):
+            raise PoolTimeout(
+                f'No connection available within {self.timeout}s, '
+                f'all {self.max_size} are in use'
+            )
+        try:
+            connection = self._reuse()
+            if connection is None:
+                connection = self._connect()
+        except BaseException:
+            self._slots.release()
+            raise
+
+        return connection
+
+    def release(self, connection, reusable=True):
+        """Return a connection, closing it unless it is reusable"""
+        try:
+            if reusable:
+                with self._lock:
+                    self._idle.append((connection, time.monotonic()))
+            else:
+                self._discard(connection)
+        finally:
+            self._slots.release()
+
+    def close_all(self):
+        """Close every idle connection"""
+        with self._lock:
+            idle, self._idle = self._idle, collections.deque()
+        for connection, _ in idle:
+            self._discard(connection)
+
+    def _reuse(self):
+        """Return the most recently returned usable idle connection"""
+        while True:
+            with self._lock:
+                if not self._idle:
+                    return None
+                connection, returned_at = self._idle.pop()
+                expired = []
+                if self.max_idle is not None:
+                    cutoff = time.monotonic() - self.max_idle
+                    while self._idle and self._idle[0][1] < cutoff:
+                        expired.append(self._idle.popleft()[0])
+            for stale in expired:
+                self._discard(stale)
+
+            idle = time.monotonic() - returned_at
+            if self.max_idle is not None and idle > self.max_idle:
+                self._discard(connection)
+                continue
+            if self._check is None or idle <= self.check_after or \
+                    self._usable(connection):
+                return connection
+            self._discard(connection)
+
+    def _usable(self, connection):
+        try:
+            return bool(self._check(connection))
+        except Exception:
+            return False
+
+    @staticmethod
+    def _discard(connection):
+        try:
+            connection.close()
+        except Exception:
+            pass
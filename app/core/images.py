@@ -0,0 +1,224 @@
+import io
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import Image, ImageOps
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import connection
+from django.utils import timezone
+
+from core import versions
+
+
+FORMAT_EXTENSIONS = {
+    'jpeg': 'jpg',
+    'png': 'png',
+    'webp': 'webp',
+}
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+class InvalidImageError(ValueError):
+    """Raised when a file can not be read as an image"""
+
+
+class ImageLimitError(InvalidImageError):
+    """Raised when an image has an unsupported format or is too large"""
+
+
+def max_upload_size():
+    """Return the largest accepted image upload in bytes"""
+    return getattr(settings, 'POST_IMAGE_MAX_UPLOAD_SIZE', 20 * 2 ** 20)
+
+
+def max_pixels():
+    """Return the largest accepted image size in pixels"""
+    return getattr(settings, 'POST_IMAGE_MAX_PIXELS', 50000000)
+
+
+def inspect_image(file):
+    """Return the format, width and height of an image from its header
+
+    Pillow only parses the header when opening a file, the pixel data is
+    never decoded. Raises InvalidImageError when the file is not an image
+    and ImageLimitError when it is not allowed.
+    """
+    try:
+        with Image.open(file) as image:
+            image_format = image.format
+            width, height = image.size
+    except Image.DecompressionBombError:
+        raise ImageLimitError('image has too many pixels')
+    except (OSError, SyntaxError):
+        raise InvalidImageError('not a valid image')
+
+    allowed_formats = getattr(
+        settings,
+        'POST_IMAGE_UPLOAD_FORMATS',
+        ('JPEG', 'MPO', 'PNG', 'WEBP', 'GIF'),
+    )
+    if image_format not in allowed_formats:
+        raise ImageLimitError(f'unsupported image format {image_format}')
+    if width * height > max_pixels():
+        raise ImageLimitError(
+            f'image has {width * height} pixels, the limit is {max_pixels()}'
+        )
+
+    return image_format, width, height
+
+
+def variant_sizes():
+    """Return the configured variant names and their longest edge in px"""
+    return getattr(settings, 'POST_IMAGE_VARIANTS', {
+        'thumb': 150,
+        'medium': 600,
+        'large': 1200,
+    })
+
+
+def variant_formats():
+    """Return the configured variant image formats"""
+    return getattr(settings, 'POST_IMAGE_VARIANT_FORMATS', ('jpeg', 'webp'))
+
+
+def variant_file_path(image_name, size, image_format):
+    """Generate the file path of an image variant"""
+    stem = os.path.splitext(os.path.basename(image_name))[0]
+    ext = FORMAT_EXTENSIONS[image_format]
+
+    return os.path.join('upload/post/variants/', f'{stem}_{size}.{ext}')
+
+
+def variant_file_paths(image_name):
+    """Return every variant file path of an image"""
+    return [
+        variant_file_path(image_name, size, image_format)
+        for size in variant_sizes()
+        for image_format in variant_formats()
+    ]
+
+
+def _resize(image, max_edge):
+    """Return image scaled down to fit max_edge, or image when it fits"""
+    width, height = image.size
+    scale = max_edge / max(width, height)
+    if scale >= 1:
+        return image
+
+    size = (max(1, round(width * scale)), max(1, round(height * scale)))
+    return image.resize(size, Image.LANCZOS)
+
+
+def _encode(image, image_format):
+    """Return the encoded bytes of image in image_format"""
+    if image_format == 'jpeg' and image.mode not in ('RGB', 'L'):
+        image = image.convert('RGB')
+
+    buffer = io.BytesIO()
+    image.save(buffer, format=image_format.upper(), quality=85)
+    return buffer.getvalue()
+
+
+def generate_variants(post_id, image_name):
+    """Write every variant of a post image and mark the post as ready
+
+    Variants that already exist, e.g. for a deduplicated image, are kept.
+    The post is only marked when it still points at image_name, so a
+    newer upload never gets flagged by an older job.
+
+    Each size is resized from the next larger one instead of from the
+    original, and JPEGs are decoded at the smallest scale that still
+    covers the largest size.
+    """
+    from core.models import Post
+
+    storage = Post._meta.get_field('image').storage
+    missing = [
+        (variant_file_path(image_name, size, image_format), max_edge,
+         image_format)
+        for size, max_edge in variant_sizes().items()
+        for image_format in variant_formats()
+    ]
+    missing = [job for job in missing if not storage.exists(job[0])]
+    if missing:
+        largest = max(max_edge for _, max_edge, _ in missing)
+        with storage.open(image_name) as image_file:
+            image = Image.open(image_file)
+            image.draft(None, (largest, largest))
+            image.load()
+        # Phone cameras store the orientation in EXIF instead of rotating
+        image = ImageOps.exif_transpose(image)
+
+        missing.sort(key=lambda job: job[1], reverse=True)
+        for name, max_edge, image_format in missing:
+            image = _resize(image, max_edge)
+            storage.save_derived(
+                name,
+                ContentFile(_encode(image, image_format))
+            )
+
+    updated = Post.objects.filter(pk=post_id, image=image_name).update(
+        image_variants_ready=True,
+        updated_at=timezone.now(),
+    )
+    if updated:
+        # update() skips the save signals that bump the post version
+        user_id = Post.objects.values_list('user_id', flat=True) \
+            .get(pk=post_id)
+        versions.bump('post', user_id, [post_id])
+
+    return updated
+
+
+def _run_job(post_id, image_name):
+    """Generate variants on a worker thread and release its connection"""
+    try:
+        return generate_variants(post_id, image_name)
+    finally:
+        connection.close()
+
+
+def _get_executor():
+    """Return the shared worker pool, creating it on first use"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, 'POST_IMAGE_WORKERS', 2),
+                thread_name_prefix='image-variants',
+            )
+
+    return _executor
+
+
+def _log_failure(post_id, image_name):
+    """Return a done callback logging a failed variant job"""
+    def callback(future):
+        error = future.exception()
+        if error is not None:
+            logger.error(
+                'Generating the variants of post %s image %s failed',
+                post_id, image_name,
+                exc_info=(type(error), error, error.__traceback__),
+            )
+
+    return callback
+
+
+def schedule_variants(post):
+    """Generate the variants of a post image off the request thread
+
+    A failed job leaves image_variants_ready unset, the
+    regenerate_post_variants command picks it up again.
+    """
+    future = _get_executor().submit(_run_job, post.pk, post.image.name)
+    future.add_done_callback(_log_failure(post.pk, post.image.name))
+    return future
@@ -0,0 +1,35 @@
+import importlib
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    """Django command to run a benchmark from the benchmarks package"""
+    help = 'Run a benchmark from the benchmarks package'
+
+    def add_arguments(self, parser):
+        parser.add_argument('name', help='Benchmark module name')
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=1000,
+            help='Number of timed iterations',
+        )
+        parser.add_argument(
+            '--rows',
+            type=int,
+            help='Number of rows to seed, for benchmarks that seed data',
+        )
+
+    def handle(self, *args, **options):
+        name = options['name']
+        try:
+            module = importlib.import_module(f'benchmarks.{name}')
+        except ModuleNotFoundError:
+            raise CommandError(f'Unknown benchmark: {name}')
+
+        module.run(
+            self.stdout,
+            repeat=options['repeat'],
+            rows=options['rows'],
+        )
@@ -0,0 +1,70 @@
+import os
+import time
+
+from django.core.management.base import BaseCommand
+from django.db.models import Count
+
+from core.images import variant_file_paths
+from core.models import Post
+
+
+def image_reference_counts():
+    """Return the number of posts referencing every stored image"""
+    rows = Post.objects.exclude(image='').exclude(image__isnull=True) \
+        .values('image').annotate(refs=Count('id'))
+
+    return {row['image']: row['refs'] for row in rows}
+
+
+def stored_images(storage, directory='upload/post'):
+    """Yield the name of every post image in storage, skipping variants"""
+    if not storage.exists(directory):
+        return
+
+    dirs, files = storage.listdir(directory)
+    for file_name in files:
+        yield os.path.join(directory, file_name)
+    for sub_dir in dirs:
+        if sub_dir != 'variants':
+            yield from stored_images(storage, os.path.join(directory, sub_dir))
+
+
+class Command(BaseCommand):
+    """Django command to delete post images no post references anymore"""
+    help = 'Delete stored post images that no post references'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--grace',
+            type=int,
+            default=3600,
+            help='Only delete files untouched for this many seconds',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='List the files that would be deleted',
+        )
+
+    def handle(self, *args, **options):
+        storage = Post._meta.get_field('image').storage
+        references = image_reference_counts()
+        cutoff = time.time() - options['grace']
+        deleted = 0
+
+        for name in stored_images(storage):
+            if references.get(name):
+                continue
+            # Uploads that are still being attached to a post refresh the
+            # modification time, the grace period keeps them alive
+            if os.path.getmtime(storage.path(name)) > cutoff:
+                continue
+
+            self.stdout.write(f'Deleting {name}')
+            deleted += 1
+            if not options['dry_run']:
+                for variant in variant_file_paths(name):
+                    storage.delete(variant)
+                storage.delete(name)
+
+        self.stdout.write(self.style.SUCCESS(f'{deleted} images deleted'))
@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from core import similarity
+from core.models import Post
+
+
+class Command(BaseCommand):
+    """Django command to recompute the similarity index of every post"""
+    help = 'Recompute the MinHash signatures and LSH buckets of posts'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of posts recomputed per transaction',
+        )
+        parser.add_argument(
+            '--user',
+            type=int,
+            help='Only rebuild the posts of this user id',
+        )
+
+    def handle(self, *args, **options):
+        posts = Post.objects.order_by('id')
+        if options['user'] is not None:
+            posts = posts.filter(user_id=options['user'])
+
+        batch_size = options['batch_size']
+        last_id = 0
+        total = 0
+        while True:
+            post_ids = list(
+                posts.filter(id__gt=last_id)
+                .values_list('id', flat=True)[:batch_size]
+            )
+            if not post_ids:
+                break
+
+            with transaction.atomic():
+                similarity.update_signatures(post_ids)
+            last_id = post_ids[-1]
+            total += len(post_ids)
+
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {total} posts'))
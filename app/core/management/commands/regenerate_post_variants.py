@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand
+
+from core import images
+from core.models import Post
+
+
+class Command(BaseCommand):
+    """Django command to generate missing post image variants"""
+    help = 'Generate the image variants of posts that are not ready'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Also check the posts already marked as ready',
+        )
+        parser.add_argument(
+            '--user',
+            type=int,
+            help='Only regenerate the posts of this user id',
+        )
+
+    def handle(self, *args, **options):
+        posts = Post.objects.exclude(image__isnull=True).exclude(image='') \
+            .order_by('id')
+        if not options['all']:
+            posts = posts.filter(image_variants_ready=False)
+        if options['user'] is not None:
+            posts = posts.filter(user_id=options['user'])
+
+        total = 0
+        failed = 0
+        for post_id, image_name in posts.values_list('id', 'image') \
+                .iterator():
+            try:
+                images.generate_variants(post_id, image_name)
+            except Exception as error:
+                failed += 1
+                self.stderr.write(f'Post {post_id}: {error}')
+            else:
+                total += 1
+
+        self.stdout.write(
+            self.style.SUCCESS(f'Generated variants of {total} posts')
+        )
+        if failed:
+            self.stdout.write(self.style.WARNING(f'{failed} posts failed'))
@@ -1,21 +1,106 @@
+import random
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 from django.db import connections
 from django.db.utils import OperationalError
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
 
 
 class Command(BaseCommand):
-    """Django command to pause execution until database is available"""
+    """Django command to pause execution until databases are available"""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--database',
+            action='append',
+            dest='databases',
+            help='Database alias to wait for, repeatable, all by default',
+        )
+        parser.add_argument(
+            '--timeout',
+            type=float,
+            default=60,
+            help='Seconds to wait for in total',
+        )
+        parser.add_argument(
+            '--initial-delay',
+            type=float,
+            default=0.05,
+            help='Seconds to wait after the first failed probe',
+        )
+        parser.add_argument(
+            '--max-delay',
+            type=float,
+            default=5,
+            help='Longest wait between two probes',
+        )
 
     def handle(self, *args, **options):
+        aliases = options['databases'] or list(connections)
+        deadline = time.monotonic() + options['timeout']
         self.stdout.write('Waiting for database...')
-        db_conn = None
-        while not db_conn:
-            try:
-                db_conn = connections['default']
-            except OperationalError:
-                self.stdout.write('Database unavailable, waiting one second...')
-                time.sleep(1)
-
-        self.stdout.write(self.style.SUCCESS('Database available!'))
\ No newline at end of file
+        with ThreadPoolExecutor(max_workers=len(aliases)) as executor:
+            available = list(executor.map(
+                lambda alias: self.wait_for(
+                    alias,
+                    deadline,
+                    options['initial_delay'],
+                    options['max_delay'],
+                ),
+                aliases
+            ))
+
+        unavailable = [
+            alias for alias, ok in zip(aliases, available) if not ok
+        ]
+        if unavailable:
+            raise CommandError(
+                f'Database unavailable after {options["timeout"]}s: '
+                f'{", ".join(unavailable)}'
+            )
+        self.stdout.write(self.style.SUCCESS('Database available!'))
+
+    def wait_for(self, alias, deadline, initial_delay, max_delay):
+        """Probe a database until it answers or the deadline passes
+
+        Waits grow exponentially from initial_delay up to max_delay, with
+        jitter so containers started together do not probe in lockstep.
+        """
+        attempt = 0
+        try:
+            while True:
+                try:
+                    self.probe(alias)
+                    return True
+                except OperationalError as error:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.stderr.write(f'Database {alias}: {error}')
+                        return False
+                delay = min(
+                    remaining,
+                    min(max_delay, initial_delay * 2 ** attempt)
+                    * random.uniform(0.5, 1),
+                )
+                self.stdout.write(
+                    f'Database {alias} unavailable, '
+                    f'retrying in {delay:.2f}s...'
+                )
+                time.sleep(delay)
+                attempt += 1
+        finally:
+            connections[alias].close()
+
+    @staticmethod
+    def probe(alias):
+        """Open a connection to a database and run a query on it"""
+        connection = connections[alias]
+        try:
+            connection.ensure_connection()
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+                cursor.fetchone()
+        except OperationalError:
+            connection.close()
+            raise
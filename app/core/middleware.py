@@ -0,0 +1,88 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+from core import routers
+
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+def _cache():
+    alias = getattr(settings, 'REPLICA_PIN_CACHE_ALIAS', None) or \
+        getattr(settings, 'VERSION_CACHE_ALIAS', 'default')
+    return caches[alias]
+
+
+class ReplicaPinMiddleware:
+    """Pin a client's reads to the primary database for a while after it wrote
+
+    Browsers carry the pin in the REPLICA_PIN_COOKIE cookie, token clients
+    are pinned by a hash of their Authorization header, so clients that
+    drop cookies read their own writes as well.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        # Without replicas every read goes to the primary, skip the pin
+        # lookup that costs a cache round trip for token clients
+        if not routers.replica_aliases():
+            return self.get_response(request)
+
+        routers.reset()
+        if request.method not in SAFE_METHODS or self.is_pinned(request):
+            routers.pin_to_primary()
+        try:
+            response = self.get_response(request)
+            if routers.has_written() and routers.replica_aliases():
+                self.pin(request, response)
+        finally:
+            routers.reset()
+
+        return response
+
+    def is_pinned(self, request):
+        """Return whether the client wrote within REPLICA_PIN_SECONDS"""
+        now = time.time()
+        try:
+            expires = float(request.COOKIES[self.cookie_name()])
+        except (KeyError, ValueError):
+            pass
+        else:
+            # A forged cookie never pins longer than one window
+            if now < expires <= now + routers.pin_seconds():
+                return True
+
+        key = self.token_key(request)
+        return key is not None and _cache().get(key) is not None
+
+    def pin(self, request, response):
+        """Pin the client for the next REPLICA_PIN_SECONDS"""
+        seconds = routers.pin_seconds()
+        response.set_cookie(
+            self.cookie_name(),
+            str(time.time() + seconds),
+            max_age=seconds,
+            httponly=True,
+            samesite='Lax',
+        )
+        key = self.token_key(request)
+        if key is not None:
+            _cache().set(key, True, seconds)
+
+    @staticmethod
+    def cookie_name():
+        return getattr(settings, 'REPLICA_PIN_COOKIE', 'db_pin')
+
+    @staticmethod
+    def token_key(request):
+        authorization = request.META.get('HTTP_AUTHORIZATION')
+        if not authorization:
+            return None
+        digest = hashlib.sha1(authorization.encode()).hexdigest()
+
+        return f'db-pin:{digest}'
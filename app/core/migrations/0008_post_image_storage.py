@@ -0,0 +1,20 @@
+# Generated by Django 3.0.14 on 2026-10-17 00:10
+
+import core.models
+import core.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_post_image_variants_ready'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='post',
+            name='image',
+            field=models.ImageField(null=True, storage=core.storage.ContentAddressedStorage(), upload_to=core.models.post_image_file_path),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 3.0.14 on 2026-10-17 00:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_post_image_storage'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='item',
+            index=models.Index(fields=['user', 'name'], name='core_item_user_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['user', 'id'], name='core_post_user_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tag',
+            index=models.Index(fields=['user', 'name'], name='core_tag_user_name_idx'),
+        ),
+        # The through tables only have a (post_id, x_id) unique index, add
+        # the reverse direction for lookups that start from a tag or item
+        migrations.RunSQL(
+            'CREATE INDEX core_post_tags_tag_post_idx '
+            'ON core_post_tags (tag_id, post_id)',
+            'DROP INDEX core_post_tags_tag_post_idx',
+        ),
+        migrations.RunSQL(
+            'CREATE INDEX core_post_items_item_post_idx '
+            'ON core_post_items (item_id, post_id)',
+            'DROP INDEX core_post_items_item_post_idx',
+        ),
+    ]
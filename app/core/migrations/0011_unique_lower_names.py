@@ -0,0 +1,50 @@
+from django.db import migrations
+
+
+def merge_case_duplicates(apps, schema_editor):
+    """Merge tags and items of a user whose names only differ in case
+
+    The oldest object is kept and takes over the post links of the others.
+    """
+    Post = apps.get_model('core', 'Post')
+    for model_name, relation in (('Tag', 'tags'), ('Item', 'items')):
+        model = apps.get_model('core', model_name)
+        through = getattr(Post, relation).through
+        column = Post._meta.get_field(relation).m2m_reverse_name()
+        keepers = {}
+        rows = model.objects.order_by('id').values_list('id', 'user_id', 'name')
+        for id_, user_id, name in rows.iterator():
+            keeper = keepers.setdefault((user_id, name.lower()), id_)
+            if keeper == id_:
+                continue
+
+            linked = through.objects.filter(**{column: keeper}) \
+                .values('post_id')
+            through.objects.filter(
+                post_id__in=linked, **{column: id_}
+            ).delete()
+            through.objects.filter(**{column: id_}).update(**{column: keeper})
+            model.objects.filter(id=id_).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_updated_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_case_duplicates, migrations.RunPython.noop),
+        # Expression indexes are not supported by the Index API of this
+        # Django version, both Postgres and SQLite accept the raw SQL
+        migrations.RunSQL(
+            'CREATE UNIQUE INDEX core_tag_user_lower_name_uniq '
+            'ON core_tag (user_id, lower(name))',
+            'DROP INDEX core_tag_user_lower_name_uniq',
+        ),
+        migrations.RunSQL(
+            'CREATE UNIQUE INDEX core_item_user_lower_name_uniq '
+            'ON core_item (user_id, lower(name))',
+            'DROP INDEX core_item_user_lower_name_uniq',
+        ),
+    ]
@@ -0,0 +1,41 @@
+from django.db import migrations
+
+
+PREFIX_INDEXES = (
+    ('core_tag_user_lower_name_prefix_idx', 'core_tag'),
+    ('core_item_user_lower_name_prefix_idx', 'core_item'),
+)
+
+
+def create_prefix_indexes(apps, schema_editor):
+    """Index lowercased names for LIKE 'prefix%' lookups on Postgres
+
+    The unique (user_id, lower(name)) indexes use the database collation,
+    which Postgres can not use for LIKE unless it is C. SQLite never uses
+    an expression index for LIKE and only narrows the scan by user_id.
+    """
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, table in PREFIX_INDEXES:
+        schema_editor.execute(
+            f'CREATE INDEX {name} ON {table} '
+            f'(user_id, lower(name) text_pattern_ops)'
+        )
+
+
+def drop_prefix_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, table in PREFIX_INDEXES:
+        schema_editor.execute(f'DROP INDEX {name}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_unique_lower_names'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_prefix_indexes, drop_prefix_indexes),
+    ]
@@ -0,0 +1,47 @@
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+def create_search_trigger(apps, schema_editor):
+    """Maintain search_vector from the title and index it on Postgres"""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(
+        'CREATE TRIGGER core_post_search_vector_update '
+        'BEFORE INSERT OR UPDATE OF title ON core_post '
+        'FOR EACH ROW EXECUTE PROCEDURE tsvector_update_trigger('
+        'search_vector, \'pg_catalog.english\', title)'
+    )
+    schema_editor.execute(
+        'UPDATE core_post '
+        'SET search_vector = to_tsvector(\'pg_catalog.english\', title)'
+    )
+    schema_editor.execute(
+        'CREATE INDEX core_post_search_vector_idx '
+        'ON core_post USING gin (search_vector)'
+    )
+
+
+def drop_search_trigger(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP INDEX core_post_search_vector_idx')
+    schema_editor.execute(
+        'DROP TRIGGER core_post_search_vector_update ON core_post'
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_name_prefix_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(create_search_trigger, drop_search_trigger),
+    ]
@@ -0,0 +1,68 @@
+from django.db import migrations
+
+from core import similarity
+
+
+BATCH_SIZE = 1000
+
+
+def backfill_signatures(apps, schema_editor):
+    """Compute the signatures and buckets of the posts created before 0014
+
+    The set elements are those of core.similarity.post_sets, built from
+    the historical models.
+    """
+    Post = apps.get_model('core', 'Post')
+    PostSignature = apps.get_model('core', 'PostSignature')
+    PostBucket = apps.get_model('core', 'PostBucket')
+    db = schema_editor.connection.alias
+
+    last_id = 0
+    while True:
+        users = dict(
+            Post.objects.using(db).filter(id__gt=last_id).order_by('id')
+            .values_list('id', 'user_id')[:BATCH_SIZE]
+        )
+        if not users:
+            break
+
+        sets = {post_id: set() for post_id in users}
+        for relation, prefix in (('tags', 'tag'), ('items', 'item')):
+            through = getattr(Post, relation).through
+            column = Post._meta.get_field(relation).m2m_reverse_name()
+            rows = through.objects.using(db).filter(post_id__in=users) \
+                .values_list('post_id', column)
+            for post_id, id_ in rows:
+                sets[post_id].add(f'{prefix}:{id_}')
+
+        signatures = []
+        buckets = []
+        for post_id, tokens in sets.items():
+            if not tokens:
+                continue
+            sig = similarity.signature(tokens)
+            signatures.append(PostSignature(
+                post_id=post_id, signature=similarity.pack(sig)
+            ))
+            buckets += [
+                PostBucket(post_id=post_id, user_id=users[post_id],
+                           bucket=bucket)
+                for bucket in similarity.band_buckets(sig)
+            ]
+
+        PostSignature.objects.using(db).filter(post_id__in=users).delete()
+        PostBucket.objects.using(db).filter(post_id__in=users).delete()
+        PostSignature.objects.using(db).bulk_create(signatures)
+        PostBucket.objects.using(db).bulk_create(buckets)
+        last_id = max(users)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0014_post_similarity'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_signatures, migrations.RunPython.noop),
+    ]
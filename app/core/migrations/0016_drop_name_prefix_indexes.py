@@ -0,0 +1,40 @@
+from django.db import migrations
+
+
+PREFIX_INDEXES = (
+    ('core_tag_user_lower_name_prefix_idx', 'core_tag'),
+    ('core_item_user_lower_name_prefix_idx', 'core_item'),
+)
+
+
+def drop_prefix_indexes(apps, schema_editor):
+    """Drop the LIKE 'prefix%' indexes of 0012
+
+    Autocomplete bisects a cached name list instead of querying names by
+    prefix, so the indexes only slow down writes.
+    """
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, table in PREFIX_INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {name}')
+
+
+def create_prefix_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, table in PREFIX_INDEXES:
+        schema_editor.execute(
+            f'CREATE INDEX {name} ON {table} '
+            f'(user_id, lower(name) text_pattern_ops)'
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0015_backfill_post_signatures'),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_prefix_indexes, create_prefix_indexes),
+    ]
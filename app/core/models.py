@@ -1,10 +1,18 @@
 import uuid
 import os
 from django.db import models
+from django.db.models.functions import Lower
+from django.contrib.postgres.search import SearchVectorField
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager, \
     PermissionsMixin
 from django.conf import settings
 
+from core import versions
+from core.storage import ContentAddressedStorage
+
+
+post_image_storage = ContentAddressedStorage()
+
 
 def post_image_file_path(instance, file_name):
     """Generate file path for new post image"""
@@ -49,6 +57,47 @@ class User(AbstractBaseUser, PermissionsMixin):
     USERNAME_FIELD = 'email'
 
 
+class NamedAttributeManager(models.Manager):
+    """Manager for user owned objects with a case insensitive unique name"""
+
+    def get_or_create_names(self, user, names):
+        """Return the user's objects by lowercased name, creating missing ones
+
+        Missing objects are inserted with ON CONFLICT DO NOTHING against the
+        unique (user, lower(name)) index, so concurrent calls neither create
+        duplicates nor wait on each other. The first spelling of a name wins.
+        """
+        unique = {}
+        for name in names:
+            unique.setdefault(name.lower(), name)
+        if not unique:
+            return {}
+
+        found = self._by_lower_name(user, unique)
+        missing = [
+            self.model(user=user, name=name)
+            for key, name in unique.items() if key not in found
+        ]
+        if missing:
+            self.bulk_create(missing, ignore_conflicts=True)
+            found.update(self._by_lower_name(
+                user, [obj.name.lower() for obj in missing]
+            ))
+            # bulk_create skips the save signals that bump the versions
+            versions.bump(self.model._meta.model_name, user.id)
+
+        return found
+
+    def _by_lower_name(self, user, lower_names):
+        """Return the user's objects with the given lowercased names"""
+        objects = self.annotate(lower_name=Lower('name')).filter(
+            user=user,
+            lower_name__in=list(lower_names)
+        )
+
+        return {obj.lower_name: obj for obj in objects}
+
+
 class Tag(models.Model):
     """Tag to be used for a post"""
     name = models.CharField(max_length=255)
@@ -56,6 +105,17 @@ class Tag(models.Model):
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
     )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = NamedAttributeManager()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['user', 'name'],
+                name='core_tag_user_name_idx',
+            ),
+        ]
 
     def __str__(self):
         return self.name
@@ -67,6 +127,17 @@ class Item(models.Model):
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE
     )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = NamedAttributeManager()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['user', 'name'],
+                name='core_item_user_name_idx',
+            ),
+        ]
 
     def __str__(self):
         return self.name
@@ -80,7 +151,59 @@ class Post(models.Model):
     title = models.CharField(max_length=255, blank=True)
     items = models.ManyToManyField('Item')
     tags = models.ManyToManyField('Tag')
-    image = models.ImageField(null=True, upload_to=post_image_file_path)
+    image = models.ImageField(
+        null=True,
+        upload_to=post_image_file_path,
+        storage=post_image_storage,
+    )
+    image_variants_ready = models.BooleanField(default=False)
+    updated_at = models.DateTimeField(auto_now=True)
+    # Kept up to date from the title by a database trigger on Postgres
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['user', 'id'],
+                name='core_post_user_id_idx',
+            ),
+        ]
 
     def __str__(self):
         return self.title
+
+
+class PostSignature(models.Model):
+    """MinHash signature of the tag and item set of a post"""
+    post = models.OneToOneField(
+        Post,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='signature',
+    )
+    signature = models.BinaryField()
+
+
+class PostBucket(models.Model):
+    """LSH bucket of one band of a post signature
+
+    Posts sharing a bucket are candidates for being similar.
+    """
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name='buckets',
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+    )
+    bucket = models.BigIntegerField()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['user', 'bucket'],
+                name='core_postbucket_user_idx',
+            ),
+        ]
@@ -0,0 +1,135 @@
+"""Item and tag recommendations from co-occurrence on a user's posts
+
+The links of a user's posts to items and tags are loaded into a sparse
+posts x features incidence matrix X, features being the user's items and
+tags. X.T @ X holds how often every two features share a post, from which
+the pointwise mutual information of every pair is computed at once:
+
+    pmi(a, b) = log(count(a, b) * posts / (count(a) * count(b)))
+
+The top RECOMMENDATION_TOP_K features of every feature are cached per
+user under the versions of the user's posts, tags and items, so a user's
+recommendations are recomputed on the first read after any of them
+changed and every other user's stay cached.
+"""
+import numpy as np
+from scipy import sparse
+
+from django.conf import settings
+from django.core.cache import caches
+
+from core import routers, versions
+from core.models import Post
+
+
+# Feature keys encode the relation in the lowest bit
+ITEM = 0
+TAG = 1
+RELATIONS = ((ITEM, 'items'), (TAG, 'tags'))
+
+
+def feature_key(kind, id_):
+    """Return the feature key of an item or tag id"""
+    return id_ * 2 + kind
+
+
+def split_key(key):
+    """Return the kind and id of a feature key"""
+    return key % 2, key // 2
+
+
+def _cache():
+    return caches[getattr(settings, 'RECOMMENDATION_CACHE_ALIAS', 'default')]
+
+
+def _links(user_id):
+    """Return the post ids and feature keys of every link of a user"""
+    post_ids = []
+    keys = []
+    for kind, relation in RELATIONS:
+        through = getattr(Post, relation).through
+        column = Post._meta.get_field(relation).m2m_reverse_name()
+        rows = np.array(
+            through.objects.filter(post__user_id=user_id)
+            .values_list('post_id', column),
+            dtype=np.int64
+        ).reshape(-1, 2)
+        post_ids.append(rows[:, 0])
+        keys.append(feature_key(kind, rows[:, 1]))
+
+    return np.concatenate(post_ids), np.concatenate(keys)
+
+
+def compute_recommendations(user_id, top_k, min_count):
+    """Return the top_k features by PMI of every feature of a user
+
+    Pairs sharing fewer than min_count posts are ignored, PMI is noisy for
+    them. Returns {feature key: [(feature key, pmi, count), ...]}.
+    """
+    post_ids, keys = _links(user_id)
+    if not len(keys):
+        return {}
+
+    posts, post_index = np.unique(post_ids, return_inverse=True)
+    features, feature_index = np.unique(keys, return_inverse=True)
+    incidence = sparse.csr_matrix(
+        (np.ones(len(keys)), (post_index, feature_index)),
+        shape=(len(posts), len(features))
+    )
+    counts = np.asarray(incidence.sum(axis=0)).ravel()
+    cooccurrence = (incidence.T @ incidence).tocoo()
+
+    keep = (cooccurrence.row != cooccurrence.col) & \
+        (cooccurrence.data >= min_count)
+    rows = cooccurrence.row[keep]
+    cols = cooccurrence.col[keep]
+    together = cooccurrence.data[keep]
+    pmi = np.log(together * len(posts) / (counts[rows] * counts[cols]))
+
+    # Sort by feature, then best pair first with ties in feature order,
+    # and keep the first top_k pairs of every feature
+    order = np.lexsort((cols, -together, -pmi, rows))
+    rows, cols, pmi, together = \
+        rows[order], cols[order], pmi[order], together[order]
+    group_start = np.flatnonzero(np.r_[True, rows[1:] != rows[:-1]])
+    rank = np.arange(len(rows)) - np.repeat(
+        group_start, np.diff(np.r_[group_start, len(rows)])
+    )
+    best = rank < top_k
+
+    recommendations = {}
+    for row, col, score, count in zip(
+            rows[best], cols[best], pmi[best], together[best]):
+        recommendations.setdefault(int(features[row]), []).append(
+            (int(features[col]), float(score), int(count))
+        )
+
+    return recommendations
+
+
+def user_recommendations(user_id):
+    """Return the cached recommendations of a user, computing them once"""
+    version_keys = [
+        versions.collection_key(model_name, user_id)
+        for model_name in ('post', 'tag', 'item')
+    ]
+    values = versions.get_versions(version_keys)
+    key = 'recommendations:{}:{}'.format(
+        user_id, ':'.join(repr(value) for value in values)
+    )
+    cache = _cache()
+    recommendations = cache.get(key)
+    if recommendations is None:
+        routers.pin_if_recent(max(values))
+        recommendations = compute_recommendations(
+            user_id,
+            getattr(settings, 'RECOMMENDATION_TOP_K', 50),
+            getattr(settings, 'RECOMMENDATION_MIN_COUNT', 2),
+        )
+        cache.set(
+            key,
+            recommendations,
+            getattr(settings, 'RECOMMENDATION_CACHE_TIMEOUT', 3600)
+        )
+
+    return recommendations
@@ -0,0 +1,45 @@
+from rest_framework import renderers
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised without orjson installed
+    orjson = None
+
+
+class FastJSONRenderer(renderers.JSONRenderer):
+    """JSON renderer that encodes with orjson when it is installed
+
+    Output is byte for byte the same as JSONRenderer's compact output.
+    Types orjson can not encode natively go through DRF's encoder, and
+    indented output, e.g. for the browsable API, or a missing orjson fall
+    back to the stdlib implementation.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        renderer_context = renderer_context or {}
+        indent = self.get_indent(accepted_media_type, renderer_context)
+        if orjson is None or indent is not None or self.ensure_ascii or \
+                not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(
+                data,
+                default=encoders.JSONEncoder().default,
+                option=(
+                    orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+                ),
+            )
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Match JSONRenderer, which escapes these to stay a javascript subset
+        return ret.replace(
+            '\u2028'.encode(), b'\\u2028'
+        ).replace(
+            '\u2029'.encode(), b'\\u2029'
+        )
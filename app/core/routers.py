@@ -0,0 +1,125 @@
+"""Send reads to read replicas and writes to the primary
+
+Replicas are the database aliases in DATABASE_REPLICAS. Reads go to a
+random replica that lags at most REPLICA_MAX_LAG seconds behind the
+primary, checked every REPLICA_LAG_CHECK_INTERVAL seconds, and to the
+primary when none does. A request reads the primary once it has written,
+inside transactions, and while pinned: `core.middleware.ReplicaPinMiddleware`
+pins the requests of a client for REPLICA_PIN_SECONDS after it wrote, and
+`pin_if_recent` pins requests reading data written within that window, so
+nothing cached under a new version is built from a lagging replica.
+"""
+import random
+import threading
+import time
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+
+# Seconds a Postgres replica is behind, 0 when it replayed everything it
+# received so an idle primary does not look like lag
+LAG_SQL = '''
+    SELECT CASE
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+    END
+'''
+
+_state = threading.local()
+_lag_checks = {}
+
+
+def replica_aliases():
+    return getattr(settings, 'DATABASE_REPLICAS', [])
+
+
+def pin_seconds():
+    return getattr(settings, 'REPLICA_PIN_SECONDS', 5)
+
+
+def pin_to_primary():
+    """Read from the primary for the rest of the request"""
+    _state.pinned = True
+
+
+def pin_if_recent(version):
+    """Pin the request when data it reads was written within the window"""
+    if replica_aliases() and time.time() - version < pin_seconds():
+        pin_to_primary()
+
+
+def is_pinned():
+    return getattr(_state, 'pinned', False) or getattr(_state, 'wrote', False)
+
+
+def has_written():
+    """Return whether the current request routed a write"""
+    return getattr(_state, 'wrote', False)
+
+
+def reset():
+    """Forget the pin and writes of the previous request of this thread"""
+    _state.pinned = False
+    _state.wrote = False
+
+
+def replica_lag(alias):
+    """Return how many seconds a replica is behind, None if unreachable"""
+    connection = connections[alias]
+    if connection.vendor != 'postgresql':
+        return 0.0
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(LAG_SQL)
+            return float(cursor.fetchone()[0] or 0)
+    except DatabaseError:
+        connection.close()
+        return None
+
+
+def healthy_replicas():
+    """Return the replicas lagging at most REPLICA_MAX_LAG seconds"""
+    max_lag = getattr(settings, 'REPLICA_MAX_LAG', 5)
+    interval = getattr(settings, 'REPLICA_LAG_CHECK_INTERVAL', 1)
+    now = time.monotonic()
+    healthy = []
+    for alias in replica_aliases():
+        checked = _lag_checks.get(alias)
+        if checked is None or now - checked[0] >= interval:
+            checked = _lag_checks[alias] = (now, replica_lag(alias))
+        lag = checked[1]
+        if lag is not None and lag <= max_lag:
+            healthy.append(alias)
+
+    return healthy
+
+
+class ReplicaRouter:
+    """Database router spreading reads over the healthy replicas"""
+
+    def db_for_read(self, model, **hints):
+        if is_pinned() or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        replicas = healthy_replicas()
+        if not replicas:
+            return DEFAULT_DB_ALIAS
+
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        _state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *replica_aliases()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+
+        return None
+
+    def allow_migrate(self, db, app_label, **hints):
+        if db in replica_aliases():
+            return False
+
+        return None
@@ -0,0 +1,76 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save, \
+    pre_delete
+from django.dispatch import receiver
+
+from core import similarity, versions
+from core.models import Item, Post, Tag
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_save, sender=Tag)
+@receiver(post_save, sender=Item)
+@receiver(post_delete, sender=Post)
+@receiver(post_delete, sender=Tag)
+@receiver(post_delete, sender=Item)
+def bump_object_version(sender, instance, **kwargs):
+    """Bump the versions of a written object and its user's collection"""
+    versions.bump(sender._meta.model_name, instance.user_id, [instance.pk])
+
+
+@receiver(m2m_changed, sender=Post.tags.through)
+@receiver(m2m_changed, sender=Post.items.through)
+def bump_post_relations_version(sender, instance, action, reverse, pk_set,
+                                **kwargs):
+    """Bump the versions of posts whose tags or items changed"""
+    if not action.startswith('post_'):
+        return
+
+    if reverse:
+        # A cleared relation has no pk_set, bumping the tag or item side
+        # as well invalidates every post that embeds it
+        versions.bump('post', instance.user_id, pk_set or ())
+        versions.bump(instance._meta.model_name, instance.user_id)
+    else:
+        versions.bump('post', instance.user_id, [instance.pk])
+
+
+def _linked_post_ids(instance):
+    """Return the ids of the posts a tag or item is assigned to"""
+    relation = 'tags' if isinstance(instance, Tag) else 'items'
+    through = getattr(Post, relation).through
+    column = Post._meta.get_field(relation).m2m_reverse_name()
+
+    return list(
+        through.objects.filter(**{column: instance.pk})
+        .values_list('post_id', flat=True)
+    )
+
+
+@receiver(m2m_changed, sender=Post.tags.through)
+@receiver(m2m_changed, sender=Post.items.through)
+def update_post_signatures(sender, instance, action, reverse, pk_set,
+                           **kwargs):
+    """Recompute the similarity signatures of posts whose sets changed"""
+    if not reverse:
+        if action.startswith('post_'):
+            similarity.update_signatures([instance.pk])
+    elif action == 'pre_clear':
+        instance._cleared_post_ids = _linked_post_ids(instance)
+    elif action == 'post_clear':
+        similarity.update_signatures(instance._cleared_post_ids)
+    elif action.startswith('post_'):
+        similarity.update_signatures(pk_set)
+
+
+@receiver(pre_delete, sender=Tag)
+@receiver(pre_delete, sender=Item)
+def collect_linked_posts(sender, instance, **kwargs):
+    """Remember the posts of a tag or item before its links are deleted"""
+    instance._linked_post_ids = _linked_post_ids(instance)
+
+
+@receiver(post_delete, sender=Tag)
+@receiver(post_delete, sender=Item)
+def update_linked_post_signatures(sender, instance, **kwargs):
+    """Recompute the signatures of the posts a deleted object was on"""
+    similarity.update_signatures(getattr(instance, '_linked_post_ids', ()))
@@ -0,0 +1,156 @@
+"""MinHash signatures and LSH buckets of the tag and item sets of posts
+
+A post's set holds its tag and item ids. The signature keeps the minimum
+of PERMUTATIONS hash functions over the set, the fraction of equal
+positions in two signatures estimates the Jaccard similarity of the sets.
+The signature is cut in BANDS bands of ROWS positions and every band is
+hashed to a bucket, so posts sharing any bucket are likely to be similar:
+with 16 bands of 4 rows, posts with a similarity of 0.5 share a bucket
+with a probability of 0.64, at 0.8 with a probability above 0.999.
+
+Changing the constants requires `python manage.py rebuild_post_signatures`.
+"""
+import hashlib
+import random
+import struct
+
+from django.db.models import Count
+
+from core.models import Post, PostBucket, PostSignature
+
+
+PERMUTATIONS = 64
+BANDS = 16
+ROWS = PERMUTATIONS // BANDS
+
+_PRIME = 2 ** 61 - 1
+_random = random.Random(0)
+_COEFFICIENTS = [
+    (_random.randrange(1, _PRIME), _random.randrange(0, _PRIME))
+    for _ in range(PERMUTATIONS)
+]
+_FORMAT = f'<{PERMUTATIONS}Q'
+
+
+def _token_hash(token):
+    """Return a stable 64 bit hash of a set element"""
+    digest = hashlib.blake2b(token.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, 'little')
+
+
+def signature(tokens):
+    """Return the MinHash signature of a non empty set as a tuple"""
+    hashes = [_token_hash(token) for token in tokens]
+    return tuple(
+        min((a * value + b) % _PRIME for value in hashes)
+        for a, b in _COEFFICIENTS
+    )
+
+
+def band_buckets(sig):
+    """Return the bucket of every band of a signature
+
+    The band number is hashed in, so equal values in different bands
+    never share a bucket.
+    """
+    buckets = []
+    for band in range(BANDS):
+        values = sig[band * ROWS:(band + 1) * ROWS]
+        digest = hashlib.blake2b(
+            struct.pack(f'<H{ROWS}Q', band, *values), digest_size=8
+        ).digest()
+        buckets.append(int.from_bytes(digest, 'little', signed=True))
+
+    return buckets
+
+
+def pack(sig):
+    """Return a signature as bytes"""
+    return struct.pack(_FORMAT, *sig)
+
+
+def unpack(data):
+    """Return the signature stored in bytes"""
+    return struct.unpack(_FORMAT, bytes(data))
+
+
+def jaccard(a, b):
+    """Return the Jaccard similarity of two sets"""
+    if not a and not b:
+        return 0.0
+
+    return len(a & b) / len(a | b)
+
+
+def post_sets(post_ids):
+    """Return the set elements of every given post"""
+    sets = {post_id: set() for post_id in post_ids}
+    for relation, prefix in (('tags', 'tag'), ('items', 'item')):
+        through = getattr(Post, relation).through
+        column = Post._meta.get_field(relation).m2m_reverse_name()
+        rows = through.objects.filter(post_id__in=sets) \
+            .values_list('post_id', column)
+        for post_id, id_ in rows:
+            sets[post_id].add(f'{prefix}:{id_}')
+
+    return sets
+
+
+def update_signatures(post_ids):
+    """Recompute the signatures and buckets of the given posts
+
+    Posts without tags and items get neither, they are similar to none.
+    """
+    post_ids = list(post_ids)
+    if not post_ids:
+        return
+
+    users = dict(
+        Post.objects.filter(id__in=post_ids).values_list('id', 'user_id')
+    )
+    sets = post_sets(users)
+    signatures = []
+    buckets = []
+    for post_id, tokens in sets.items():
+        if not tokens:
+            continue
+        sig = signature(tokens)
+        signatures.append(PostSignature(post_id=post_id, signature=pack(sig)))
+        buckets += [
+            PostBucket(post_id=post_id, user_id=users[post_id], bucket=bucket)
+            for bucket in band_buckets(sig)
+        ]
+
+    PostSignature.objects.filter(post_id__in=post_ids).delete()
+    PostBucket.objects.filter(post_id__in=post_ids).delete()
+    PostSignature.objects.bulk_create(signatures)
+    PostBucket.objects.bulk_create(buckets)
+
+
+def similar_posts(post, k, max_candidates=200):
+    """Return up to k (similarity, post id) pairs most similar to post
+
+    Candidates are the user's posts sharing an LSH bucket with post, the
+    ones sharing the most buckets are ranked by their exact similarity.
+    """
+    buckets = PostBucket.objects.filter(post=post).values('bucket')
+    candidates = list(
+        PostBucket.objects.filter(user_id=post.user_id, bucket__in=buckets)
+        .exclude(post=post)
+        .values('post_id')
+        .annotate(shared=Count('id'))
+        .order_by('-shared', '-post_id')
+        .values_list('post_id', flat=True)[:max_candidates]
+    )
+    if not candidates:
+        return []
+
+    sets = post_sets(candidates + [post.id])
+    target = sets.pop(post.id)
+    ranked = sorted(
+        ((jaccard(target, tokens), post_id)
+         for post_id, tokens in sets.items()),
+        reverse=True
+    )
+
+    return [(score, post_id) for score, post_id in ranked[:k] if score > 0]
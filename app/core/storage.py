@@ -0,0 +1,84 @@
+import hashlib
+import os
+
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+from django.utils.deconstruct import deconstructible
+
+
+def content_digest(content):
+    """Return the sha256 hex digest of a file, reading it in chunks"""
+    digest = hashlib.sha256()
+    for chunk in content.chunks():
+        digest.update(chunk)
+    content.seek(0)
+
+    return digest.hexdigest()
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    """File storage that stores every distinct file once under its digest
+
+    The directory and extension of the requested name are kept, the file
+    name becomes the sha256 of the content, fanned out over two character
+    subdirectories. Saving content that is already stored returns the
+    existing name without writing, so names are immutable and files are
+    shared by every row that references them. Files are only removed by
+    the `gc_post_images` command.
+    """
+
+    def content_name(self, name, digest):
+        """Return the content addressed name for a file"""
+        directory = os.path.dirname(name)
+        ext = os.path.splitext(name)[1].lower()
+
+        return os.path.join(directory, digest[:2], f'{digest}{ext}')
+
+    def get_available_name(self, name, max_length=None):
+        """Return name unchanged, a taken name holds the same content
+
+        Django would append a suffix to a taken name. Raising
+        FileExistsError instead also ends the retry loop of _save() when a
+        concurrent save of the same content created the file first.
+        """
+        if self.exists(name):
+            raise FileExistsError(name)
+
+        return name
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, 'chunks'):
+            content = File(content, name)
+
+        digest = getattr(content, 'content_digest', None)
+        if digest is None:
+            digest = content_digest(content)
+        name = self.content_name(name, digest)
+
+        try:
+            return super().save(name, content, max_length=max_length)
+        except FileExistsError:
+            if not self.exists(name):
+                raise
+
+        # Already stored, refresh the modification time so garbage
+        # collection treats the file as freshly referenced
+        os.utime(self.path(name))
+        return name
+
+    def save_derived(self, name, content):
+        """Save a file derived from a stored file under a fixed name
+
+        Derived files, such as image variants, are named after the file
+        they were made from and are never rewritten once they exist.
+        """
+        try:
+            return super().save(name, content)
+        except FileExistsError:
+            if not self.exists(name):
+                raise
+
+        return name
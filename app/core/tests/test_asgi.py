@@ -0,0 +1,104 @@
+import asyncio
+import threading
+
+from django.core import signals
+from django.http import StreamingHttpResponse
+from django.test import SimpleTestCase, override_settings
+
+from core.asgi import ASGIHandler
+
+
+def scope(path, method='GET'):
+    return {
+        'type': 'http',
+        'method': method,
+        'path': path,
+        'query_string': b'',
+        'headers': [(b'host', b'testserver')],
+        'server': ('testserver', 80),
+    }
+
+
+@override_settings(ALLOWED_HOSTS=['testserver'])
+class ASGIHandlerTests(SimpleTestCase):
+
+    def setUp(self):
+        self.handler = ASGIHandler()
+        self.addCleanup(self.handler.executor.shutdown)
+        self.sent = []
+
+    def call(self, request_scope, messages):
+        messages = list(messages)
+
+        async def receive():
+            return messages.pop(0)
+
+        async def send(message):
+            self.sent.append(message)
+
+        asyncio.run(self.handler(request_scope, receive, send))
+
+    def test_request_runs_on_pool_thread(self):
+        """Test a request is served and finished on one pool thread"""
+        threads = []
+
+        def record(**kwargs):
+            threads.append(threading.current_thread().name)
+
+        for signal in (signals.request_started, signals.request_finished):
+            signal.connect(record)
+            self.addCleanup(signal.disconnect, record)
+
+        self.call(scope('/api/post/tags/'), [{'type': 'http.request'}])
+
+        self.assertEqual(self.sent[0]['status'], 401)
+        self.assertEqual(len(threads), 2)
+        self.assertEqual(threads[0], threads[1])
+        self.assertTrue(threads[0].startswith('asgi-request'))
+
+    def test_disconnect_sends_nothing(self):
+        """Test a client disconnecting during the body gets no response"""
+        self.call(scope('/api/post/tags/', 'POST'), [
+            {'type': 'http.request', 'body': b'{', 'more_body': True},
+            {'type': 'http.disconnect'},
+        ])
+
+        self.assertEqual(self.sent, [])
+
+    @override_settings(FILE_UPLOAD_MAX_MEMORY_SIZE=10)
+    def test_large_body_is_spooled(self):
+        """Test a body larger than the memory limit is read completely"""
+        messages = [
+            {'type': 'http.request', 'body': b'x' * 8, 'more_body': True},
+            {'type': 'http.request', 'body': b'y' * 8, 'more_body': True},
+            {'type': 'http.request', 'body': b'z' * 8},
+        ]
+
+        async def receive():
+            return messages.pop(0)
+
+        body_file = asyncio.run(self.handler.read_body(receive))
+
+        self.assertEqual(body_file.read(), b'x' * 8 + b'y' * 8 + b'z' * 8)
+
+    def test_streaming_response(self):
+        """Test streaming content is sent part by part and closed"""
+        response = StreamingHttpResponse(iter([b'ab', b'cd']))
+        closed = []
+
+        def record(**kwargs):
+            closed.append(True)
+
+        signals.request_finished.connect(record)
+        self.addCleanup(signals.request_finished.disconnect, record)
+
+        async def send(message):
+            self.sent.append(message)
+
+        asyncio.run(self.handler.send_response(response, send))
+
+        self.assertEqual(
+            [message.get('body') for message in self.sent[1:]],
+            [b'ab', b'cd', None]
+        )
+        self.assertEqual(closed, [True])
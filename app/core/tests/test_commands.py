@@ -1,21 +1,74 @@
+from io import StringIO
 from unittest.mock import patch
+
 from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db.backends.base.base import BaseDatabaseWrapper
 from django.db.utils import OperationalError
 from django.test import TestCase
 
+
+def flaky_connection(failures):
+    """Patch connecting to fail the given number of times"""
+    original = BaseDatabaseWrapper.ensure_connection
+    calls = []
+
+    def ensure_connection(self):
+        calls.append(self.alias)
+        if len(calls) <= failures:
+            raise OperationalError('could not connect to server')
+        return original(self)
+
+    return patch.object(
+        BaseDatabaseWrapper, 'ensure_connection', ensure_connection
+    ), calls
+
+
 class CommandTest(TestCase):
 
     def test_wait_for_db_ready(self):
         """Test waiting for db when db is available"""
-        with patch('django.db.utils.ConnectionHandler.__getitem__') as gi:
-            gi.return_value = True
-            call_command('wait_for_db')
-            self.assertEqual(gi.call_count, 1)
-    
-    @patch('time.sleep', return_value = True)
+        with patch('django.db.backends.utils.CursorWrapper.execute') as ex, \
+                patch('time.sleep') as ts:
+            call_command('wait_for_db', stdout=StringIO())
+
+        ex.assert_called_once_with('SELECT 1')
+        ts.assert_not_called()
+
+    @patch('time.sleep', return_value=True)
     def test_wait_for_db(self, ts):
-        """Test waiting for db"""
-        with patch('django.db.utils.ConnectionHandler.__getitem__') as gi:
-            gi.side_effect = [OperationalError] * 5 + [True]
-            call_command('wait_for_db')
-            self.assertEqual(gi.call_count, 6)
+        """Test waiting for db backs off exponentially between probes"""
+        connecting, calls = flaky_connection(5)
+        with connecting:
+            call_command(
+                'wait_for_db', initial_delay=0.05, max_delay=0.3,
+                stdout=StringIO()
+            )
+
+        delays = [call[0][0] for call in ts.call_args_list]
+        self.assertEqual(len(delays), 5)
+        for attempt, delay in enumerate(delays):
+            ceiling = min(0.3, 0.05 * 2 ** attempt)
+            self.assertTrue(ceiling / 2 <= delay <= ceiling)
+
+    @patch('time.sleep', return_value=True)
+    def test_wait_for_db_timeout(self, ts):
+        """Test the command fails once the timeout passes"""
+        connecting, calls = flaky_connection(1000)
+        with connecting, self.assertRaisesMessage(CommandError, 'default'):
+            call_command(
+                'wait_for_db', timeout=0, stdout=StringIO(), stderr=StringIO()
+            )
+
+        ts.assert_not_called()
+
+    @patch('time.sleep', return_value=True)
+    def test_wait_for_selected_databases(self, ts):
+        """Test only the given databases are probed"""
+        connecting, calls = flaky_connection(0)
+        with connecting:
+            call_command(
+                'wait_for_db', databases=['default'], stdout=StringIO()
+            )
+
+        self.assertEqual(set(calls), {'default'})
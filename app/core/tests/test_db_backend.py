@@ -0,0 +1,195 @@
+import sys
+import types
+from unittest.mock import MagicMock, patch
+
+from django.core.signals import request_started
+from django.db import connection, connections
+from django.test import SimpleTestCase
+
+
+IDLE, ACTIVE, INTRANS, INERROR, UNKNOWN = range(5)
+
+
+def fake_psycopg2():
+    """Return the sys.modules entries of a psycopg2 stand-in
+
+    Only what Django's postgresql backend touches on import and while
+    connecting is provided, the connections themselves are mocks.
+    """
+    psycopg2 = types.ModuleType('psycopg2')
+    psycopg2.__version__ = '2.8.6 (dt dec pq3 ext lo64)'
+    psycopg2.Error = type('Error', (Exception,), {})
+    psycopg2.InterfaceError = type('InterfaceError', (psycopg2.Error,), {})
+    psycopg2.DatabaseError = type('DatabaseError', (psycopg2.Error,), {})
+    for name in ('DataError', 'OperationalError', 'IntegrityError',
+                 'InternalError', 'ProgrammingError', 'NotSupportedError'):
+        setattr(psycopg2, name, type(name, (psycopg2.DatabaseError,), {}))
+
+    psycopg2.extensions = MagicMock(
+        TRANSACTION_STATUS_IDLE=IDLE,
+        TRANSACTION_STATUS_ACTIVE=ACTIVE,
+        TRANSACTION_STATUS_INTRANS=INTRANS,
+        TRANSACTION_STATUS_INERROR=INERROR,
+        TRANSACTION_STATUS_UNKNOWN=UNKNOWN,
+    )
+    psycopg2.extras = MagicMock()
+    psycopg2.errorcodes = MagicMock()
+    psycopg2.sql = MagicMock()
+
+    return {
+        'psycopg2': psycopg2,
+        'psycopg2.extensions': psycopg2.extensions,
+        'psycopg2.extras': psycopg2.extras,
+        'psycopg2.errorcodes': psycopg2.errorcodes,
+        'psycopg2.sql': psycopg2.sql,
+    }
+
+
+def import_backend():
+    """Import the backend, against a fake psycopg2 when it is missing"""
+    try:
+        import psycopg2  # noqa: F401
+    except ImportError:
+        imported = (
+            'psycopg2',
+            'django.db.backends.postgresql',
+            'core.db.backends.postgresql',
+        )
+        modules = {
+            name: module for name, module in sys.modules.items()
+            if not name.startswith(imported)
+        }
+        modules.update(fake_psycopg2())
+        with patch.dict(sys.modules, modules, clear=True):
+            from core.db.backends.postgresql import base
+    else:
+        from core.db.backends.postgresql import base
+
+    return base
+
+
+backend = import_backend()
+
+
+def fake_connection(status=IDLE):
+    """Return a mock psycopg2 connection in a transaction status"""
+    raw = MagicMock(closed=False)
+    raw.get_transaction_status.return_value = status
+    raw.get_parameter_status.return_value = 'UTC'
+    return raw
+
+
+class PostgresBackendTests(SimpleTestCase):
+
+    def setUp(self):
+        self.raw_connections = []
+        patcher = patch.object(
+            backend.base.DatabaseWrapper,
+            'get_new_connection',
+            side_effect=self._new_connection,
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(backend.close_pools)
+
+    def _new_connection(self, conn_params):
+        raw = fake_connection()
+        self.raw_connections.append(raw)
+        return raw
+
+    def wrapper(self, **settings):
+        settings_dict = dict(
+            connection.settings_dict,
+            ENGINE='core.db.backends.postgresql',
+            NAME='outfitted',
+            CONN_MAX_AGE=0,
+            HEALTH_CHECKS=False,
+            POOL=None,
+        )
+        settings_dict.update(settings)
+        return backend.DatabaseWrapper(settings_dict, alias='pooled')
+
+    def pooled_wrapper(self):
+        return self.wrapper(POOL={'MAX_SIZE': 2, 'CHECK_AFTER': 60})
+
+    def test_close_returns_connection_to_pool(self):
+        """Test closing outside atomic() keeps the connection for reuse"""
+        wrapper = self.pooled_wrapper()
+        wrapper.ensure_connection()
+        raw = wrapper.connection
+
+        wrapper.close()
+
+        raw.close.assert_not_called()
+        wrapper.ensure_connection()
+        self.assertIs(wrapper.connection, raw)
+        self.assertEqual(len(self.raw_connections), 1)
+
+    def test_close_inside_atomic_discards_connection(self):
+        """Test a connection closed inside atomic() is never handed out"""
+        wrapper = self.pooled_wrapper()
+        wrapper.ensure_connection()
+        raw = wrapper.connection
+        wrapper.in_atomic_block = True
+
+        wrapper.close()
+
+        raw.close.assert_called_once_with()
+        self.assertIsNot(wrapper.pool.acquire(), raw)
+
+    def test_open_transaction_rolled_back(self):
+        """Test a connection left in a transaction is rolled back first"""
+        wrapper = self.pooled_wrapper()
+        wrapper.ensure_connection()
+        raw = wrapper.connection
+        raw.get_transaction_status.return_value = INTRANS
+
+        wrapper.close()
+
+        raw.rollback.assert_called_once_with()
+        raw.close.assert_not_called()
+        self.assertIs(wrapper.pool.acquire(), raw)
+
+    def test_unknown_status_discards_connection(self):
+        """Test a connection in an unknown state is closed, not reused"""
+        wrapper = self.pooled_wrapper()
+        wrapper.ensure_connection()
+        raw = wrapper.connection
+        raw.get_transaction_status.return_value = UNKNOWN
+
+        wrapper.close()
+
+        raw.rollback.assert_not_called()
+        raw.close.assert_called_once_with()
+        self.assertIsNot(wrapper.pool.acquire(), raw)
+
+    def test_health_check_once_per_request(self):
+        """Test a persistent connection is checked on its first use only"""
+        wrapper = self.wrapper(CONN_MAX_AGE=60, HEALTH_CHECKS=True)
+        wrapper.ensure_connection()
+
+        with patch.object(connections, 'all', return_value=[wrapper]), \
+                patch.object(wrapper, 'is_usable',
+                             return_value=True) as is_usable:
+            for _ in range(2):
+                request_started.send(sender=None)
+                wrapper.ensure_connection()
+                wrapper.ensure_connection()
+
+        self.assertEqual(is_usable.call_count, 2)
+        self.assertEqual(len(self.raw_connections), 1)
+
+    def test_failed_health_check_reconnects(self):
+        """Test a connection that fails its health check is replaced"""
+        wrapper = self.wrapper(CONN_MAX_AGE=60, HEALTH_CHECKS=True)
+        wrapper.ensure_connection()
+        raw = wrapper.connection
+
+        with patch.object(connections, 'all', return_value=[wrapper]), \
+                patch.object(wrapper, 'is_usable', return_value=False):
+            request_started.send(sender=None)
+            wrapper.ensure_connection()
+
+        raw.close.assert_called_once_with()
+        self.assertIsNot(wrapper.connection, raw)
+        self.assertEqual(len(self.raw_connections), 2)
@@ -0,0 +1,101 @@
+import threading
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+
+from core.db.pool import ConnectionPool, PoolTimeout
+
+
+class FakeConnection:
+
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class ConnectionPoolTests(SimpleTestCase):
+
+    def test_released_connection_is_reused(self):
+        """Test a returned connection is handed out again"""
+        pool = ConnectionPool(FakeConnection, max_size=2)
+        connection = pool.acquire()
+        pool.release(connection)
+
+        self.assertIs(pool.acquire(), connection)
+
+    def test_full_pool_times_out(self):
+        """Test callers wait for a slot and give up after the timeout"""
+        pool = ConnectionPool(FakeConnection, max_size=1, timeout=0.01)
+        pool.acquire()
+
+        with self.assertRaises(PoolTimeout):
+            pool.acquire()
+
+    def test_waiting_caller_gets_released_connection(self):
+        """Test a caller waiting on a full pool gets the next connection"""
+        pool = ConnectionPool(FakeConnection, max_size=1, timeout=5)
+        connection = pool.acquire()
+        acquired = []
+        waiter = threading.Thread(target=lambda: acquired.append(
+            pool.acquire()
+        ))
+        waiter.start()
+
+        pool.release(connection)
+        waiter.join()
+
+        self.assertEqual(acquired, [connection])
+
+    def test_unusable_connection_is_discarded(self):
+        """Test an idle connection failing its check is replaced"""
+        pool = ConnectionPool(
+            FakeConnection, max_size=1, check=lambda c: False, check_after=0
+        )
+        connection = pool.acquire()
+        pool.release(connection)
+
+        with patch('core.db.pool.time.monotonic', return_value=1e9):
+            replacement = pool.acquire()
+
+        self.assertIsNot(replacement, connection)
+        self.assertTrue(connection.closed)
+
+    def test_recent_connection_is_not_checked(self):
+        """Test connections idle less than check_after skip the check"""
+        def check(connection):
+            raise AssertionError('checked')
+
+        pool = ConnectionPool(
+            FakeConnection, max_size=1, check=check, check_after=60
+        )
+        connection = pool.acquire()
+        pool.release(connection)
+
+        self.assertIs(pool.acquire(), connection)
+
+    def test_not_reusable_connection_is_closed(self):
+        """Test releasing a broken connection closes it and frees its slot"""
+        pool = ConnectionPool(FakeConnection, max_size=1, timeout=0.01)
+        connection = pool.acquire()
+        pool.release(connection, reusable=False)
+
+        self.assertTrue(connection.closed)
+        self.assertIsNot(pool.acquire(), connection)
+
+    def test_failed_connect_frees_slot(self):
+        """Test a failing connect does not leak a slot"""
+        calls = []
+
+        def connect():
+            calls.append(1)
+            if len(calls) == 1:
+                raise OSError('refused')
+            return FakeConnection()
+
+        pool = ConnectionPool(connect, max_size=1, timeout=0.01)
+        with self.assertRaises(OSError):
+            pool.acquire()
+
+        self.assertIsInstance(pool.acquire(), FakeConnection)
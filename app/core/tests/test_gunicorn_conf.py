@@ -0,0 +1,61 @@
+from types import SimpleNamespace
+from unittest.mock import mock_open, patch
+
+from django.test import SimpleTestCase, override_settings
+
+from app import gunicorn_conf
+
+
+class WorkerSizingTests(SimpleTestCase):
+
+    def test_threads_follow_io_ratio(self):
+        """Test a worker gets 1 + the I/O wait to CPU ratio threads"""
+        self.assertEqual(gunicorn_conf.thread_count(0), 1)
+        self.assertEqual(gunicorn_conf.thread_count(2), 3)
+        self.assertEqual(gunicorn_conf.thread_count(2.5), 4)
+
+    def test_at_least_two_workers(self):
+        """Test one worker per core and never fewer than two"""
+        self.assertEqual(gunicorn_conf.worker_count(1), 2)
+        self.assertEqual(gunicorn_conf.worker_count(8), 8)
+
+    def test_cpu_count_honours_cgroup_quota(self):
+        """Test a container CPU quota caps the core count"""
+        with patch('os.sched_getaffinity', return_value=set(range(16))), \
+                patch('builtins.open', mock_open(read_data='150000 100000')):
+            self.assertEqual(gunicorn_conf.cpu_count(), 2)
+
+        with patch('os.sched_getaffinity', return_value=set(range(16))), \
+                patch('builtins.open', mock_open(read_data='max 100000')):
+            self.assertEqual(gunicorn_conf.cpu_count(), 16)
+
+
+SHARED = 'django.core.cache.backends.memcached.MemcachedCache'
+LOCAL = 'django.core.cache.backends.locmem.LocMemCache'
+
+
+class SharedCacheTests(SimpleTestCase):
+
+    @override_settings(
+        CACHES={'default': {'BACKEND': LOCAL}},
+        VERSION_CACHE_ALIAS='default',
+    )
+    def test_several_workers_refuse_local_caches(self):
+        """Test workers do not start with per process version caches"""
+        with self.assertRaises(RuntimeError):
+            gunicorn_conf.on_starting(SimpleNamespace(num_workers=2))
+
+        gunicorn_conf.on_starting(SimpleNamespace(num_workers=1))
+
+    @override_settings(
+        CACHES={'default': {'BACKEND': LOCAL}, 'shared': {'BACKEND': SHARED}},
+        VERSION_CACHE_ALIAS='shared',
+        DATABASE_REPLICAS=['replica_0'],
+        REPLICA_PIN_CACHE_ALIAS='default',
+    )
+    def test_replica_pins_must_be_shared(self):
+        """Test the pin cache must be shared once there are replicas"""
+        self.assertEqual(gunicorn_conf.local_cache_aliases(), ['default'])
+
+        with self.settings(DATABASE_REPLICAS=[]):
+            self.assertEqual(gunicorn_conf.local_cache_aliases(), [])
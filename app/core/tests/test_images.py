@@ -0,0 +1,172 @@
+import io
+import os
+import threading
+from io import StringIO
+from unittest.mock import patch
+
+from PIL import Image
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, TransactionTestCase, override_settings
+
+from core import images
+from core.models import Post
+
+
+def sample_image(size=(800, 400), image_format='JPEG', orientation=None):
+    """Return an uploaded file holding a generated image"""
+    image = Image.new('RGB', size)
+    file = SimpleUploadedFile('outfit.jpg', b'', content_type='image/jpeg')
+    exif = Image.Exif()
+    if orientation is not None:
+        exif[0x0112] = orientation
+    image.save(file, format=image_format, exif=exif)
+    file.seek(0)
+    return file
+
+
+class InspectImageTests(TestCase):
+
+    def test_inspect_image(self):
+        """Test that format and size are read from the header"""
+        image_format, width, height = images.inspect_image(sample_image())
+
+        self.assertEqual((image_format, width, height), ('JPEG', 800, 400))
+
+    def test_inspect_truncated_image(self):
+        """Test that a truncated image is inspected from its header"""
+        data = sample_image().read()
+        header = io.BytesIO(data[:len(data) // 2])
+
+        self.assertEqual(images.inspect_image(header), ('JPEG', 800, 400))
+
+    @override_settings(POST_IMAGE_MAX_PIXELS=1000)
+    def test_inspect_image_too_many_pixels(self):
+        """Test that images above the pixel limit are rejected"""
+        with self.assertRaises(images.ImageLimitError):
+            images.inspect_image(sample_image())
+
+    def test_inspect_invalid_image(self):
+        """Test that files that are not images are rejected"""
+        with self.assertRaises(images.InvalidImageError):
+            images.inspect_image(io.BytesIO(b'not an image'))
+
+
+@override_settings(
+    POST_IMAGE_VARIANTS={'thumb': 100, 'large': 400},
+    POST_IMAGE_VARIANT_FORMATS=('jpeg', 'webp'),
+)
+class ImageVariantTests(TestCase):
+
+    def setUp(self):
+        user = get_user_model().objects.create_user(
+            email = 'test@outfitted.com',
+            first_name = 'Test',
+            surname = 'von Account',
+            password = 'test123'
+        )
+        self.post = Post.objects.create(user=user, title='Summer outfit')
+        self.post.image.save('outfit.jpg', sample_image())
+        self.storage = self.post.image.storage
+
+    def tearDown(self):
+        for name in images.variant_file_paths(self.post.image.name):
+            self.storage.delete(name)
+        self.post.image.delete()
+
+    def test_variant_file_path(self):
+        """Test that variants are named after the original image"""
+        path = images.variant_file_path('upload/post/abc.png', 'thumb', 'webp')
+
+        self.assertEqual(path, 'upload/post/variants/abc_thumb.webp')
+
+    def test_generate_variants(self):
+        """Test that every size and format variant is written"""
+        updated = images.generate_variants(self.post.id, self.post.image.name)
+
+        self.post.refresh_from_db()
+        self.assertEqual(updated, 1)
+        self.assertTrue(self.post.image_variants_ready)
+        for name in images.variant_file_paths(self.post.image.name):
+            self.assertTrue(os.path.exists(self.storage.path(name)))
+
+        thumb = images.variant_file_path(self.post.image.name, 'thumb', 'jpeg')
+        with Image.open(self.storage.path(thumb)) as image:
+            self.assertEqual(image.size, (100, 50))
+
+    def test_generate_variants_applies_orientation(self):
+        """Test that variants are rotated by the EXIF orientation"""
+        self.post.image.delete()
+        self.post.image.save('rotated.jpg', sample_image(orientation=6))
+
+        images.generate_variants(self.post.id, self.post.image.name)
+
+        for size, edges in (('large', (200, 400)), ('thumb', (50, 100))):
+            name = images.variant_file_path(self.post.image.name, size, 'webp')
+            with Image.open(self.storage.path(name)) as image:
+                self.assertEqual(image.size, edges)
+
+    def test_regenerate_command(self):
+        """Test that the command generates variants of posts not ready"""
+        out = StringIO()
+        call_command('regenerate_post_variants', stdout=out)
+
+        self.post.refresh_from_db()
+        self.assertTrue(self.post.image_variants_ready)
+        self.assertIn('Generated variants of 1 posts', out.getvalue())
+        for name in images.variant_file_paths(self.post.image.name):
+            self.assertTrue(self.storage.exists(name))
+
+    def test_generate_variants_for_replaced_image(self):
+        """Test that a stale job does not mark a newer image as ready"""
+        old_name = self.post.image.name
+        self.post.image.save('new.jpg', sample_image(size=(400, 400)))
+
+        updated = images.generate_variants(self.post.id, old_name)
+
+        self.post.refresh_from_db()
+        self.assertEqual(updated, 0)
+        self.assertFalse(self.post.image_variants_ready)
+        for name in images.variant_file_paths(old_name):
+            self.storage.delete(name)
+        self.storage.delete(old_name)
+
+
+class ImageVariantWorkerTests(TransactionTestCase):
+
+    def test_schedule_variants(self):
+        """Test that variants are generated by the worker pool"""
+        user = get_user_model().objects.create_user(
+            email = 'test@outfitted.com',
+            first_name = 'Test',
+            surname = 'von Account',
+            password = 'test123'
+        )
+        post = Post.objects.create(user=user, title='Summer outfit')
+        post.image.save('outfit.jpg', sample_image())
+
+        future = images.schedule_variants(post)
+
+        self.assertEqual(future.result(timeout=10), 1)
+        post.refresh_from_db()
+        self.assertTrue(post.image_variants_ready)
+        for name in images.variant_file_paths(post.image.name):
+            post.image.storage.delete(name)
+        post.image.delete()
+
+    def test_failed_job_logged(self):
+        """Test that a failing worker job is logged"""
+        post = Post(pk=1)
+        post.image.name = 'upload/post/missing.jpg'
+
+        with patch('core.images.generate_variants', side_effect=OSError), \
+                self.assertLogs('core.images', level='ERROR') as logs:
+            future = images.schedule_variants(post)
+            # Callbacks run in order, once this one ran the log is written
+            logged = threading.Event()
+            future.add_done_callback(lambda future: logged.set())
+            self.assertTrue(logged.wait(timeout=10))
+
+        self.assertIn('upload/post/missing.jpg', logs.output[0])
@@ -1,5 +1,6 @@
 from unittest.mock import patch
 
+from django.db import connection
 from django.test import TestCase
 from django.contrib.auth import get_user_model
 
@@ -102,4 +103,25 @@ class ModelTests(TestCase):
         file_path = models.post_image_file_path(None, 'myimage.jpg')
 
         exp_path = f'upload/post/{uuid}.jpg'
-        self.assertEqual(file_path, exp_path)
\ No newline at end of file
+        self.assertEqual(file_path, exp_path)
+
+    def test_per_user_indexes(self):
+        """Test that the composite per-user indexes exist"""
+        expected = {
+            'core_tag': ['user_id', 'name'],
+            'core_item': ['user_id', 'name'],
+            'core_post': ['user_id', 'id'],
+            'core_post_tags': ['tag_id', 'post_id'],
+            'core_post_items': ['item_id', 'post_id'],
+        }
+        with connection.cursor() as cursor:
+            for table, columns in expected.items():
+                constraints = connection.introspection.get_constraints(
+                    cursor, table
+                )
+                indexes = [
+                    constraint['columns']
+                    for constraint in constraints.values()
+                    if constraint['index']
+                ]
+                self.assertIn(columns, indexes)
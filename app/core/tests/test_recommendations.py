@@ -0,0 +1,96 @@
+import math
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+
+from core import recommendations
+from core.models import Item, Post, Tag
+from core.recommendations import ITEM, TAG, feature_key
+from core.tests.utils import commit_hooks
+
+
+class RecommendationTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            email='test@outfitted.com',
+            first_name='Test',
+            surname='von Account',
+            password='test123'
+        )
+        self.shirt = Item.objects.create(user=self.user, name='shirt')
+        self.jeans = Item.objects.create(user=self.user, name='jeans')
+        self.scarf = Item.objects.create(user=self.user, name='scarf')
+        self.casual = Tag.objects.create(user=self.user, name='Casual')
+
+    def sample_post(self, items, tags=()):
+        post = Post.objects.create(user=self.user, title='Outfit')
+        post.items.set(items)
+        post.tags.set(tags)
+        return post
+
+    def test_pmi_scores(self):
+        """Test pairs are scored by pointwise mutual information"""
+        self.sample_post([self.shirt, self.jeans], [self.casual])
+        self.sample_post([self.shirt, self.jeans], [self.casual])
+        self.sample_post([self.shirt, self.scarf])
+        self.sample_post([self.scarf])
+
+        result = recommendations.compute_recommendations(
+            self.user.id, top_k=10, min_count=1
+        )
+
+        shirt = result[feature_key(ITEM, self.shirt.id)]
+        tied = sorted([
+            feature_key(TAG, self.casual.id),
+            feature_key(ITEM, self.jeans.id),
+        ])
+        self.assertEqual(
+            [key for key, score, count in shirt],
+            tied + [feature_key(ITEM, self.scarf.id)]
+        )
+        self.assertAlmostEqual(shirt[0][1], math.log(2 * 4 / (3 * 2)))
+        self.assertEqual(shirt[0][2], 2)
+        self.assertAlmostEqual(shirt[2][1], math.log(1 * 4 / (3 * 2)))
+
+    def test_min_count_and_top_k(self):
+        """Test rare pairs are dropped and lists are cut at top_k"""
+        self.sample_post([self.shirt, self.jeans, self.scarf])
+        self.sample_post([self.shirt, self.jeans])
+
+        result = recommendations.compute_recommendations(
+            self.user.id, top_k=1, min_count=2
+        )
+
+        self.assertEqual(
+            result[feature_key(ITEM, self.shirt.id)],
+            [(feature_key(ITEM, self.jeans.id), 0.0, 2)]
+        )
+        self.assertNotIn(feature_key(ITEM, self.scarf.id), result)
+
+    def test_user_recommendations_refresh(self):
+        """Test cached recommendations refresh after a post changes"""
+        post = self.sample_post([self.shirt, self.jeans])
+        self.sample_post([self.shirt, self.jeans])
+        key = feature_key(ITEM, self.shirt.id)
+
+        self.assertEqual(len(
+            recommendations.user_recommendations(self.user.id)[key]
+        ), 1)
+        with self.assertNumQueries(0):
+            recommendations.user_recommendations(self.user.id)
+
+        with commit_hooks():
+            post.items.add(self.scarf)
+            self.sample_post([self.shirt, self.scarf])
+        self.assertEqual(len(
+            recommendations.user_recommendations(self.user.id)[key]
+        ), 2)
+
+    def test_no_posts(self):
+        """Test users without linked posts get no recommendations"""
+        self.assertEqual(
+            recommendations.user_recommendations(self.user.id), {}
+        )
@@ -0,0 +1,96 @@
+import datetime
+import decimal
+import io
+import uuid
+from collections import OrderedDict
+from unittest.mock import patch
+
+from django.test import TestCase
+from django.utils.translation import gettext_lazy as _
+
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from core.parsers import FastJSONParser
+from core.renderers import FastJSONRenderer
+
+
+SAMPLE_DATA = [
+    OrderedDict([
+        ('id', 1),
+        ('title', 'Summer outfit \u2028\u2029 café'),
+        ('items', [OrderedDict([('id', 2), ('name', 'Shirt')])]),
+        ('tags', []),
+        ('image', None),
+        ('score', 1.5),
+        ('price', decimal.Decimal('9.99')),
+        ('created', datetime.datetime(2020, 5, 20, 21, 12, 0, 123456)),
+        ('uuid', uuid.UUID('12345678-1234-5678-1234-567812345678')),
+        ('error', _('Invalid token.')),
+        (1, 'int key'),
+    ]),
+]
+
+
+class FastJSONRendererTests(TestCase):
+
+    def test_output_matches_json_renderer(self):
+        """Test that the output is identical to JSONRenderer"""
+        self.assertEqual(
+            FastJSONRenderer().render(SAMPLE_DATA),
+            JSONRenderer().render(SAMPLE_DATA),
+        )
+
+    def test_indent_matches_json_renderer(self):
+        """Test that indented output is identical to JSONRenderer"""
+        context = {'indent': 4}
+        self.assertEqual(
+            FastJSONRenderer().render(SAMPLE_DATA, None, context),
+            JSONRenderer().render(SAMPLE_DATA, None, context),
+        )
+
+    def test_fallback_without_orjson(self):
+        """Test that the stdlib is used when orjson is not installed"""
+        with patch('core.renderers.orjson', None):
+            output = FastJSONRenderer().render(SAMPLE_DATA)
+
+        self.assertEqual(output, JSONRenderer().render(SAMPLE_DATA))
+
+    def test_render_none(self):
+        """Test that no data renders an empty body"""
+        self.assertEqual(FastJSONRenderer().render(None), b'')
+
+
+class FastJSONParserTests(TestCase):
+
+    def test_parse(self):
+        """Test that parsing matches JSONParser"""
+        body = '{"title": "café", "tags": [1, 2], "score": 1.5}'.encode()
+
+        self.assertEqual(
+            FastJSONParser().parse(io.BytesIO(body)),
+            JSONParser().parse(io.BytesIO(body)),
+        )
+
+    def test_parse_invalid(self):
+        """Test that invalid JSON raises a parse error"""
+        with self.assertRaises(ParseError):
+            FastJSONParser().parse(io.BytesIO(b'{"title":'))
+
+    def test_fallback_without_orjson(self):
+        """Test that the stdlib is used when orjson is not installed"""
+        with patch('core.parsers.orjson', None):
+            data = FastJSONParser().parse(io.BytesIO(b'{"tags": [1]}'))
+
+        self.assertEqual(data, {'tags': [1]})
+
+    def test_parse_other_encoding(self):
+        """Test that non utf-8 bodies are decoded with the stdlib"""
+        body = '{"title": "café"}'.encode('latin-1')
+
+        data = FastJSONParser().parse(
+            io.BytesIO(body), parser_context={'encoding': 'latin-1'}
+        )
+
+        self.assertEqual(data, {'title': 'café'})
@@ -0,0 +1,140 @@
+import time
+from unittest.mock import patch
+
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, \
+    override_settings
+
+from core import routers
+from core.middleware import ReplicaPinMiddleware
+from core.models import Tag
+
+
+@override_settings(DATABASE_REPLICAS=['replica'], REPLICA_MAX_LAG=5,
+                   REPLICA_LAG_CHECK_INTERVAL=60, REPLICA_PIN_SECONDS=5)
+class ReplicaRouterTests(SimpleTestCase):
+
+    def setUp(self):
+        routers.reset()
+        routers._lag_checks.clear()
+        self.router = routers.ReplicaRouter()
+        self.addCleanup(routers.reset)
+
+    def test_reads_go_to_replica_and_writes_to_primary(self):
+        """Test reads are routed to a replica and writes to default"""
+        with patch('core.routers.replica_lag', return_value=0.5):
+            self.assertEqual(self.router.db_for_read(Tag), 'replica')
+        self.assertEqual(self.router.db_for_write(Tag), 'default')
+
+    def test_lagging_or_unreachable_replica_is_skipped(self):
+        """Test reads fall back to the primary when no replica is healthy"""
+        for lag in (30, None):
+            routers._lag_checks.clear()
+            with patch('core.routers.replica_lag', return_value=lag):
+                self.assertEqual(self.router.db_for_read(Tag), 'default')
+
+    def test_lag_is_checked_once_per_interval(self):
+        """Test the lag of a replica is cached between checks"""
+        with patch('core.routers.replica_lag', return_value=0) as lag:
+            self.router.db_for_read(Tag)
+            self.router.db_for_read(Tag)
+
+        self.assertEqual(lag.call_count, 1)
+
+    def test_reads_after_write_go_to_primary(self):
+        """Test a request reads its own writes from the primary"""
+        self.router.db_for_write(Tag)
+
+        with patch('core.routers.replica_lag', return_value=0):
+            self.assertEqual(self.router.db_for_read(Tag), 'default')
+
+    def test_recent_version_pins(self):
+        """Test reading data written within the pin window pins"""
+        routers.pin_if_recent(time.time() - 60)
+        self.assertFalse(routers.is_pinned())
+
+        routers.pin_if_recent(time.time() - 1)
+        self.assertTrue(routers.is_pinned())
+
+    def test_replicas_are_not_migrated(self):
+        """Test migrations only run on the primary"""
+        self.assertIs(self.router.allow_migrate('replica', 'core'), False)
+        self.assertIsNone(self.router.allow_migrate('default', 'core'))
+
+
+@override_settings(DATABASE_REPLICAS=['replica'])
+class ReplicaRouterTransactionTests(TestCase):
+
+    def test_reads_in_transaction_go_to_primary(self):
+        """Test reads inside atomic blocks use the primary"""
+        with patch('core.routers.replica_lag', return_value=0):
+            self.assertEqual(
+                routers.ReplicaRouter().db_for_read(Tag), 'default'
+            )
+
+
+@override_settings(DATABASE_REPLICAS=['replica'], REPLICA_PIN_SECONDS=5,
+                   REPLICA_PIN_COOKIE='db_pin')
+class ReplicaPinMiddlewareTests(SimpleTestCase):
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.pinned = []
+
+    def view(self, write=False):
+        def get_response(request):
+            self.pinned.append(routers.is_pinned())
+            if write:
+                routers.ReplicaRouter().db_for_write(Tag)
+            return HttpResponse()
+
+        return ReplicaPinMiddleware(get_response)
+
+    def test_write_sets_pin_cookie(self):
+        """Test a request that wrote pins the client with a cookie"""
+        response = self.view(write=True)(self.factory.post('/'))
+
+        self.assertIn('db_pin', response.cookies)
+        self.assertEqual(response.cookies['db_pin']['max-age'], 5)
+        self.assertEqual(self.pinned, [True])
+        self.assertFalse(routers.is_pinned())
+
+    def test_pin_cookie_pins_reads(self):
+        """Test a client with a fresh pin cookie reads the primary"""
+        request = self.factory.get('/')
+        request.COOKIES['db_pin'] = str(time.time() + 3)
+        response = self.view()(request)
+
+        self.assertEqual(self.pinned, [True])
+        self.assertNotIn('db_pin', response.cookies)
+
+    def test_expired_or_forged_cookie_does_not_pin(self):
+        """Test expired or too long pin cookies are ignored"""
+        for expires in (time.time() - 1, time.time() + 3600, 'x'):
+            request = self.factory.get('/')
+            request.COOKIES['db_pin'] = str(expires)
+            self.view()(request)
+
+        self.assertEqual(self.pinned, [False, False, False])
+
+    def test_token_clients_are_pinned_without_cookie(self):
+        """Test token clients are pinned by their Authorization header"""
+        authorization = {'HTTP_AUTHORIZATION': 'Token abc'}
+        self.view(write=True)(self.factory.post('/', **authorization))
+        self.view()(self.factory.get('/', **authorization))
+        self.view()(self.factory.get('/', HTTP_AUTHORIZATION='Token xyz'))
+
+        self.assertEqual(self.pinned, [True, True, False])
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_no_replicas_skip_pin_lookup(self):
+        """Test the pin cache is not read or written without replicas"""
+        authorization = {'HTTP_AUTHORIZATION': 'Token abc'}
+        with patch('core.middleware._cache') as cache:
+            response = self.view(write=True)(
+                self.factory.post('/', **authorization)
+            )
+            self.view()(self.factory.get('/', **authorization))
+
+        cache.assert_not_called()
+        self.assertNotIn('db_pin', response.cookies)
@@ -0,0 +1,111 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+
+from core import similarity
+from core.models import Item, Post, PostBucket, PostSignature, Tag
+
+
+def sample_set(start, size):
+    return {f'tag:{i}' for i in range(start, start + size)}
+
+
+class MinHashTests(TestCase):
+
+    def test_signature_estimates_jaccard(self):
+        """Test equal signature positions estimate the Jaccard similarity"""
+        a = sample_set(0, 100)
+        b = sample_set(50, 100)
+        sig_a = similarity.signature(a)
+        sig_b = similarity.signature(b)
+
+        estimate = sum(x == y for x, y in zip(sig_a, sig_b)) / len(sig_a)
+
+        self.assertAlmostEqual(estimate, similarity.jaccard(a, b), delta=0.15)
+
+    def test_equal_sets_share_every_bucket(self):
+        """Test equal sets land in the same buckets, unrelated ones not"""
+        buckets_a = similarity.band_buckets(similarity.signature(
+            sample_set(0, 10)
+        ))
+        buckets_b = similarity.band_buckets(similarity.signature(
+            sample_set(0, 10)
+        ))
+        buckets_c = similarity.band_buckets(similarity.signature(
+            sample_set(100, 10)
+        ))
+
+        self.assertEqual(buckets_a, buckets_b)
+        self.assertEqual(len(buckets_a), similarity.BANDS)
+        self.assertFalse(set(buckets_a) & set(buckets_c))
+
+    def test_pack_round_trip(self):
+        """Test signatures survive packing to bytes"""
+        sig = similarity.signature(sample_set(0, 5))
+
+        self.assertEqual(similarity.unpack(similarity.pack(sig)), sig)
+
+
+class PostSignatureTests(TestCase):
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email='test@outfitted.com',
+            first_name='Test',
+            surname='von Account',
+            password='test123'
+        )
+        self.tag = Tag.objects.create(user=self.user, name='Casual')
+        self.item = Item.objects.create(user=self.user, name='shirt')
+        self.post = Post.objects.create(user=self.user, title='Outfit')
+
+    def assertBuckets(self, post, count):
+        self.assertEqual(
+            PostBucket.objects.filter(post=post, user=self.user).count(),
+            count
+        )
+
+    def test_signature_follows_relations(self):
+        """Test signatures are updated as tags and items change"""
+        self.assertBuckets(self.post, 0)
+
+        self.post.tags.add(self.tag)
+        self.assertBuckets(self.post, similarity.BANDS)
+        signature = PostSignature.objects.get(post=self.post).signature
+
+        self.item.post_set.add(self.post)
+        self.assertNotEqual(
+            PostSignature.objects.get(post=self.post).signature,
+            signature
+        )
+
+        self.post.tags.clear()
+        self.item.post_set.clear()
+        self.assertBuckets(self.post, 0)
+        self.assertFalse(PostSignature.objects.exists())
+
+    def test_deleting_tag_updates_signature(self):
+        """Test deleting a tag recomputes the posts it was on"""
+        self.post.tags.add(self.tag)
+        self.post.items.add(self.item)
+        signature = PostSignature.objects.get(post=self.post).signature
+
+        self.tag.delete()
+
+        self.assertNotEqual(
+            PostSignature.objects.get(post=self.post).signature,
+            signature
+        )
+
+    def test_rebuild_command(self):
+        """Test the rebuild command recreates lost signatures"""
+        self.post.tags.add(self.tag)
+        PostBucket.objects.all().delete()
+        PostSignature.objects.all().delete()
+
+        call_command('rebuild_post_signatures', stdout=StringIO())
+
+        self.assertBuckets(self.post, similarity.BANDS)
+        self.assertTrue(PostSignature.objects.filter(post=self.post).exists())
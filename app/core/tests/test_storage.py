@@ -0,0 +1,145 @@
+import os
+import tempfile
+import time
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from core.models import Post
+from core.storage import ContentAddressedStorage, content_digest
+
+
+class ContentAddressedStorageTests(TestCase):
+
+    def setUp(self):
+        self.media_root = tempfile.TemporaryDirectory()
+        self.storage = ContentAddressedStorage(location=self.media_root.name)
+
+    def tearDown(self):
+        self.media_root.cleanup()
+
+    def test_file_named_after_digest(self):
+        """Test that files are stored under the digest of their content"""
+        content = ContentFile(b'outfit')
+        digest = content_digest(content)
+
+        name = self.storage.save('upload/post/photo.JPG', content)
+
+        self.assertEqual(name, f'upload/post/{digest[:2]}/{digest}.jpg')
+        self.assertTrue(self.storage.exists(name))
+
+    def test_same_content_stored_once(self):
+        """Test that saving the same content twice returns the same name"""
+        name1 = self.storage.save('upload/post/a.jpg', ContentFile(b'same'))
+        name2 = self.storage.save('upload/post/b.jpg', ContentFile(b'same'))
+        name3 = self.storage.save('upload/post/c.jpg', ContentFile(b'other'))
+
+        self.assertEqual(name1, name2)
+        self.assertNotEqual(name1, name3)
+        dirs, _ = self.storage.listdir('upload/post')
+        self.assertEqual(len(dirs), 2)
+
+    def test_concurrent_save_of_same_content(self):
+        """Test content stored by a concurrent save counts as stored"""
+        name = self.storage.save('upload/post/a.jpg', ContentFile(b'x'))
+        exists = self.storage.exists
+        checks = []
+
+        def racing_exists(name):
+            # The other save creates the file after the name was checked
+            checks.append(name)
+            return len(checks) > 1 and exists(name)
+
+        with patch.object(self.storage, 'exists', side_effect=racing_exists):
+            saved = self.storage.save('upload/post/b.jpg', ContentFile(b'x'))
+
+        self.assertEqual(saved, name)
+        _, files = self.storage.listdir(os.path.dirname(name))
+        self.assertEqual(files, [os.path.basename(name)])
+
+    def test_precomputed_digest_used(self):
+        """Test that a digest computed during upload is not recomputed"""
+        content = ContentFile(b'outfit')
+        content.content_digest = 'ab' * 32
+
+        name = self.storage.save('upload/post/photo.jpg', content)
+
+        self.assertEqual(name, f'upload/post/ab/{"ab" * 32}.jpg')
+
+    def test_derived_files_keep_their_name(self):
+        """Test that derived files are stored under the given name once"""
+        name = 'upload/post/variants/abc_thumb.jpg'
+        self.assertEqual(
+            self.storage.save_derived(name, ContentFile(b'one')), name
+        )
+        self.assertEqual(
+            self.storage.save_derived(name, ContentFile(b'two')), name
+        )
+
+        with self.storage.open(name) as file:
+            self.assertEqual(file.read(), b'one')
+
+
+class GarbageCollectImagesTests(TestCase):
+
+    def setUp(self):
+        self.media_root = tempfile.TemporaryDirectory()
+        self.settings_override = override_settings(
+            MEDIA_ROOT=self.media_root.name
+        )
+        self.settings_override.enable()
+        self.user = get_user_model().objects.create_user(
+            email = 'test@outfitted.com',
+            first_name = 'Test',
+            surname = 'von Account',
+            password = 'test123'
+        )
+        self.storage = Post._meta.get_field('image').storage
+
+    def tearDown(self):
+        self.settings_override.disable()
+        self.media_root.cleanup()
+
+    def _age(self, name):
+        """Make a stored file older than the grace period"""
+        old = time.time() - 7200
+        os.utime(self.storage.path(name), (old, old))
+
+    def test_shared_image_kept_until_unreferenced(self):
+        """Test that an image is only deleted when no post references it"""
+        post1 = Post.objects.create(user=self.user, title='One')
+        post2 = Post.objects.create(user=self.user, title='Two')
+        post1.image.save('a.jpg', ContentFile(b'image'))
+        post2.image.save('b.jpg', ContentFile(b'image'))
+        name = post1.image.name
+        self.assertEqual(post2.image.name, name)
+        self._age(name)
+
+        post1.delete()
+        call_command('gc_post_images', stdout=StringIO())
+        self.assertTrue(self.storage.exists(name))
+
+        post2.delete()
+        call_command('gc_post_images', stdout=StringIO())
+        self.assertFalse(self.storage.exists(name))
+
+    def test_recent_unreferenced_image_kept(self):
+        """Test that images inside the grace period are kept"""
+        name = self.storage.save('upload/post/a.jpg', ContentFile(b'image'))
+
+        call_command('gc_post_images', stdout=StringIO())
+
+        self.assertTrue(self.storage.exists(name))
+
+    def test_dry_run(self):
+        """Test that a dry run does not delete anything"""
+        name = self.storage.save('upload/post/a.jpg', ContentFile(b'image'))
+        self._age(name)
+
+        call_command('gc_post_images', '--dry-run', stdout=StringIO())
+
+        self.assertTrue(self.storage.exists(name))
@@ -0,0 +1,21 @@
+from contextlib import contextmanager
+
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+@contextmanager
+def commit_hooks(using=DEFAULT_DB_ALIAS):
+    """Run the on_commit callbacks registered in the block when it exits
+
+    TestCase wraps every test in a transaction that is rolled back, so
+    the callbacks of writes in a test never run on their own.
+    """
+    connection = connections[using]
+    start = len(connection.run_on_commit)
+    try:
+        yield
+    finally:
+        callbacks = connection.run_on_commit[start:]
+        del connection.run_on_commit[start:]
+        for _, callback in callbacks:
+            callback()
@@ -0,0 +1,60 @@
+"""Per-user collection versions and per-object versions
+
+A version is the time of the last write, kept in the cache set by
+`VERSION_CACHE_ALIAS`. Versions are bumped by the signal handlers in
+`core.signals` once the transaction of the write commits. A version
+missing from the cache is recreated as the current time, so an evicted
+version never matches an older one. With several processes the cache
+must be shared between them.
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+
+def _cache():
+    return caches[getattr(settings, 'VERSION_CACHE_ALIAS', 'default')]
+
+
+def collection_key(model_name, user_id):
+    """Return the cache key of the version of a user's collection"""
+    return f'version:{model_name}:user:{user_id}'
+
+
+def object_key(model_name, user_id, pk):
+    """Return the cache key of the version of a single object"""
+    return f'version:{model_name}:user:{user_id}:{pk}'
+
+
+def bump(model_name, user_id, pks=()):
+    """Record a write to a user's collection and to the given objects
+
+    The versions change when the current transaction commits, or at once
+    outside of one. Bumping earlier lets a read in between store the old
+    rows under the new version, where they stay until the next write.
+    """
+    pks = list(pks)
+    transaction.on_commit(lambda: _bump(model_name, user_id, pks))
+
+
+def _bump(model_name, user_id, pks):
+    now = time.time()
+    keys = [collection_key(model_name, user_id)]
+    keys += [object_key(model_name, user_id, pk) for pk in pks]
+    _cache().set_many({key: now for key in keys}, timeout=None)
+
+
+def get_versions(keys):
+    """Return the versions stored under keys, creating missing ones"""
+    cache = _cache()
+    versions = cache.get_many(keys)
+    missing = [key for key in keys if key not in versions]
+    if missing:
+        now = time.time()
+        for key in missing:
+            cache.add(key, now, timeout=None)
+        versions.update(cache.get_many(missing))
+
+    return [versions.get(key, time.time()) for key in keys]
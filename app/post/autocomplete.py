@@ -0,0 +1,91 @@
+"""Name suggestions for tag and item autocomplete
+
+Every name of a user is loaded once with its number of posts, sorted by
+lowercased name, and cached under the versions of the user's posts and of
+the tags or items, so it is rebuilt on the first read after either
+changed. The names starting with a prefix are then a contiguous range
+found by bisection, of which only the most used are ranked.
+
+Each process also keeps the AUTOCOMPLETE_LOCAL_SIZE most recently used
+lists, the versioned key tells when they are stale, so a warm request
+does not unpickle the whole list.
+"""
+import heapq
+import threading
+from bisect import bisect_left
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import Count
+
+from core import routers, versions
+
+
+_local = OrderedDict()
+_local_lock = threading.Lock()
+
+
+def _cache():
+    return caches[getattr(settings, 'AUTOCOMPLETE_CACHE_ALIAS', 'default')]
+
+
+def ranked_names(model, user_id):
+    """Return the lowercased names and (id, name, uses) rows of a user
+
+    Both lists are sorted by lowercased name and id.
+    """
+    model_name = model._meta.model_name
+    values = versions.get_versions([
+        versions.collection_key('post', user_id),
+        versions.collection_key(model_name, user_id),
+    ])
+    key = 'autocomplete:{}:{}:{}'.format(
+        model_name, user_id, ':'.join(repr(value) for value in values)
+    )
+    with _local_lock:
+        names = _local.get(key)
+        if names is not None:
+            _local.move_to_end(key)
+            return names
+
+    cache = _cache()
+    names = cache.get(key)
+    if names is None:
+        routers.pin_if_recent(max(values))
+        rows = sorted(
+            model.objects.filter(user_id=user_id)
+            .annotate(uses=Count('post'))
+            .values_list('id', 'name', 'uses'),
+            key=lambda row: (row[1].lower(), row[0])
+        )
+        names = ([name.lower() for _, name, _ in rows], rows)
+        cache.set(
+            key,
+            names,
+            getattr(settings, 'AUTOCOMPLETE_CACHE_TIMEOUT', 3600)
+        )
+
+    with _local_lock:
+        _local[key] = names
+        while len(_local) > getattr(settings, 'AUTOCOMPLETE_LOCAL_SIZE', 128):
+            _local.popitem(last=False)
+
+    return names
+
+
+def suggest(names, prefix, limit):
+    """Return the limit most used rows whose name starts with prefix
+
+    Ties keep the name order, heapq.nsmallest is stable.
+    """
+    lower_names, rows = names
+    prefix = prefix.lower()
+    start = bisect_left(lower_names, prefix)
+    end = bisect_left(lower_names, prefix + '\U0010ffff', start)
+    top = heapq.nsmallest(limit, range(start, end), key=lambda i: -rows[i][2])
+
+    return [
+        {'id': rows[i][0], 'name': rows[i][1], 'uses': rows[i][2]}
+        for i in top
+    ]
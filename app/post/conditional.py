@@ -0,0 +1,128 @@
+import hashlib
+import time
+
+from django.utils.http import (
+    http_date, parse_etags, parse_http_date_safe, urlencode
+)
+
+from rest_framework import status
+from rest_framework.response import Response
+
+from core import routers, versions
+
+
+class ConditionalListMixin:
+    """Answer conditional list requests from cached versions
+
+    The ETag hashes the versions of the user's collections in
+    `version_models`. A matching If-None-Match or If-Modified-Since
+    returns 304 before any query or serializer runs.
+    """
+    version_models = ()
+
+    def list(self, request, *args, **kwargs):
+        keys = [
+            versions.collection_key(model_name, request.user.id)
+            for model_name in self.version_models
+        ]
+        return self._conditional_response(keys, self.list_response, request,
+                                          *args, **kwargs)
+
+    def list_response(self, request, *args, **kwargs):
+        """Return the full list response"""
+        return super().list(request, *args, **kwargs)
+
+    def _conditional_response(self, keys, handler, request, *args,
+                              match_any=True, **kwargs):
+        """Return 304 when the client is up to date, else call handler
+
+        With match_any False an If-None-Match of * never returns 304.
+        """
+        now = time.time()
+        values = versions.get_versions(keys)
+        # A replica may not have the latest write yet, the response stored
+        # under its version must come from the primary
+        routers.pin_if_recent(max(values))
+        etag = self.etag = self._etag(request, values)
+        # Last-Modified has second precision, it is only sent once the
+        # second of the latest write is over so a later write in that same
+        # second can never be mistaken for the cached one
+        last_modified = int(max(values))
+        if last_modified >= int(now):
+            last_modified = None
+
+        if self._not_modified(request, etag, last_modified, match_any):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = handler(request, *args, **kwargs)
+            if response.status_code != status.HTTP_200_OK:
+                return response
+
+        response['ETag'] = etag
+        if last_modified is not None:
+            response['Last-Modified'] = http_date(last_modified)
+        return response
+
+    def _etag(self, request, values):
+        """Return the ETag of the response for the given versions"""
+        parts = [
+            str(request.user.id),
+            request.path,
+            urlencode(self.normalized_query_params()),
+            request.accepted_renderer.format,
+        ] + [repr(value) for value in values]
+        digest = hashlib.sha1('|'.join(parts).encode()).hexdigest()
+
+        return f'"{digest}"'
+
+    def normalized_query_params(self):
+        """Return the sorted query parameters with normalized values"""
+        params = []
+        for name, values in self.request.GET.lists():
+            for value in values:
+                try:
+                    value = self.normalize_query_param(name, value)
+                except ValueError:
+                    pass
+                params.append((name, value))
+
+        return sorted(params)
+
+    def normalize_query_param(self, name, value):
+        """Return a canonical form of a query parameter value"""
+        return value
+
+    def _not_modified(self, request, etag, last_modified, match_any=True):
+        """Return whether the client's cached response is still valid"""
+        if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+        if if_none_match:
+            etags = parse_etags(if_none_match)
+            return (match_any and '*' in etags) or etag in etags
+
+        if_modified_since = parse_http_date_safe(
+            request.META.get('HTTP_IF_MODIFIED_SINCE', '')
+        )
+        return last_modified is not None and \
+            if_modified_since is not None and \
+            last_modified <= if_modified_since
+
+
+class ConditionalRetrieveMixin(ConditionalListMixin):
+    """Answer conditional retrieve requests as well
+
+    On retrieve the collection of the viewset's own model is replaced by
+    the object version. Only for viewsets that have a retrieve action.
+    """
+
+    def retrieve(self, request, *args, **kwargs):
+        own_model = self.queryset.model._meta.model_name
+        pk = kwargs[self.lookup_url_kwarg or self.lookup_field]
+        keys = [versions.object_key(own_model, request.user.id, pk)]
+        keys += [
+            versions.collection_key(model_name, request.user.id)
+            for model_name in self.version_models if model_name != own_model
+        ]
+        # The object version exists whether or not the object does, so
+        # If-None-Match: * can not tell and is left to the handler
+        return self._conditional_response(keys, super().retrieve, request,
+                                          *args, match_any=False, **kwargs)
@@ -0,0 +1,67 @@
+from django.core.exceptions import ValidationError as DjangoValidationError
+
+from rest_framework import serializers
+from rest_framework.relations import MANY_RELATION_KWARGS
+
+
+class UserPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """Primary key field that only accepts objects of the requesting user
+
+    With `many=True` the whole list of ids is resolved in one query.
+    """
+
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        list_kwargs = {'child_relation': cls(*args, **kwargs)}
+        for key in kwargs:
+            if key in MANY_RELATION_KWARGS:
+                list_kwargs[key] = kwargs[key]
+
+        return BatchedManyRelatedField(**list_kwargs)
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        request = self.context.get('request')
+        if request is None:
+            return queryset.none()
+
+        return queryset.filter(user=request.user)
+
+
+class BatchedManyRelatedField(serializers.ManyRelatedField):
+    """Many related field validating every id with a single query
+
+    Every malformed, missing or foreign id is reported at once.
+    """
+
+    def to_internal_value(self, data):
+        if isinstance(data, str) or not hasattr(data, '__iter__'):
+            self.fail('not_a_list', input_type=type(data).__name__)
+        if not self.allow_empty and len(data) == 0:
+            self.fail('empty')
+
+        child = self.child_relation
+        queryset = child.get_queryset()
+        pks = {}
+        errors = []
+        for item in data:
+            try:
+                pk = item
+                if child.pk_field is not None:
+                    pk = child.pk_field.to_internal_value(pk)
+                pks[queryset.model._meta.pk.to_python(pk)] = item
+            except (DjangoValidationError, serializers.ValidationError,
+                    TypeError, ValueError):
+                errors.append(child.error_messages['incorrect_type'].format(
+                    data_type=type(item).__name__
+                ))
+
+        objects = queryset.in_bulk(list(pks)) if pks else {}
+        errors += [
+            child.error_messages['does_not_exist'].format(pk_value=item)
+            for pk, item in pks.items() if pk not in objects
+        ]
+        if errors:
+            raise serializers.ValidationError(errors)
+
+        return [objects[pk] for pk in pks]
@@ -0,0 +1,124 @@
+from django.db.models import Q
+
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination, _reverse_ordering
+
+
+class PostCursorPagination(CursorPagination):
+    """Keyset pagination for posts, newest first
+
+    Posts are always filtered by user, so ordering on `-id` makes every
+    page a range scan on `(user_id, id)` that costs the same no matter how
+    deep the cursor is. Pagination is opt-in: it only applies when the
+    client sends a `cursor` or `page_size` parameter.
+
+    A view ordering on several fields, such as search on `search_rank`
+    and `id`, is paged on all of them. The cursor position holds every
+    field, comma separated, and the next page starts after it. DRF only
+    keeps the first field and skips ties with an offset, which it caps at
+    `offset_cutoff`.
+    """
+    ordering = '-id'
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """Paginate only when the client asks for a page"""
+        params = request.query_params
+        if self.cursor_query_param not in params and \
+                self.page_size_query_param not in params:
+            return None
+
+        if len(self.get_ordering(request, queryset, view)) > 1:
+            return self._paginate_keyset(queryset, request, view)
+
+        return super().paginate_queryset(queryset, request, view)
+
+    def _paginate_keyset(self, queryset, request, view):
+        """Return the page after the cursor position on every field"""
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        if self.cursor is None:
+            offset, reverse, position = 0, False, None
+        else:
+            offset, reverse, position = self.cursor
+
+        ordering = _reverse_ordering(self.ordering) if reverse \
+            else self.ordering
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            queryset = queryset.filter(
+                self._after(ordering, position.split(','))
+            )
+
+        results = list(queryset[offset:offset + self.page_size + 1])
+        self.page = results[:self.page_size]
+        following = None
+        if len(results) > len(self.page):
+            following = self._get_position_from_instance(
+                results[-1], self.ordering
+            )
+
+        # Positions are unique, the links never need an offset
+        started = position is not None or offset > 0
+        if reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = started, following is not None
+            self.next_position, self.previous_position = position, following
+        else:
+            self.has_next, self.has_previous = following is not None, started
+            self.next_position, self.previous_position = following, position
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+
+        return self.page
+
+    def _after(self, ordering, position):
+        """Return the filter for rows ordered after position"""
+        fields = [order.lstrip('-') for order in ordering]
+        condition = Q()
+        for index in reversed(range(len(fields))):
+            lookup = 'lt' if ordering[index].startswith('-') else 'gt'
+            after = Q(**{f'{fields[index]}__{lookup}': position[index]})
+            if index < len(fields) - 1:
+                after |= Q(**{fields[index]: position[index]}) & condition
+            condition = after
+
+        return condition
+
+    def get_ordering(self, request, queryset, view):
+        """Use the ordering of the view when it has one, e.g. for search"""
+        get_cursor_ordering = getattr(view, 'get_cursor_ordering', None)
+        if get_cursor_ordering is not None:
+            ordering = get_cursor_ordering()
+            if ordering is not None:
+                return tuple(ordering)
+
+        return super().get_ordering(request, queryset, view)
+
+    def decode_cursor(self, request):
+        """Decode the cursor and reject positions that are not integers,
+        one per ordering field"""
+        cursor = super().decode_cursor(request)
+        if cursor is not None and cursor.position is not None:
+            try:
+                values = [int(value) for value in cursor.position.split(',')]
+            except ValueError:
+                raise NotFound(self.invalid_cursor_message)
+            if len(values) != len(self.ordering):
+                raise NotFound(self.invalid_cursor_message)
+
+        return cursor
+
+    def _get_position_from_instance(self, instance, ordering):
+        """Return the values of every ordering field, comma separated"""
+        return ','.join(
+            super(PostCursorPagination, self)._get_position_from_instance(
+                instance, (order,)
+            )
+            for order in ordering
+        )
@@ -0,0 +1,63 @@
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+
+from rest_framework import status
+from rest_framework.response import Response
+
+from post.conditional import ConditionalListMixin
+
+
+def _cache():
+    return caches[getattr(settings, 'RESPONSE_CACHE_ALIAS', 'default')]
+
+
+class CachedListMixin(ConditionalListMixin):
+    """Serve list responses from a per-user cache
+
+    Entries are keyed by the ETag, which covers the user, the endpoint,
+    the normalized query parameters and the versions of every collection
+    the list depends on. A write bumps a version, so stale entries are
+    never read again and simply expire. Only one request per process, or
+    per cache when it is shared, rebuilds a missing entry while the others
+    wait for it.
+    """
+
+    def list_response(self, request, *args, **kwargs):
+        if not getattr(settings, 'RESPONSE_CACHE', True):
+            return super().list_response(request, *args, **kwargs)
+
+        cache = _cache()
+        key = f'response:{self.etag}'
+        data = cache.get(key)
+        if data is not None:
+            return Response(data)
+
+        lock_key = f'{key}:lock'
+        lock_timeout = getattr(settings, 'RESPONSE_CACHE_LOCK_TIMEOUT', 10)
+        deadline = time.monotonic() + getattr(
+            settings, 'RESPONSE_CACHE_LOCK_WAIT', 2
+        )
+        while not cache.add(lock_key, True, lock_timeout):
+            # Another request is building the entry, wait for it and build
+            # the response here only once the wait runs out
+            if time.monotonic() >= deadline:
+                return super().list_response(request, *args, **kwargs)
+            time.sleep(0.02)
+            data = cache.get(key)
+            if data is not None:
+                return Response(data)
+
+        try:
+            response = super().list_response(request, *args, **kwargs)
+            if response.status_code == status.HTTP_200_OK:
+                cache.set(
+                    key,
+                    response.data,
+                    getattr(settings, 'RESPONSE_CACHE_TIMEOUT', 300)
+                )
+        finally:
+            cache.delete(lock_key)
+
+        return response
@@ -0,0 +1,37 @@
+from django.db import connections
+from django.db.models import F, IntegerField, Value
+from django.db.models.functions import Cast
+
+
+# Text search configuration, the search_vector trigger uses the same one
+SEARCH_CONFIG = 'english'
+
+# SearchRank is a float, it is scaled to an integer so cursor pagination
+# can use it as position
+RANK_SCALE = 1000000
+
+
+def search_posts(queryset, text):
+    """Filter posts whose title matches text and annotate `search_rank`
+
+    Postgres matches the trigger maintained `search_vector` column through
+    its GIN index and ranks with ts_rank. Other databases fall back to a
+    case insensitive match of every word of text, with an equal rank.
+    """
+    vendor = connections[queryset.db].vendor
+    if vendor == 'postgresql':
+        from django.contrib.postgres.search import SearchQuery, SearchRank
+        query = SearchQuery(text, config=SEARCH_CONFIG)
+        return queryset.filter(search_vector=query).annotate(
+            search_rank=Cast(
+                SearchRank(F('search_vector'), query) * RANK_SCALE,
+                IntegerField()
+            )
+        )
+
+    for word in text.split():
+        queryset = queryset.filter(title__icontains=word)
+
+    return queryset.annotate(
+        search_rank=Value(0, output_field=IntegerField())
+    )
@@ -1,9 +1,92 @@
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import CharField, Value
+from django.utils.translation import gettext_lazy as _
+
 from rest_framework import serializers
+from rest_framework.settings import api_settings
+
+from core import similarity, versions
 
+from core.images import ImageLimitError, InvalidImageError, \
+    inspect_image, max_upload_size, variant_file_path, variant_formats, \
+    variant_sizes
 from core.models import Tag, Item, Post
 
+from post.fields import UserPrimaryKeyRelatedField
+
+
+def build_image_url(name, request=None):
+    """Return the url of a stored post image like ImageField does"""
+    url = Post._meta.get_field('image').storage.url(name)
+    if request is not None:
+        return request.build_absolute_uri(url)
+
+    return url
+
+
+def image_variant_urls(image_name, ready, request=None):
+    """Return variant urls of an image by size and format, falling back
+    to the original image until the variants are generated"""
+    if not image_name:
+        return None
+
+    original = build_image_url(image_name, request)
+    return {
+        size: {
+            image_format: build_image_url(
+                variant_file_path(image_name, size, image_format), request
+            ) if ready else original
+            for image_format in variant_formats()
+        }
+        for size in variant_sizes()
+    }
+
+
+class UserAttributeSerializer(serializers.ModelSerializer):
+    """Serializer for user owned objects with a case insensitive name"""
+
+    def validate_name(self, value):
+        """Reject names the user already has in any case"""
+        request = self.context.get('request')
+        if request is None:
+            return value
+
+        duplicates = self.Meta.model.objects.filter(
+            user=request.user,
+            name__iexact=value
+        )
+        if self.instance is not None:
+            duplicates = duplicates.exclude(pk=self.instance.pk)
+        if duplicates.exists():
+            raise serializers.ValidationError(
+                _('An object with this name already exists.'),
+                code='unique'
+            )
+
+        return value
+
+
+class NameListSerializer(serializers.Serializer):
+    """Serializer for a list of names to get or create"""
+    names = serializers.ListField(
+        child=serializers.CharField(max_length=255),
+        allow_empty=False
+    )
 
-class TagSerializer(serializers.ModelSerializer):
+    def validate_names(self, value):
+        max_rows = getattr(settings, 'POST_BULK_MAX_ROWS', 1000)
+        if len(value) > max_rows:
+            raise serializers.ValidationError(
+                _('Ensure there are at most {max_rows} names.').format(
+                    max_rows=max_rows
+                )
+            )
+
+        return value
+
+
+class TagSerializer(UserAttributeSerializer):
     """Serializer for tag objects"""
 
     class Meta:
@@ -11,7 +94,7 @@ class TagSerializer(serializers.ModelSerializer):
         fields = ('id', 'name')
         read_only_fields = ('id',)
 
-class ItemSerializer(serializers.ModelSerializer):
+class ItemSerializer(UserAttributeSerializer):
     """Serializer for item objects"""
 
     class Meta:
@@ -22,20 +105,74 @@ class ItemSerializer(serializers.ModelSerializer):
 
 class PostSerializer(serializers.ModelSerializer):
     """Serializer for post objects"""
-    items = serializers.PrimaryKeyRelatedField(
+    items = UserPrimaryKeyRelatedField(
         many=True,
+        required=False,
         queryset=Item.objects.all()
     )
-    tags = serializers.PrimaryKeyRelatedField(
+    tags = UserPrimaryKeyRelatedField(
         many=True,
+        required=False,
         queryset=Tag.objects.all()
     )
+    item_names = serializers.ListField(
+        child=serializers.CharField(max_length=255),
+        required=False,
+        write_only=True
+    )
+    tag_names = serializers.ListField(
+        child=serializers.CharField(max_length=255),
+        required=False,
+        write_only=True
+    )
+    image_variants = serializers.SerializerMethodField()
+
+    # Name field -> (relation, model)
+    name_fields = {
+        'item_names': ('items', Item),
+        'tag_names': ('tags', Tag),
+    }
 
     class Meta:
         model = Post
-        fields = ('id', 'title', 'items', 'tags', 'image')
+        fields = (
+            'id', 'title', 'items', 'tags', 'item_names', 'tag_names',
+            'image', 'image_variants',
+        )
         read_only_fields = ('id', 'image')
 
+    def create(self, validated_data):
+        self._resolve_names(validated_data, validated_data['user'])
+        return super().create(validated_data)
+
+    def update(self, instance, validated_data):
+        self._resolve_names(validated_data, instance.user)
+        return super().update(instance, validated_data)
+
+    def _resolve_names(self, validated_data, user):
+        """Add the objects named in the name fields to their relation
+
+        Missing objects are created, all names of a relation are resolved
+        with one lookup and at most one insert.
+        """
+        for name_field, (relation, model) in self.name_fields.items():
+            names = validated_data.pop(name_field, None)
+            if names is None:
+                continue
+
+            named = model.objects.get_or_create_names(user, names).values()
+            validated_data[relation] = list(dict.fromkeys(
+                list(validated_data.get(relation, ())) + list(named)
+            ))
+
+    def get_image_variants(self, obj):
+        """Return variant urls by size and format"""
+        return image_variant_urls(
+            obj.image.name,
+            obj.image_variants_ready,
+            self.context.get('request')
+        )
+
 
 class PostDetailSerializer(PostSerializer):
     """Serialze a post detail"""
@@ -43,10 +180,198 @@ class PostDetailSerializer(PostSerializer):
     tags = TagSerializer(many=True, read_only=True)
 
 
+class PostBulkListSerializer(serializers.ListSerializer):
+    """Validate and create many posts with a fixed number of queries"""
+    default_error_messages = {
+        'max_rows': _('Ensure there are at most {max_rows} posts.'),
+        'does_not_exist': UserPrimaryKeyRelatedField.default_error_messages[
+            'does_not_exist'
+        ],
+    }
+
+    def to_internal_value(self, data):
+        """Return the validated rows, collecting the errors of every row
+
+        Field errors and unknown related ids are reported together, by the
+        position of the row.
+        """
+        if not isinstance(data, list):
+            message = self.error_messages['not_a_list'].format(
+                input_type=type(data).__name__
+            )
+            self._fail_non_field(message, 'not_a_list')
+        max_rows = getattr(settings, 'POST_BULK_MAX_ROWS', 1000)
+        if len(data) > max_rows:
+            message = self.error_messages['max_rows'].format(
+                max_rows=max_rows
+            )
+            self._fail_non_field(message, 'max_rows')
+
+        rows = []
+        errors = []
+        for item in data:
+            try:
+                rows.append(self.child.run_validation(item))
+                errors.append({})
+            except serializers.ValidationError as exc:
+                rows.append(None)
+                errors.append(exc.detail)
+
+        existing = self._existing_ids([row for row in rows if row])
+        for row, row_errors in zip(rows, errors):
+            for relation in ('items', 'tags'):
+                missing = [
+                    id_ for id_ in (row or {}).get(relation, ())
+                    if id_ not in existing[relation]
+                ]
+                if missing:
+                    row_errors[relation] = [
+                        self.error_messages['does_not_exist'].format(
+                            pk_value=id_
+                        )
+                        for id_ in missing
+                    ]
+
+        if any(errors):
+            raise serializers.ValidationError(errors)
+
+        return rows
+
+    def _fail_non_field(self, message, code):
+        raise serializers.ValidationError({
+            api_settings.NON_FIELD_ERRORS_KEY: [message]
+        }, code=code)
+
+    def _existing_ids(self, rows):
+        """Return the referenced item and tag ids owned by the user
+
+        Both relations are checked in a single UNION query.
+        """
+        user = self.context['request'].user
+        existing = {'items': set(), 'tags': set()}
+        queries = [
+            model.objects.filter(
+                user=user,
+                id__in={id_ for row in rows for id_ in row[relation]}
+            ).annotate(
+                relation=Value(relation, output_field=CharField())
+            ).values_list('id', 'relation')
+            for relation, model in (('items', Item), ('tags', Tag))
+            if any(row[relation] for row in rows)
+        ]
+        if queries:
+            for id_, relation in queries[0].union(*queries[1:], all=True):
+                existing[relation].add(id_)
+
+        return existing
+
+    def create(self, validated_data):
+        """Insert the posts and their through rows in bulk"""
+        with transaction.atomic():
+            posts = [
+                Post(user=row['user'], title=row['title'])
+                for row in validated_data
+            ]
+            connection = connections[Post.objects.db]
+            if connection.features.can_return_rows_from_bulk_insert:
+                Post.objects.bulk_create(posts)
+            else:
+                # Without RETURNING the primary keys of bulk inserted rows
+                # are unknown, so the posts are saved one by one
+                for post in posts:
+                    post.save()
+
+            for relation in ('items', 'tags'):
+                through = getattr(Post, relation).through
+                column = Post._meta.get_field(relation).m2m_reverse_name()
+                through.objects.bulk_create([
+                    through(post_id=post.id, **{column: id_})
+                    for post, row in zip(posts, validated_data)
+                    for id_ in row[relation]
+                ])
+            # The bulk inserted links send no m2m_changed signals
+            similarity.update_signatures(post.id for post in posts)
+
+        for post, row in zip(posts, validated_data):
+            post.item_ids = row['items']
+            post.tag_ids = row['tags']
+        # bulk_create skips the save signals that bump the versions
+        if posts:
+            versions.bump(
+                'post', posts[0].user_id, [post.id for post in posts]
+            )
+
+        return posts
+
+
+class PostBulkSerializer(serializers.ModelSerializer):
+    """Serializer for one post of a bulk create"""
+    items = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        source='item_ids',
+        default=list
+    )
+    tags = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        source='tag_ids',
+        default=list
+    )
+
+    class Meta:
+        model = Post
+        fields = ('id', 'title', 'items', 'tags')
+        read_only_fields = ('id',)
+        list_serializer_class = PostBulkListSerializer
+
+    def to_internal_value(self, data):
+        """Return the row with duplicate related ids removed"""
+        row = super().to_internal_value(data)
+        return {
+            'title': row.get('title', ''),
+            'items': list(dict.fromkeys(row['item_ids'])),
+            'tags': list(dict.fromkeys(row['tag_ids'])),
+        }
+
+
+class HeaderCheckedImageField(serializers.ImageField):
+    """Image field that validates uploads from the image header only
+
+    Unlike ImageField the pixel data is never decoded, and uploads that
+    were streamed to disk are inspected in place instead of being read
+    into memory.
+    """
+    default_error_messages = {
+        'too_large': _('Ensure this file is at most {max_size} bytes.'),
+        'limit': _('{message}'),
+    }
+
+    def to_internal_value(self, data):
+        file = serializers.FileField.to_internal_value(self, data)
+        if file.size > max_upload_size():
+            self.fail('too_large', max_size=max_upload_size())
+
+        if hasattr(file, 'temporary_file_path'):
+            source = file.temporary_file_path()
+        else:
+            source = file
+        try:
+            inspect_image(source)
+        except ImageLimitError as exc:
+            self.fail('limit', message=str(exc))
+        except InvalidImageError:
+            self.fail('invalid_image')
+
+        if hasattr(file, 'seek') and callable(file.seek):
+            file.seek(0)
+
+        return file
+
+
 class PostImageSerializer(serializers.ModelSerializer):
     """Serializer for uploading images to posts"""
+    image = HeaderCheckedImageField(allow_null=True)
 
     class Meta:
         model = Post
         fields = ('id', 'image')
-        read_only_fields = ('id',)
\ No newline at end of file
+        read_only_fields = ('id',)
@@ -0,0 +1,221 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils.http import http_date
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core import versions
+from core.models import Item, Post, Tag
+from core.tests.utils import commit_hooks
+
+
+POSTS_URL = reverse('post:post-list')
+TAGS_URL = reverse('post:tag-list')
+ITEMS_URL = reverse('post:item-list')
+
+
+def detail_url(post_id):
+    """Return post detail url"""
+    return reverse('post:post-detail', args=[post_id])
+
+
+class ConditionalGetTests(TestCase):
+    """Test conditional requests to the post API"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            email='test@outfitted.com',
+            first_name='Test',
+            surname='von Account',
+            password='test123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.post = Post.objects.create(user=self.user, title='Outfit')
+
+    def assertNotModified(self, url):
+        etag = self.client.get(url)['ETag']
+        with self.assertNumQueries(0):
+            res = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(res['ETag'], etag)
+        return etag
+
+    def test_unchanged_list_not_modified(self):
+        """Test an unchanged post list returns 304 without queries"""
+        self.assertNotModified(POSTS_URL)
+
+    def test_unchanged_detail_not_modified(self):
+        """Test an unchanged post returns 304 without queries"""
+        self.assertNotModified(detail_url(self.post.id))
+
+    def test_unchanged_tag_list_not_modified(self):
+        """Test an unchanged tag list returns 304 without queries"""
+        self.assertNotModified(TAGS_URL)
+
+    def test_post_update_changes_etag(self):
+        """Test updating a post invalidates the list and the detail"""
+        list_etag = self.assertNotModified(POSTS_URL)
+        detail_etag = self.assertNotModified(detail_url(self.post.id))
+
+        with commit_hooks():
+            self.client.patch(detail_url(self.post.id), {'title': 'New'})
+
+        res = self.client.get(POSTS_URL, HTTP_IF_NONE_MATCH=list_etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(res['ETag'], list_etag)
+        res = self.client.get(
+            detail_url(self.post.id),
+            HTTP_IF_NONE_MATCH=detail_etag
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['title'], 'New')
+
+    def test_other_post_write_keeps_detail_etag(self):
+        """Test writing another post keeps a post detail cached"""
+        etag = self.assertNotModified(detail_url(self.post.id))
+        with commit_hooks():
+            Post.objects.create(user=self.user, title='Other')
+
+        res = self.client.get(
+            detail_url(self.post.id),
+            HTTP_IF_NONE_MATCH=etag
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_version_bumped_on_commit(self):
+        """Test a write changes the ETag only once its transaction commits"""
+        etag = self.assertNotModified(POSTS_URL)
+
+        with commit_hooks():
+            Post.objects.create(user=self.user, title='Other')
+            res = self.client.get(POSTS_URL, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        res = self.client.get(POSTS_URL, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_relation_changes_change_etag(self):
+        """Test linking a tag and renaming it invalidate the post detail"""
+        tag = Tag.objects.create(user=self.user, name='Casual')
+        etag = self.assertNotModified(detail_url(self.post.id))
+
+        with commit_hooks():
+            tag.post_set.add(self.post)
+        res = self.client.get(
+            detail_url(self.post.id),
+            HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['tags'][0]['name'], 'Casual')
+
+        etag = res['ETag']
+        tag.name = 'Formal'
+        with commit_hooks():
+            tag.save()
+        res = self.client.get(
+            detail_url(self.post.id),
+            HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['tags'][0]['name'], 'Formal')
+
+    def test_delete_changes_list_etag(self):
+        """Test deleting an item invalidates the post list"""
+        item = Item.objects.create(user=self.user, name='shirt')
+        etag = self.assertNotModified(POSTS_URL)
+
+        with commit_hooks():
+            item.delete()
+        res = self.client.get(POSTS_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_query_params_change_etag(self):
+        """Test the ETag depends on the query and not on parameter order"""
+        etag = self.client.get(POSTS_URL, {'page_size': 1})['ETag']
+
+        res = self.client.get(f'{POSTS_URL}?page_size=2')
+        self.assertNotEqual(res['ETag'], etag)
+        res = self.client.get(
+            f'{POSTS_URL}?tags=1&page_size=1'
+        )
+        self.assertEqual(
+            res['ETag'],
+            self.client.get(f'{POSTS_URL}?page_size=1&tags=1')['ETag']
+        )
+
+    def test_etag_is_per_user(self):
+        """Test users never share an ETag"""
+        etag = self.client.get(POSTS_URL)['ETag']
+        user2 = get_user_model().objects.create_user(
+            email='test2@outfitted.com',
+            first_name='Test2',
+            surname='von Account',
+            password='test123'
+        )
+        self.client.force_authenticate(user2)
+
+        res = self.client.get(POSTS_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_if_modified_since(self):
+        """Test Last-Modified is sent and honoured for past writes"""
+        for model_name in ('post', 'tag', 'item'):
+            cache.set(
+                versions.collection_key(model_name, self.user.id),
+                1000.5,
+                None
+            )
+
+        res = self.client.get(POSTS_URL)
+        self.assertEqual(res['Last-Modified'], http_date(1000))
+        with self.assertNumQueries(0):
+            res = self.client.get(
+                POSTS_URL,
+                HTTP_IF_MODIFIED_SINCE=http_date(1000)
+            )
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        with commit_hooks():
+            Post.objects.create(user=self.user, title='Other')
+        res = self.client.get(
+            POSTS_URL,
+            HTTP_IF_MODIFIED_SINCE=http_date(1000)
+        )
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_missing_post_not_cached(self):
+        """Test a missing post returns 404 without an ETag"""
+        res = self.client.get(detail_url(self.post.id + 1))
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertFalse(res.has_header('ETag'))
+
+    def test_any_etag_on_missing_post(self):
+        """Test If-None-Match: * returns 404 for a missing post"""
+        res = self.client.get(
+            detail_url(self.post.id + 1),
+            HTTP_IF_NONE_MATCH='*'
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+        res = self.client.get(detail_url(self.post.id), HTTP_IF_NONE_MATCH='*')
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_tag_and_item_detail_not_routed(self):
+        """Test tags and items still have no detail endpoint"""
+        tag = Tag.objects.create(user=self.user, name='Casual')
+        item = Item.objects.create(user=self.user, name='shirt')
+
+        for url in (f'{TAGS_URL}{tag.id}/', f'{ITEMS_URL}{item.id}/',
+                    f'{TAGS_URL}{tag.id + 1}/'):
+            res = self.client.get(url)
+            self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
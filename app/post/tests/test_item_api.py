@@ -1,11 +1,12 @@
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.urls import reverse
 from django.test import TestCase
 
 from rest_framework import status
 from rest_framework.test import APIClient
 
-from core.models import Item
+from core.models import Item, Post, Tag
 
 from post.serializers import ItemSerializer
 
@@ -30,6 +31,7 @@ class PrivateItemsApiTest(TestCase):
     """Test the private items api"""
 
     def setUp(self):
+        cache.clear()
         self.user = get_user_model().objects.create_user(
             email = 'test@outfitted.com',
             first_name = 'Test',
@@ -86,4 +88,49 @@ class PrivateItemsApiTest(TestCase):
 
         self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
 
+    def test_retrieve_items_assigned_to_posts(self):
+        """Test filtering items by those assigned to posts"""
+        item1 = Item.objects.create(user=self.user, name='Shirt')
+        item2 = Item.objects.create(user=self.user, name='Scarf')
+        post = Post.objects.create(title='Winter outfit', user=self.user)
+        post.items.add(item1)
 
+        res = self.client.get(ITEMS_URL, {'assigned_only': 1})
+
+        serializer1 = ItemSerializer(item1)
+        serializer2 = ItemSerializer(item2)
+        self.assertIn(serializer1.data, res.data)
+        self.assertNotIn(serializer2.data, res.data)
+
+    def test_retrieve_items_assigned_unique(self):
+        """Test filtering items by assigned returns unique items"""
+        item = Item.objects.create(user=self.user, name='Shirt')
+        Item.objects.create(user=self.user, name='Scarf')
+        for title in ('Winter outfit', 'Autumn outfit'):
+            post = Post.objects.create(title=title, user=self.user)
+            post.items.add(item)
+
+        res = self.client.get(ITEMS_URL, {'assigned_only': 1})
+
+        self.assertEqual(len(res.data), 1)
+
+    def test_item_recommendations(self):
+        """Test items and tags that go with an item are recommended"""
+        shirt = Item.objects.create(user=self.user, name='shirt')
+        jeans = Item.objects.create(user=self.user, name='jeans')
+        tag = Tag.objects.create(user=self.user, name='Casual')
+        for title in ('Monday', 'Friday'):
+            post = Post.objects.create(title=title, user=self.user)
+            post.items.add(shirt, jeans)
+            post.tags.add(tag)
+
+        res = self.client.get(
+            reverse('post:item-recommendations', args=[shirt.id])
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [item['name'] for item in res.data['items']], ['jeans']
+        )
+        self.assertEqual([tag['name'] for tag in res.data['tags']], ['Casual'])
+        self.assertEqual(res.data['items'][0]['count'], 2)
@@ -1,21 +1,27 @@
 import tempfile
 import os
+from unittest.mock import patch
 
 from PIL import Image
 
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.urls import reverse
-from django.test import TestCase
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 
 from rest_framework import status
 from rest_framework.test import APIClient
 
 from core.models import Post, Item, Tag
+from core.tests.utils import commit_hooks
 
 from post.serializers import PostSerializer, PostDetailSerializer
 
 
 POSTS_URL = reverse('post:post-list')
+BULK_URL = reverse('post:post-bulk')
 
 
 def image_upload_url(post_id):
@@ -23,6 +29,11 @@ def image_upload_url(post_id):
     return reverse('post:post-upload-image', args=[post_id])
 
 
+def similar_url(post_id):
+    """Return similar posts url"""
+    return reverse('post:post-similar', args=[post_id])
+
+
 def detail_url(post_id):
     """Return post detail url"""
     return reverse('post:post-detail', args=[post_id])
@@ -62,6 +73,7 @@ class PrivatePostApiTest(TestCase):
     """Test authenticated post API access"""
 
     def setUp(self):
+        cache.clear()
         self.user = get_user_model().objects.create_user(
             email = 'test@outfitted.com',
             first_name = 'Test',
@@ -200,6 +212,7 @@ class PrivatePostApiTest(TestCase):
 class PostImageUploadTests(TestCase):
 
     def setUp(self):
+        cache.clear()
         self.user = get_user_model().objects.create_user(
             email = 'test@outfitted.com',
             first_name = 'Test',
@@ -227,6 +240,102 @@ class PostImageUploadTests(TestCase):
         self.assertIn('image', res.data)
         self.assertTrue(os.path.exists(self.post.image.path))
 
+    @patch('post.views.schedule_variants')
+    @patch('post.views.transaction.on_commit', side_effect=lambda f: f())
+    def test_upload_image_schedules_variants(self, on_commit, schedule):
+        """Test that uploading an image schedules its variants"""
+        url = image_upload_url(self.post.id)
+        with tempfile.NamedTemporaryFile(suffix='.jpg') as ntf:
+            img = Image.new('RGB', (10, 10))
+            img.save(ntf, format='JPEG')
+            ntf.seek(0)
+            res = self.client.post(url, {'image': ntf}, format='multipart')
+
+        self.post.refresh_from_db()
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        schedule.assert_called_once()
+        self.assertEqual(schedule.call_args[0][0].id, self.post.id)
+        self.assertFalse(self.post.image_variants_ready)
+
+    @patch('post.views.schedule_variants')
+    @patch('post.views.transaction.on_commit', side_effect=lambda f: f())
+    def test_clear_image_schedules_nothing(self, on_commit, schedule):
+        """Test that clearing the image does not schedule variants"""
+        res = self.client.post(
+            image_upload_url(self.post.id), {'image': None}, format='json'
+        )
+
+        self.post.refresh_from_db()
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertFalse(self.post.image)
+        schedule.assert_not_called()
+
+    def test_image_variants_fall_back_to_original(self):
+        """Test that variant urls point at the original until ready"""
+        url = image_upload_url(self.post.id)
+        with tempfile.NamedTemporaryFile(suffix='.jpg') as ntf:
+            img = Image.new('RGB', (10, 10))
+            img.save(ntf, format='JPEG')
+            ntf.seek(0)
+            self.client.post(url, {'image': ntf}, format='multipart')
+
+        res = self.client.get(detail_url(self.post.id))
+
+        variants = res.data['image_variants']
+        self.assertEqual(variants['thumb']['jpeg'], res.data['image'])
+
+        Post.objects.filter(id=self.post.id).update(image_variants_ready=True)
+        res = self.client.get(detail_url(self.post.id))
+
+        variants = res.data['image_variants']
+        self.assertIn('/upload/post/variants/', variants['thumb']['jpeg'])
+        self.assertTrue(variants['thumb']['webp'].endswith('_thumb.webp'))
+
+    def _upload(self, image, image_format='JPEG', suffix='.jpg'):
+        """Upload an image to the sample post and return the response"""
+        url = image_upload_url(self.post.id)
+        with tempfile.NamedTemporaryFile(suffix=suffix) as ntf:
+            image.save(ntf, format=image_format)
+            ntf.seek(0)
+            return self.client.post(url, {'image': ntf}, format='multipart')
+
+    @override_settings(POST_IMAGE_MAX_PIXELS=50)
+    def test_upload_image_too_many_pixels(self):
+        """Test that images above the pixel limit are rejected"""
+        res = self._upload(Image.new('RGB', (10, 10)))
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.post.refresh_from_db()
+        self.assertFalse(self.post.image)
+
+    @override_settings(POST_IMAGE_MAX_UPLOAD_SIZE=1000)
+    def test_upload_image_too_large(self):
+        """Test that files above the size limit are rejected"""
+        noise = Image.frombytes('L', (200, 200), os.urandom(200 * 200))
+        res = self._upload(noise, image_format='PNG', suffix='.png')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.post.refresh_from_db()
+        self.assertFalse(self.post.image)
+
+    def test_upload_image_unsupported_format(self):
+        """Test that image formats outside the allowed list are rejected"""
+        res = self._upload(
+            Image.new('RGB', (10, 10)), image_format='BMP', suffix='.bmp'
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_upload_non_image_file(self):
+        """Test that a file that is not an image is rejected"""
+        url = image_upload_url(self.post.id)
+        with tempfile.NamedTemporaryFile(suffix='.jpg') as ntf:
+            ntf.write(b'not an image')
+            ntf.seek(0)
+            res = self.client.post(url, {'image': ntf}, format='multipart')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
     def test_upload_image_bad_request(self):
         """Test uploading an invalid image"""
         url = image_upload_url(self.post.id)
@@ -254,4 +363,562 @@ class PostImageUploadTests(TestCase):
         serializer3 = PostSerializer(post3)
         self.assertIn(serializer1.data, res.data)
         self.assertIn(serializer2.data, res.data)
-        self.assertNotIn(serializer3.data, res.data)
\ No newline at end of file
+        self.assertNotIn(serializer3.data, res.data)
+
+
+class PostPaginationTests(TestCase):
+    """Test cursor pagination of the post list"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            email = 'test@outfitted.com',
+            first_name = 'Test',
+            surname = 'von Account',
+            password = 'test123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.posts = [
+            sample_post(user=self.user, title=f'Outfit {i}') for i in range(5)
+        ]
+
+    def test_list_unpaginated_by_default(self):
+        """Test that the post list is a plain list without paging params"""
+        res = self.client.get(POSTS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data), 5)
+
+    def test_paginate_with_page_size(self):
+        """Test that page_size returns the newest posts first"""
+        res = self.client.get(POSTS_URL, {'page_size': 2})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        ids = [post['id'] for post in res.data['results']]
+        self.assertEqual(ids, [self.posts[4].id, self.posts[3].id])
+        self.assertIsNotNone(res.data['next'])
+        self.assertIsNone(res.data['previous'])
+
+    def test_follow_cursor_through_all_pages(self):
+        """Test that following next links returns every post once"""
+        ids = []
+        res = self.client.get(POSTS_URL, {'page_size': 2})
+        while True:
+            ids.extend(post['id'] for post in res.data['results'])
+            if not res.data['next']:
+                break
+            res = self.client.get(res.data['next'])
+
+        self.assertEqual(ids, [post.id for post in reversed(self.posts)])
+
+    def test_invalid_cursor(self):
+        """Test that an invalid cursor returns not found"""
+        res = self.client.get(POSTS_URL, {'cursor': 'cD1ub3RhbmlkCg=='})
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class PostQueryBudgetTests(TestCase):
+    """Test that post endpoints run a fixed number of queries"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            email = 'test@outfitted.com',
+            first_name = 'Test',
+            surname = 'von Account',
+            password = 'test123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.tag = sample_tag(user=self.user)
+        self.item = sample_item(user=self.user)
+
+    def _create_posts(self, count):
+        """Create posts that each have a tag and an item"""
+        for i in range(count):
+            post = sample_post(user=self.user, title=f'Outfit {i}')
+            post.tags.add(self.tag)
+            post.items.add(self.item)
+
+    @override_settings(POST_VALUES_LIST=False)
+    def test_list_query_budget(self):
+        """Test listing posts does not query per post"""
+        self._create_posts(10)
+
+        with self.assertNumQueries(3):
+            res = self.client.get(POSTS_URL)
+
+        self.assertEqual(len(res.data), 10)
+
+    @override_settings(POST_VALUES_LIST=False)
+    def test_list_paginated_query_budget(self):
+        """Test listing a page of posts does not query per post"""
+        self._create_posts(10)
+
+        with self.assertNumQueries(3):
+            res = self.client.get(POSTS_URL, {'page_size': 5})
+
+        self.assertEqual(len(res.data['results']), 5)
+
+    @override_settings(POST_VALUES_LIST=False)
+    def test_filter_by_tags_query_budget(self):
+        """Test filtering posts by tag does not query per post"""
+        self._create_posts(10)
+
+        with self.assertNumQueries(3):
+            res = self.client.get(POSTS_URL, {'tags': str(self.tag.id)})
+
+        self.assertEqual(len(res.data), 10)
+
+    def test_values_list_query_budget(self):
+        """Test the values based list runs a single query"""
+        self._create_posts(10)
+
+        with self.assertNumQueries(1):
+            res = self.client.get(POSTS_URL, {'tags': str(self.tag.id)})
+        with self.assertNumQueries(1):
+            res = self.client.get(POSTS_URL, {'page_size': 5})
+
+        self.assertEqual(len(res.data['results']), 5)
+
+    def test_retrieve_query_budget(self):
+        """Test retrieving a post detail uses a fixed number of queries"""
+        self._create_posts(1)
+        post = Post.objects.get(user=self.user)
+        post.tags.add(sample_tag(user=self.user, name='Night out'))
+        post.items.add(sample_item(user=self.user, name='Belt'))
+
+        with self.assertNumQueries(3):
+            res = self.client.get(detail_url(post.id))
+
+        self.assertEqual(len(res.data['tags']), 2)
+        self.assertEqual(len(res.data['items']), 2)
+
+
+class PostRelationFilterTests(TestCase):
+    """Test filtering posts by any or all of their tags and items"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            email = 'test@outfitted.com',
+            first_name = 'Test',
+            surname = 'von Account',
+            password = 'test123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.casual = sample_tag(user=self.user, name='Casual')
+        self.summer = sample_tag(user=self.user, name='Summer')
+        self.shirt = sample_item(user=self.user, name='Shirt')
+        self.shorts = sample_item(user=self.user, name='Shorts')
+        self.both = sample_post(user=self.user, title='Beach day')
+        self.both.tags.add(self.casual, self.summer)
+        self.both.items.add(self.shirt, self.shorts)
+        self.one = sample_post(user=self.user, title='Office')
+        self.one.tags.add(self.casual)
+        self.one.items.add(self.shirt)
+        self.none = sample_post(user=self.user, title='Gala')
+
+    def _ids(self, params):
+        """Return the ids of the posts listed with the given params"""
+        res = self.client.get(POSTS_URL, params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return [post['id'] for post in res.data]
+
+    def test_tags_not_duplicated(self):
+        """Test posts matching several requested tags are listed once"""
+        tags = f'{self.casual.id},{self.summer.id}'
+
+        self.assertEqual(
+            self._ids({'tags': tags}), [self.one.id, self.both.id]
+        )
+        self.assertEqual(
+            self._ids({'tags_any': tags}), [self.one.id, self.both.id]
+        )
+
+    def test_tags_all(self):
+        """Test tags_all returns posts that have every requested tag"""
+        tags = f'{self.casual.id},{self.summer.id},{self.casual.id}'
+
+        self.assertEqual(self._ids({'tags_all': tags}), [self.both.id])
+        self.assertEqual(
+            self._ids({'tags_all': str(self.casual.id)}),
+            [self.one.id, self.both.id]
+        )
+
+    def test_items_any_and_all(self):
+        """Test filtering posts by any or all of their items"""
+        items = f'{self.shirt.id},{self.shorts.id}'
+
+        self.assertEqual(
+            self._ids({'items_any': items}), [self.one.id, self.both.id]
+        )
+        self.assertEqual(self._ids({'items_all': items}), [self.both.id])
+
+    def test_combined_filters(self):
+        """Test tag and item filters narrow each other down"""
+        params = {
+            'tags_any': str(self.casual.id),
+            'items_all': f'{self.shirt.id},{self.shorts.id}',
+        }
+
+        self.assertEqual(self._ids(params), [self.both.id])
+
+
+class PostBulkCreateTests(TestCase):
+    """Test creating many posts in one request"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            email = 'test@outfitted.com',
+            first_name = 'Test',
+            surname = 'von Account',
+            password = 'test123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.tag = sample_tag(user=self.user)
+        self.item = sample_item(user=self.user)
+
+    def test_bulk_create_posts(self):
+        """Test creating posts with tags and items in bulk"""
+        payload = [
+            {'title': 'Outfit 1', 'tags': [self.tag.id], 'items': []},
+            {
+                'title': 'Outfit 2',
+                'tags': [self.tag.id, self.tag.id],
+                'items': [self.item.id]
+            },
+            {'title': 'Outfit 3'},
+        ]
+        res = self.client.post(BULK_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            [(row['title'], row['tags'], row['items']) for row in res.data],
+            [
+                ('Outfit 1', [self.tag.id], []),
+                ('Outfit 2', [self.tag.id], [self.item.id]),
+                ('Outfit 3', [], []),
+            ]
+        )
+        post = Post.objects.get(id=res.data[1]['id'])
+        self.assertEqual(post.user, self.user)
+        self.assertEqual(list(post.tags.all()), [self.tag])
+        self.assertEqual(list(post.items.all()), [self.item])
+
+    def test_bulk_create_validates_ids_in_one_query(self):
+        """Test the referenced ids of every post are checked at once"""
+        tags = [sample_tag(user=self.user, name=f'tag {i}') for i in range(5)]
+        payload = [
+            {'title': f'Outfit {i}', 'tags': [tag.id], 'items': [self.item.id]}
+            for i, tag in enumerate(tags)
+        ]
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.post(BULK_URL, payload, format='json')
+
+        id_queries = [
+            query for query in queries.captured_queries
+            if 'FROM "core_tag"' in query['sql']
+            or 'FROM "core_item"' in query['sql']
+        ]
+        self.assertEqual(len(id_queries), 1)
+        self.assertEqual(Post.objects.count(), 5)
+
+    def test_bulk_create_per_row_errors(self):
+        """Test invalid rows are reported by position and nothing is saved"""
+        user2 = get_user_model().objects.create_user(
+            email = 'test2@outfitted.com',
+            first_name = 'Test2',
+            surname = 'von Account',
+            password = 'test123'
+        )
+        other_tag = sample_tag(user=user2)
+        payload = [
+            {'title': 'Outfit 1', 'tags': [self.tag.id]},
+            {'title': 'Outfit 2', 'tags': [other_tag.id]},
+            {'title': 'Outfit 3', 'items': ['shirt']},
+        ]
+        res = self.client.post(BULK_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(res.data[0], {})
+        self.assertIn('tags', res.data[1])
+        self.assertIn('items', res.data[2])
+        self.assertFalse(Post.objects.exists())
+
+    def test_bulk_create_requires_list(self):
+        """Test the payload must be a list"""
+        res = self.client.post(BULK_URL, {'title': 'Outfit'}, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(POST_BULK_MAX_ROWS=2)
+    def test_bulk_create_max_rows(self):
+        """Test payloads over the row limit are rejected"""
+        payload = [{'title': f'Outfit {i}'} for i in range(3)]
+        res = self.client.post(BULK_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Post.objects.exists())
+
+    def test_bulk_create_refreshes_list(self):
+        """Test created posts show up in a previously cached list"""
+        self.client.get(POSTS_URL)
+        with commit_hooks():
+            self.client.post(BULK_URL, [{'title': 'Outfit'}], format='json')
+
+        res = self.client.get(POSTS_URL)
+
+        self.assertEqual(len(res.data), 1)
+
+
+class PostRelatedIdValidationTests(TestCase):
+    """Test validating the tag and item ids of a post"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            email = 'test@outfitted.com',
+            first_name = 'Test',
+            surname = 'von Account',
+            password = 'test123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def create_queries(self, tag_count):
+        """Return the number of queries creating a post with tags takes"""
+        tags = [
+            sample_tag(user=self.user, name=f'tag {tag_count} {i}')
+            for i in range(tag_count)
+        ]
+        payload = {
+            'title': 'Outfit',
+            'tags': [tag.id for tag in tags],
+            'items': [],
+        }
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.post(POSTS_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(res.data['tags']), tag_count)
+        return len(queries)
+
+    def test_tag_ids_validated_in_one_query(self):
+        """Test the number of queries does not grow with the tag count"""
+        self.assertEqual(self.create_queries(1), self.create_queries(20))
+
+    def test_foreign_and_missing_ids_rejected(self):
+        """Test every foreign or missing id is reported at once"""
+        user2 = get_user_model().objects.create_user(
+            email = 'test2@outfitted.com',
+            first_name = 'Test2',
+            surname = 'von Account',
+            password = 'test123'
+        )
+        tag = sample_tag(user=self.user)
+        other_tag = sample_tag(user=user2)
+        payload = {
+            'title': 'Outfit',
+            'tags': [tag.id, other_tag.id, other_tag.id + 100, 'x'],
+            'items': [],
+        }
+        res = self.client.post(POSTS_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(len(res.data['tags']), 3)
+        self.assertIn(str(other_tag.id), ' '.join(res.data['tags']))
+        self.assertFalse(Post.objects.exists())
+
+    def test_update_with_duplicate_ids(self):
+        """Test duplicate ids are assigned once"""
+        post = sample_post(user=self.user)
+        item = sample_item(user=self.user)
+
+        res = self.client.patch(
+            detail_url(post.id),
+            {'items': [item.id, item.id]},
+            format='json'
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(list(post.items.all()), [item])
+
+    def test_create_post_with_tag_names(self):
+        """Test tags are resolved by name and created when missing"""
+        tag = sample_tag(user=self.user, name='Casual')
+        item = sample_item(user=self.user, name='shirt')
+        payload = {
+            'title': 'Outfit',
+            'tags': [tag.id],
+            'tag_names': ['CASUAL', 'Summer'],
+            'item_names': ['Shirt', 'Shorts'],
+        }
+        res = self.client.post(POSTS_URL, payload, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertNotIn('tag_names', res.data)
+        post = Post.objects.get(id=res.data['id'])
+        self.assertEqual(
+            sorted(tag.name for tag in post.tags.all()),
+            ['Casual', 'Summer']
+        )
+        self.assertEqual(
+            sorted(item.name for item in post.items.all()),
+            ['Shorts', 'shirt']
+        )
+        self.assertIn(item, post.items.all())
+        self.assertEqual(Tag.objects.filter(user=self.user).count(), 2)
+
+
+class PostSearchTests(TestCase):
+    """Test searching post titles"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            email = 'test@outfitted.com',
+            first_name = 'Test',
+            surname = 'von Account',
+            password = 'test123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_search_posts(self):
+        """Test only posts matching every search word are returned"""
+        post1 = sample_post(user=self.user, title='Summer beach outfit')
+        post2 = sample_post(user=self.user, title='Beach party')
+        sample_post(user=self.user, title='Winter outfit')
+
+        res = self.client.get(POSTS_URL, {'search': 'beach'})
+        self.assertEqual(
+            sorted(post['id'] for post in res.data),
+            [post1.id, post2.id]
+        )
+        res = self.client.get(POSTS_URL, {'search': 'Outfit  Beach'})
+        self.assertEqual([post['id'] for post in res.data], [post1.id])
+
+    def test_search_with_tags(self):
+        """Test search composes with the tag filter"""
+        tag = sample_tag(user=self.user)
+        post1 = sample_post(user=self.user, title='Beach outfit')
+        post1.tags.add(tag)
+        sample_post(user=self.user, title='Beach party')
+
+        res = self.client.get(POSTS_URL, {'search': 'beach', 'tags': tag.id})
+
+        self.assertEqual([post['id'] for post in res.data], [post1.id])
+
+    def test_search_paginated(self):
+        """Test search results are paged with a cursor"""
+        posts = [
+            sample_post(user=self.user, title=f'Beach {i}') for i in range(5)
+        ]
+        sample_post(user=self.user, title='Winter')
+
+        seen = []
+        res = self.client.get(POSTS_URL, {'search': 'beach', 'page_size': 2})
+        while True:
+            seen += [post['id'] for post in res.data['results']]
+            if not res.data['next']:
+                break
+            res = self.client.get(res.data['next'])
+
+        self.assertEqual(sorted(seen), sorted(post.id for post in posts))
+        self.assertEqual(len(seen), len(set(seen)))
+
+    def test_search_paginated_past_ties(self):
+        """Test paging reaches every result when over 1000 ranks tie"""
+        Post.objects.bulk_create([
+            Post(user=self.user, title='summer') for _ in range(1300)
+        ])
+
+        seen = []
+        res = self.client.get(
+            POSTS_URL, {'search': 'summer', 'page_size': 100}
+        )
+        while True:
+            seen += [post['id'] for post in res.data['results']]
+            if not res.data['next']:
+                break
+            res = self.client.get(res.data['next'])
+
+        self.assertEqual(len(seen), 1300)
+        self.assertEqual(seen, sorted(set(seen), reverse=True))
+        res = self.client.get(res.data['previous'])
+        self.assertEqual(
+            [post['id'] for post in res.data['results']], seen[-200:-100]
+        )
+
+
+class PostSimilarTests(TestCase):
+    """Test finding posts with similar tags and items"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            email = 'test@outfitted.com',
+            first_name = 'Test',
+            surname = 'von Account',
+            password = 'test123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.tags = [
+            sample_tag(user=self.user, name=f'tag {i}') for i in range(8)
+        ]
+
+    def post_with_tags(self, tags, user=None):
+        post = sample_post(user=user or self.user)
+        post.tags.set(tags)
+        return post
+
+    def test_similar_posts_ranked(self):
+        """Test similar posts are ranked by Jaccard similarity"""
+        post = self.post_with_tags(self.tags[:6])
+        close = self.post_with_tags(self.tags[:5])
+        exact = self.post_with_tags(self.tags[:6])
+        self.post_with_tags(self.tags[6:])
+
+        res = self.client.get(similar_url(post.id))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([row['id'] for row in res.data], [exact.id, close.id])
+        self.assertEqual(res.data[0]['similarity'], 1.0)
+        self.assertEqual(res.data[1]['tags'], sorted(
+            tag.id for tag in self.tags[:5]
+        ))
+
+    def test_similar_posts_ignore_list_filters(self):
+        """Test list query parameters do not drop similar posts"""
+        post = sample_post(user=self.user, title='one')
+        post.tags.set(self.tags[:3])
+        other = self.post_with_tags(self.tags[:3])
+
+        res = self.client.get(similar_url(post.id), {'search': 'one'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([row['id'] for row in res.data], [other.id])
+
+    def test_similar_posts_limited_to_user(self):
+        """Test posts of other users are never suggested"""
+        user2 = get_user_model().objects.create_user(
+            email = 'test2@outfitted.com',
+            first_name = 'Test2',
+            surname = 'von Account',
+            password = 'test123'
+        )
+        post = self.post_with_tags(self.tags[:3])
+        other = sample_post(user=user2)
+        other.tags.set(self.tags[:3])
+
+        res = self.client.get(similar_url(post.id), {'k': 5})
+
+        self.assertEqual(res.data, [])
@@ -0,0 +1,146 @@
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework.test import APIClient
+
+from core.models import Post, Tag
+from core.tests.utils import commit_hooks
+
+from post.views import TagViewSet
+
+
+POSTS_URL = reverse('post:post-list')
+TAGS_URL = reverse('post:tag-list')
+
+
+class ResponseCacheTests(TestCase):
+    """Test the per-user list response cache"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user(
+            email='test@outfitted.com',
+            first_name='Test',
+            surname='von Account',
+            password='test123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.tag1 = Tag.objects.create(user=self.user, name='Casual')
+        self.tag2 = Tag.objects.create(user=self.user, name='Formal')
+        self.post = Post.objects.create(user=self.user, title='Outfit')
+        self.post.tags.add(self.tag1, self.tag2)
+
+    def test_repeated_list_cached(self):
+        """Test a repeated list is served without queries"""
+        res1 = self.client.get(POSTS_URL)
+        with self.assertNumQueries(0):
+            res2 = self.client.get(POSTS_URL)
+
+        self.assertEqual(res1.data, res2.data)
+
+    def test_write_invalidates_list(self):
+        """Test creating a tag refreshes the cached tag list"""
+        self.client.get(TAGS_URL)
+        with commit_hooks():
+            self.client.post(TAGS_URL, {'name': 'Sporty'})
+
+        res = self.client.get(TAGS_URL)
+
+        self.assertIn('Sporty', [tag['name'] for tag in res.data])
+
+    def test_read_during_write_not_served_after_commit(self):
+        """Test a list read before a write commits is rebuilt afterwards"""
+        get_queryset = TagViewSet.get_queryset
+
+        def uncommitted_hidden(view):
+            # Another connection does not see the uncommitted tag yet
+            return get_queryset(view).exclude(name='Sporty')
+
+        with commit_hooks():
+            Tag.objects.create(user=self.user, name='Sporty')
+            with patch.object(TagViewSet, 'get_queryset', uncommitted_hidden):
+                res = self.client.get(TAGS_URL)
+            self.assertNotIn('Sporty', [tag['name'] for tag in res.data])
+
+        res = self.client.get(TAGS_URL)
+
+        self.assertIn('Sporty', [tag['name'] for tag in res.data])
+
+    def test_equivalent_filters_share_entry(self):
+        """Test id filters in another order hit the same entry"""
+        res1 = self.client.get(
+            POSTS_URL,
+            {'tags': f'{self.tag2.id},{self.tag1.id}'}
+        )
+        with self.assertNumQueries(0):
+            res2 = self.client.get(
+                POSTS_URL,
+                {'tags': f'{self.tag1.id},{self.tag2.id},{self.tag1.id}'}
+            )
+
+        self.assertEqual(res1.data, res2.data)
+        self.assertEqual(len(res2.data), 1)
+
+    def test_distinct_params_not_shared(self):
+        """Test different filters are cached separately"""
+        Tag.objects.create(user=self.user, name='Unused')
+        res1 = self.client.get(TAGS_URL, {'assigned_only': 1})
+        res2 = self.client.get(TAGS_URL, {'assigned_only': 0})
+
+        self.assertEqual(len(res1.data), 2)
+        self.assertEqual(len(res2.data), 3)
+
+    def test_cache_is_per_user(self):
+        """Test users never read each other's cached lists"""
+        self.client.get(POSTS_URL)
+        user2 = get_user_model().objects.create_user(
+            email='test2@outfitted.com',
+            first_name='Test2',
+            surname='von Account',
+            password='test123'
+        )
+        self.client.force_authenticate(user2)
+
+        res = self.client.get(POSTS_URL)
+
+        self.assertEqual(res.data, [])
+
+    def test_waits_for_entry_being_built(self):
+        """Test a miss waits for the request holding the lock"""
+        etag = self.client.get(POSTS_URL)['ETag']
+        key = f'response:{etag}'
+        cache.delete(key)
+        cache.add(f'{key}:lock', True)
+
+        def build_entry(seconds):
+            cache.set(key, [{'id': 1}])
+
+        with patch('post.responsecache.time.sleep', side_effect=build_entry):
+            with self.assertNumQueries(0):
+                res = self.client.get(POSTS_URL)
+
+        self.assertEqual(res.data, [{'id': 1}])
+
+    @override_settings(RESPONSE_CACHE_LOCK_WAIT=0)
+    def test_lock_wait_runs_out(self):
+        """Test a miss builds the response when the lock is not released"""
+        etag = self.client.get(POSTS_URL)['ETag']
+        key = f'response:{etag}'
+        cache.delete(key)
+        cache.add(f'{key}:lock', True)
+
+        res = self.client.get(POSTS_URL)
+
+        self.assertEqual(res.data[0]['title'], 'Outfit')
+
+    @override_settings(RESPONSE_CACHE=False)
+    def test_cache_disabled(self):
+        """Test lists query the database when the cache is disabled"""
+        self.client.get(POSTS_URL)
+        with self.assertNumQueries(1):
+            self.client.get(POSTS_URL)
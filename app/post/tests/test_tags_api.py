@@ -1,16 +1,22 @@
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import IntegrityError, connection, transaction
 from django.urls import reverse
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 
 from rest_framework import status
 from rest_framework.test import APIClient
 
 from core.models import Tag, Post
+from core.tests.utils import commit_hooks
 
 from post.serializers import TagSerializer
 
 
 TAGS_URL = reverse('post:tag-list')
+UPSERT_URL = reverse('post:tag-upsert')
+AUTOCOMPLETE_URL = reverse('post:tag-autocomplete')
 
 
 class PublicTagsApiTests(TestCase):
@@ -30,6 +36,7 @@ class PrivateTagsApiTests(TestCase):
     """Test the authorized user tags API"""
 
     def setUp(self):
+        cache.clear()
         self.user = get_user_model().objects.create_user(
             email = 'test@outfitted.com',
             first_name = 'Test',
@@ -123,5 +130,103 @@ class PrivateTagsApiTests(TestCase):
         res = self.client.get(TAGS_URL, {'assigned_only': 1})
 
         self.assertEqual(len(res.data), 1)
-    
 
+    def test_retrieve_tags_assigned_without_distinct(self):
+        """Test filtering assigned tags uses a semi-join, not DISTINCT"""
+        tag = Tag.objects.create(user=self.user, name='Casual')
+        for title in ('Run', 'Walk'):
+            post = Post.objects.create(title=title, user=self.user)
+            post.tags.add(tag)
+
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(TAGS_URL, {'assigned_only': 1})
+
+        self.assertEqual(res.data, [TagSerializer(tag).data])
+        sql = queries.captured_queries[-1]['sql'].upper()
+        self.assertNotIn('DISTINCT', sql)
+        self.assertIn('EXISTS', sql)
+
+    def test_create_tag_duplicate_name_rejected(self):
+        """Test a tag name the user already has in another case fails"""
+        Tag.objects.create(user=self.user, name='Casual')
+
+        res = self.client.post(TAGS_URL, {'name': 'CASUAL'})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Tag.objects.count(), 1)
+
+    def test_duplicate_name_violates_unique_index(self):
+        """Test the database rejects case duplicates of a user's tag"""
+        Tag.objects.create(user=self.user, name='Casual')
+
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Tag.objects.create(user=self.user, name='casual')
+
+    def test_upsert_tags(self):
+        """Test upserting tags creates the missing ones only"""
+        existing = Tag.objects.create(user=self.user, name='Casual')
+
+        res = self.client.post(
+            UPSERT_URL,
+            {'names': ['casual', 'Sport', 'SPORT', 'Night Out']},
+            format='json'
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [tag['name'] for tag in res.data],
+            ['Casual', 'Sport', 'Night Out']
+        )
+        self.assertEqual(res.data[0]['id'], existing.id)
+        self.assertEqual(Tag.objects.filter(user=self.user).count(), 3)
+
+    def test_upsert_tags_invalid(self):
+        """Test upserting requires a list of names"""
+        res = self.client.post(UPSERT_URL, {'names': []}, format='json')
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_autocomplete_tags(self):
+        """Test tag suggestions match the prefix and rank by usage"""
+        casual = Tag.objects.create(user=self.user, name='Casual')
+        cargo = Tag.objects.create(user=self.user, name='cargo')
+        Tag.objects.create(user=self.user, name='Sport')
+        for title in ('Run', 'Walk'):
+            post = Post.objects.create(title=title, user=self.user)
+            post.tags.add(cargo)
+
+        res = self.client.get(AUTOCOMPLETE_URL, {'q': 'CA'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data, [
+            {'id': cargo.id, 'name': 'cargo', 'uses': 2},
+            {'id': casual.id, 'name': 'Casual', 'uses': 0},
+        ])
+
+    def test_autocomplete_cached_until_write(self):
+        """Test suggestions are cached and follow new links"""
+        tag = Tag.objects.create(user=self.user, name='Casual')
+        self.client.get(AUTOCOMPLETE_URL, {'q': 'c'})
+
+        with self.assertNumQueries(0):
+            res = self.client.get(AUTOCOMPLETE_URL, {'q': 'ca'})
+        self.assertEqual(res.data[0]['uses'], 0)
+
+        with commit_hooks():
+            post = Post.objects.create(title='Run', user=self.user)
+            post.tags.add(tag)
+        res = self.client.get(AUTOCOMPLETE_URL, {'q': 'ca'})
+
+        self.assertEqual(res.data[0]['uses'], 1)
+
+    def test_autocomplete_limit(self):
+        """Test suggestions are limited and treat _ as a plain character"""
+        Tag.objects.create(user=self.user, name='a_1')
+        Tag.objects.create(user=self.user, name='ab2')
+        Tag.objects.create(user=self.user, name='a_3')
+
+        res = self.client.get(AUTOCOMPLETE_URL, {'q': 'a_', 'limit': 1})
+
+        self.assertEqual([tag['name'] for tag in res.data], ['a_1'])
+        res = self.client.get(AUTOCOMPLETE_URL, {'limit': 'x'})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,80 @@
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.test import TestCase, override_settings
+
+from rest_framework.test import APIClient
+
+from core.models import Item, Post, Tag
+
+
+POSTS_URL = reverse('post:post-list')
+TAGS_URL = reverse('post:tag-list')
+ITEMS_URL = reverse('post:item-list')
+
+
+class ValuesListTests(TestCase):
+    """Test the values based list matches the serializer output exactly"""
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email = 'test@outfitted.com',
+            first_name = 'Test',
+            surname = 'von Account',
+            password = 'test123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        tags = [
+            Tag.objects.create(user=self.user, name=name)
+            for name in ('Casual', 'Summer', 'Night out')
+        ]
+        items = [
+            Item.objects.create(user=self.user, name=name)
+            for name in ('Shirt', 'Shorts', 'Hat', 'Belt')
+        ]
+        for i in range(6):
+            post = Post.objects.create(user=self.user, title=f'Outfit {i}')
+            post.tags.add(*tags[:i % 4])
+            post.items.add(*reversed(items[:i % 5]))
+        Post.objects.filter(title='Outfit 1').update(
+            image='upload/post/ab/abc.jpg'
+        )
+        Post.objects.filter(title='Outfit 2').update(
+            image='upload/post/cd/cde.png', image_variants_ready=True
+        )
+
+    def assertSameResponse(self, url, params=None):
+        """Assert both list paths return the same status and body"""
+        fast = self.client.get(url, params)
+        with override_settings(POST_VALUES_LIST=False):
+            slow = self.client.get(url, params)
+
+        self.assertEqual(fast.status_code, slow.status_code)
+        self.assertEqual(fast.content, slow.content)
+        return fast
+
+    def test_posts(self):
+        """Test the post list matches the serializer"""
+        res = self.assertSameResponse(POSTS_URL)
+
+        self.assertEqual(len(res.data), 6)
+
+    def test_posts_filtered(self):
+        """Test filtered post lists match the serializer"""
+        tag = Tag.objects.get(name='Casual')
+        item = Item.objects.get(name='Hat')
+
+        self.assertSameResponse(POSTS_URL, {'tags': str(tag.id)})
+        self.assertSameResponse(POSTS_URL, {'items_all': str(item.id)})
+
+    def test_posts_paginated(self):
+        """Test every page of the post list matches the serializer"""
+        res = self.assertSameResponse(POSTS_URL, {'page_size': 4})
+        self.assertSameResponse(res.data['next'])
+
+    def test_tags_and_items(self):
+        """Test the tag and item lists match the serializer"""
+        self.assertSameResponse(TAGS_URL)
+        self.assertSameResponse(TAGS_URL, {'assigned_only': 1})
+        self.assertSameResponse(ITEMS_URL)
+        self.assertSameResponse(ITEMS_URL, {'assigned_only': 1})
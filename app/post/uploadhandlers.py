@@ -0,0 +1,78 @@
+import hashlib
+import io
+
+from django.core.files.uploadhandler import TemporaryFileUploadHandler
+from django.http.multipartparser import MultiPartParserError
+
+from core.images import ImageLimitError, InvalidImageError, \
+    inspect_image, max_upload_size
+
+
+class ImageUploadRejected(MultiPartParserError):
+    """Raised when an upload is rejected before it is fully received"""
+
+
+class BoundedImageUploadHandler(TemporaryFileUploadHandler):
+    """Stream image uploads to disk in chunks and reject bad files early
+
+    Uploads never live in memory. The request size is checked before any
+    data is read, the file size as chunks arrive and the image header as
+    soon as enough bytes are buffered to parse it. The content is hashed
+    on the way in so content addressed storage does not read it again.
+    """
+    header_size = 64 * 2 ** 10
+
+    def handle_raw_input(self, input_data, META, content_length, boundary,
+                         encoding=None):
+        """Reject requests that are too large before reading the body"""
+        if content_length and content_length > \
+                max_upload_size() + self.header_size:
+            raise ImageUploadRejected(
+                f'upload exceeds {max_upload_size()} bytes'
+            )
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.received = 0
+        self.header = b''
+        self.header_checked = False
+        self.digest = hashlib.sha256()
+
+    def receive_data_chunk(self, raw_data, start):
+        self.received += len(raw_data)
+        if self.received > max_upload_size():
+            self._reject(f'upload exceeds {max_upload_size()} bytes')
+
+        if not self.header_checked:
+            self.header += raw_data[:self.header_size - len(self.header)]
+            if len(self.header) >= self.header_size:
+                self._check_header(complete=False)
+
+        self.digest.update(raw_data)
+        super().receive_data_chunk(raw_data, start)
+
+    def file_complete(self, file_size):
+        if not self.header_checked:
+            self._check_header(complete=True)
+
+        file = super().file_complete(file_size)
+        file.content_digest = self.digest.hexdigest()
+        return file
+
+    def _check_header(self, complete):
+        """Validate the buffered header, a header larger than the buffer
+        is left for the serializer to check on the full file"""
+        self.header_checked = True
+        header, self.header = self.header, b''
+        try:
+            inspect_image(io.BytesIO(header))
+        except ImageLimitError as exc:
+            self._reject(str(exc))
+        except InvalidImageError as exc:
+            if complete:
+                self._reject(str(exc))
+
+    def _reject(self, message):
+        """Discard the temporary file and abort the upload"""
+        self.file.close()
+        raise ImageUploadRejected(message)
@@ -0,0 +1,110 @@
+from django.conf import settings
+from django.db import connections
+from django.db.models import Aggregate, CharField, OuterRef, Subquery
+
+from rest_framework.response import Response
+
+from core.models import Post
+
+from post.serializers import build_image_url, image_variant_urls
+
+
+class GroupConcat(Aggregate):
+    """Comma separated concatenation of the values in a group"""
+    function = 'GROUP_CONCAT'
+    output_field = CharField()
+
+
+def related_ids(relation, vendor):
+    """Return a subquery aggregating the related ids of the outer post
+
+    Postgres aggregates into an ordered array, other databases into a
+    comma separated string that `parse_ids` turns into a list.
+    """
+    through = getattr(Post, relation).through
+    column = Post._meta.get_field(relation).m2m_reverse_name()
+    if vendor == 'postgresql':
+        from django.contrib.postgres.aggregates import ArrayAgg
+        aggregate = ArrayAgg(column, ordering=column)
+    else:
+        aggregate = GroupConcat(column)
+
+    return Subquery(
+        through.objects.filter(post_id=OuterRef('pk'))
+        .values('post_id')
+        .annotate(ids=aggregate)
+        .values('ids')
+    )
+
+
+def parse_ids(value):
+    """Return the sorted list of ids aggregated by `related_ids`"""
+    if not value:
+        return []
+    if isinstance(value, str):
+        return sorted(int(id_) for id_ in value.split(','))
+
+    return list(value)
+
+
+class ValuesListMixin:
+    """List action that reads rows with values() and builds plain dicts
+
+    This skips building a model instance and serializer fields per row.
+    Subclasses return the rows from `get_list_values` and turn each row
+    into exactly what their serializer would output in `row_to_data`.
+    Set `POST_VALUES_LIST = False` to list through the serializer.
+    """
+
+    def list(self, request, *args, **kwargs):
+        if not getattr(settings, 'POST_VALUES_LIST', True):
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        rows = self.get_list_values(queryset.prefetch_related(None))
+
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(
+                [self.row_to_data(row) for row in page]
+            )
+
+        return Response([self.row_to_data(row) for row in rows])
+
+    def get_list_values(self, queryset):
+        return queryset.values('id', 'name')
+
+    def row_to_data(self, row):
+        return row
+
+
+class PostValuesListMixin(ValuesListMixin):
+    """Values based list action for posts"""
+
+    def get_list_values(self, queryset):
+        vendor = connections[queryset.db].vendor
+        # Keep the search rank, cursor pagination reads its position from it
+        ranked = ('search_rank',) \
+            if 'search_rank' in queryset.query.annotations else ()
+        return queryset.values(
+            'id',
+            'title',
+            'image',
+            'image_variants_ready',
+            *ranked,
+            item_ids=related_ids('items', vendor),
+            tag_ids=related_ids('tags', vendor),
+        )
+
+    def row_to_data(self, row):
+        image = row['image']
+        return {
+            'id': row['id'],
+            'title': row['title'],
+            'items': parse_ids(row['item_ids']),
+            'tags': parse_ids(row['tag_ids']),
+            'image': build_image_url(image, self.request) if image else None,
+            'image_variants': image_variant_urls(
+                image, row['image_variants_ready'], self.request
+            ),
+        }
@@ -1,18 +1,50 @@
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Count, Exists, OuterRef, Prefetch
+from django.utils.translation import gettext_lazy as _
+
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 from rest_framework import viewsets, mixins, status
-from rest_framework.authentication import TokenAuthentication
 from rest_framework.permissions import IsAuthenticated
 
+from core import similarity
+from core.images import schedule_variants
+from core.recommendations import ITEM, RELATIONS, TAG, feature_key, \
+    split_key, user_recommendations
 from core.models import Tag, Item, Post
 
-from post import serializers
+from user.authentication import CachedTokenAuthentication
+
+from post import autocomplete, serializers
+from post.conditional import ConditionalRetrieveMixin
+from post.pagination import PostCursorPagination
+from post.responsecache import CachedListMixin
+from post.search import search_posts
+from post.uploadhandlers import BoundedImageUploadHandler
+from post.values import PostValuesListMixin, ValuesListMixin
+
 
+def limit_param(request, name, default, maximum):
+    """Return a non negative integer query parameter capped at maximum"""
+    value = request.query_params.get(name, default)
+    try:
+        return max(min(int(value), maximum), 0)
+    except ValueError:
+        raise ValidationError({name: [_('A valid integer is required.')]})
 
-class BasePostAttributeViewSet(viewsets.GenericViewSet, mixins.ListModelMixin, mixins.CreateModelMixin):
+
+class BasePostAttributeViewSet(CachedListMixin, ValuesListMixin,
+                               viewsets.GenericViewSet,
+                               mixins.ListModelMixin,
+                               mixins.CreateModelMixin):
     """Base viewset for user owned post attributes"""
-    authentication_classes = (TokenAuthentication,)
+    authentication_classes = (CachedTokenAuthentication,)
     permission_classes = (IsAuthenticated,)
+    autocomplete_limit = 10
+    autocomplete_max_limit = 50
+    recommendation_limit = 10
 
     def get_queryset(self):
         """Return objects for the current authenticated user only"""
@@ -21,49 +53,217 @@ class BasePostAttributeViewSet(viewsets.GenericViewSet, mixins.ListModelMixin, m
         )
         queryset = self.queryset
         if assigned_only:
-            queryset = queryset.filter(post__isnull=False)
+            queryset = queryset.filter(Exists(self._post_links()))
 
         return queryset.filter(
             user=self.request.user
-        ).order_by('-name').distinct()
+        ).order_by('-name')
+
+    def _post_links(self):
+        """Return the post through rows pointing at the outer object"""
+        through = getattr(Post, self.post_relation).through
+        column = Post._meta.get_field(self.post_relation).m2m_reverse_name()
+
+        return through.objects.filter(**{column: OuterRef('pk')})
+
+    def normalize_query_param(self, name, value):
+        """Return assigned_only as 0 or 1"""
+        if name == 'assigned_only':
+            return str(int(bool(int(value))))
+
+        return value
     
     def perform_create(self, serializer):
         """Create a new tag"""
-        serializer.save(user=self.request.user)
+        try:
+            with transaction.atomic():
+                serializer.save(user=self.request.user)
+        except IntegrityError:
+            # A concurrent request created the same name after validation
+            raise ValidationError({
+                'name': [_('An object with this name already exists.')]
+            })
+
+    @action(methods=['GET'], detail=False)
+    def autocomplete(self, request):
+        """Return the names starting with a prefix, most used first"""
+        prefix = request.query_params.get('q', '')
+        limit = limit_param(
+            request, 'limit', self.autocomplete_limit,
+            self.autocomplete_max_limit
+        )
+
+        names = autocomplete.ranked_names(
+            self.queryset.model, request.user.id
+        )
+        return Response(
+            autocomplete.suggest(names, prefix, limit),
+            status=status.HTTP_200_OK
+        )
+
+    @action(methods=['GET'], detail=True)
+    def recommendations(self, request, pk=None):
+        """Return the items and tags that go best with this object"""
+        obj = self.get_object()
+        k = limit_param(
+            request, 'k', self.recommendation_limit,
+            getattr(settings, 'RECOMMENDATION_TOP_K', 50)
+        )
+        kinds = {relation: kind for kind, relation in RELATIONS}
+        key = feature_key(kinds[self.post_relation], obj.id)
+        pairs = user_recommendations(request.user.id).get(key, [])[:k]
+
+        ids = {ITEM: [], TAG: []}
+        for other, score, count in pairs:
+            kind, id_ = split_key(other)
+            ids[kind].append(id_)
+        names = {
+            kind: dict(
+                model.objects.filter(user=request.user, id__in=ids[kind])
+                .values_list('id', 'name')
+            ) if ids[kind] else {}
+            for kind, model in ((ITEM, Item), (TAG, Tag))
+        }
+        data = {'items': [], 'tags': []}
+        for other, score, count in pairs:
+            kind, id_ = split_key(other)
+            data['items' if kind == ITEM else 'tags'].append({
+                'id': id_,
+                'name': names[kind].get(id_),
+                'score': round(score, 4),
+                'count': count,
+            })
+
+        return Response(data, status=status.HTTP_200_OK)
+
+    @action(methods=['POST'], detail=False)
+    def upsert(self, request):
+        """Return the objects with the given names, creating missing ones"""
+        names = serializers.NameListSerializer(data=request.data)
+        names.is_valid(raise_exception=True)
+        objects = self.queryset.model.objects.get_or_create_names(
+            request.user,
+            names.validated_data['names']
+        )
+        serializer = self.get_serializer(
+            sorted(objects.values(), key=lambda obj: obj.id),
+            many=True
+        )
+
+        return Response(serializer.data, status=status.HTTP_200_OK)
 
 
 class TagViewSet(BasePostAttributeViewSet):
     """Manage tags in the database"""
     queryset = Tag.objects.all()
     serializer_class = serializers.TagSerializer
+    post_relation = 'tags'
+    version_models = ('tag', 'post')
 
 
 class ItemViewSet(BasePostAttributeViewSet):
     """Manage items in the database"""
     queryset = Item.objects.all()
     serializer_class = serializers.ItemSerializer
+    post_relation = 'items'
+    version_models = ('item', 'post')
 
 
-class PostViewSet(viewsets.ModelViewSet):
+class PostViewSet(ConditionalRetrieveMixin, CachedListMixin,
+                  PostValuesListMixin, viewsets.ModelViewSet):
     """Manage posts in the database"""
     serializer_class = serializers.PostSerializer
     queryset = Post.objects.all()
-    authentication_classes = (TokenAuthentication,)
+    authentication_classes = (CachedTokenAuthentication,)
     permission_classes = (IsAuthenticated,)
+    pagination_class = PostCursorPagination
+    version_models = ('post', 'tag', 'item')
+    search_ordering = ('-search_rank', '-id')
+    similar_limit = 10
+    similar_max_limit = 50
+
+    # Query parameter -> (relation, whether every id must match)
+    relation_filters = {
+        'tags': ('tags', False),
+        'tags_any': ('tags', False),
+        'tags_all': ('tags', True),
+        'items_any': ('items', False),
+        'items_all': ('items', True),
+    }
 
     def _params_to_ints(self, qs):
-        """Convert a list of string IDs to a list of integers"""
-        return [int(str_id) for str_id in qs.split(',')]
+        """Convert a list of string IDs to a list of unique integers"""
+        return sorted({int(str_id) for str_id in qs.split(',')})
+
+    def normalize_query_param(self, name, value):
+        """Return related id filters as sorted unique ids"""
+        if name in self.relation_filters:
+            return ','.join(str(id_) for id_ in self._params_to_ints(value))
+
+        return value
 
     def get_queryset(self):
         """Retrieve the posts for the authenticated user"""
-        tags = self.request.query_params.get('tags')
         queryset = self.queryset
-        if tags:
-            tag_ids = self._params_to_ints(tags)
-            queryset = queryset.filter(tags__id__in=tag_ids)
+        for param, (relation, match_all) in self.relation_filters.items():
+            value = self.request.query_params.get(param)
+            if value:
+                queryset = self._filter_related(
+                    queryset,
+                    relation,
+                    self._params_to_ints(value),
+                    match_all
+                )
+
+        queryset = self._prefetch_related(queryset)
+        queryset = queryset.filter(user=self.request.user) \
+            .defer('search_vector')
+        text = self.request.query_params.get('search', '').strip()
+        if text:
+            return search_posts(queryset, text).order_by(*self.search_ordering)
+
+        return queryset.order_by('-id')
+
+    def get_cursor_ordering(self):
+        """Return the ordering cursor pagination pages through"""
+        if self.request.query_params.get('search', '').strip():
+            return self.search_ordering
+
+        return None
+
+    def _filter_related(self, queryset, relation, ids, match_all):
+        """Filter posts linked to any or all of the given related ids
+
+        Both modes read the through table directly, so posts are never
+        duplicated and no DISTINCT is needed. Matching all ids groups the
+        through rows by post and keeps posts linked to every id.
+        """
+        through = getattr(Post, relation).through
+        column = Post._meta.get_field(relation).m2m_reverse_name()
+        links = through.objects.filter(**{f'{column}__in': ids})
+        if match_all:
+            matching = links.values('post_id').annotate(
+                matches=Count(column)
+            ).filter(matches=len(ids)).values('post_id')
+            return queryset.filter(id__in=matching)
+
+        return queryset.filter(Exists(links.filter(post_id=OuterRef('pk'))))
 
-        return queryset.filter(user=self.request.user)
+    def _prefetch_related(self, queryset):
+        """Prefetch the relations the current action serializes"""
+        if self.action == 'retrieve':
+            return queryset.prefetch_related('items', 'tags')
+        elif self.action in ('list', 'similar'):
+            return queryset.prefetch_related(
+                Prefetch(
+                    'items', queryset=Item.objects.only('id').order_by('id')
+                ),
+                Prefetch(
+                    'tags', queryset=Tag.objects.only('id').order_by('id')
+                ),
+            )
+
+        return queryset
 
     def get_serializer_class(self):
         """Return appropriate serializer class"""
@@ -71,6 +271,8 @@ class PostViewSet(viewsets.ModelViewSet):
             return serializers.PostDetailSerializer
         elif self.action == 'upload_image':
             return serializers.PostImageSerializer
+        elif self.action == 'bulk':
+            return serializers.PostBulkSerializer
 
         return self.serializer_class
     
@@ -78,9 +280,45 @@ class PostViewSet(viewsets.ModelViewSet):
         """Create a new post"""
         serializer.save(user=self.request.user)
 
+    @action(methods=['POST'], detail=False)
+    def bulk(self, request):
+        """Create a list of posts in one transaction"""
+        serializer = self.get_serializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+        serializer.save(user=request.user)
+
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    @action(methods=['GET'], detail=True)
+    def similar(self, request, pk=None):
+        """Return the posts with the most similar tags and items"""
+        post = self.get_object()
+        k = limit_param(
+            request, 'k', self.similar_limit, self.similar_max_limit
+        )
+        ranked = similarity.similar_posts(post, k)
+        # Candidates are any of the user's posts, list query parameters
+        # narrowing get_queryset() do not apply to them
+        posts = self._prefetch_related(
+            Post.objects.filter(user=request.user).defer('search_vector')
+        ).in_bulk([post_id for score, post_id in ranked])
+        ranked = [
+            (score, post_id) for score, post_id in ranked if post_id in posts
+        ]
+        serializer = self.get_serializer(
+            [posts[post_id] for score, post_id in ranked],
+            many=True
+        )
+
+        return Response([
+            {**data, 'similarity': round(score, 4)}
+            for (score, post_id), data in zip(ranked, serializer.data)
+        ], status=status.HTTP_200_OK)
+
     @action(methods=['POST'], detail=True, url_path='upload-image')
     def upload_image(self, request, pk=None):
         """Upload an image to a post"""
+        request.upload_handlers = [BoundedImageUploadHandler(request)]
         post = self.get_object()
         serializer = self.get_serializer(
             post,
@@ -88,7 +326,10 @@ class PostViewSet(viewsets.ModelViewSet):
         )
 
         if serializer.is_valid():
-            serializer.save()
+            post = serializer.save(image_variants_ready=False)
+            # A null image clears it, there is nothing to resize
+            if post.image:
+                transaction.on_commit(lambda: schedule_variants(post))
             return Response(
                 serializer.data,
                 status=status.HTTP_200_OK
@@ -0,0 +1,178 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.utils.translation import gettext_lazy as _
+
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+
+class TokenUserCache:
+    """Thread safe LRU cache mapping token keys to user rows with a TTL
+
+    Only the user's field values are stored, every hit builds a fresh user
+    instance so requests never share a mutable model object.
+    """
+
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return the cached user values for a token key or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            expires_at, values = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return values
+
+    def set(self, key, values):
+        """Cache user values for a token key, evicting the oldest entries"""
+        ttl = getattr(settings, 'TOKEN_CACHE_TTL', 60)
+        max_size = getattr(settings, 'TOKEN_CACHE_MAX_SIZE', 10000)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, values)
+            self._entries.move_to_end(key)
+            while len(self._entries) > max_size:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        """Remove a token key from the cache"""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """Remove all entries from the cache"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+token_cache = TokenUserCache()
+
+
+def _shared_cache():
+    """Return the shared cache tier, or None when it is disabled"""
+    alias = getattr(settings, 'TOKEN_CACHE_ALIAS', None)
+    if alias is None:
+        return None
+
+    return caches[alias]
+
+
+def _shared_cache_key(key):
+    """Return the shared cache key for a token without exposing the token"""
+    digest = hashlib.sha256(key.encode()).hexdigest()
+    return f'auth-token:{digest}'
+
+
+def _generation_key(key):
+    return f'{_shared_cache_key(key)}:generation'
+
+
+def _generation(shared, key):
+    """Return the shared generation of a token, creating a missing one"""
+    generation_key = _generation_key(key)
+    generation = shared.get(generation_key)
+    if generation is None:
+        shared.add(generation_key, time.time(), None)
+        generation = shared.get(generation_key)
+
+    return generation
+
+
+def invalidate_token(key):
+    """Drop a token from the local and the shared cache
+
+    With a shared cache the token's generation changes as well, so the
+    local entries of every other process stop matching it.
+    """
+    token_cache.delete(key)
+    shared = _shared_cache()
+    if shared is not None:
+        shared.set(_generation_key(key), time.time(), None)
+        shared.delete(_shared_cache_key(key))
+
+
+def invalidate_user(user):
+    """Drop every token of a user from the local and the shared cache"""
+    keys = Token.objects.filter(user=user).values_list('key', flat=True)
+    for key in keys:
+        invalidate_token(key)
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """Token authentication that caches the token to user lookup
+
+    Lookups go to an in-process LRU cache first and then to the optional
+    shared cache set by `TOKEN_CACHE_ALIAS` before hitting the database.
+    With the shared cache, entries are tagged with the token's generation
+    there and entries of an older generation are ignored, so invalidation
+    reaches every process at once. Without it the local TTL bounds how
+    long other processes may serve a token after it was invalidated.
+    """
+
+    def authenticate_credentials(self, key):
+        shared = _shared_cache()
+        generation = _generation(shared, key) if shared is not None else None
+        entry = token_cache.get(key)
+        if entry is None or entry[0] != generation:
+            entry = None
+            if shared is not None:
+                entry = shared.get(_shared_cache_key(key))
+                if entry is not None and entry[0] != generation:
+                    entry = None
+            if entry is None:
+                entry = (generation, self._load_user_values(key))
+                if shared is not None:
+                    shared.set(
+                        _shared_cache_key(key),
+                        entry,
+                        getattr(settings, 'TOKEN_CACHE_SHARED_TTL', 300)
+                    )
+            token_cache.set(key, entry)
+
+        db, field_values = entry[1]
+        user_model = get_user_model()
+        user = user_model.from_db(
+            db,
+            [field.attname for field in user_model._meta.concrete_fields],
+            field_values
+        )
+        if not user.is_active:
+            raise exceptions.AuthenticationFailed(
+                _('User inactive or deleted.')
+            )
+
+        token = self.get_model()(key=key, user=user)
+        return (user, token)
+
+    def _load_user_values(self, key):
+        """Load the user values for a token key from the database"""
+        model = self.get_model()
+        try:
+            token = model.objects.select_related('user').get(key=key)
+        except model.DoesNotExist:
+            raise exceptions.AuthenticationFailed(_('Invalid token.'))
+
+        user = token.user
+        field_values = tuple(
+            getattr(user, field.attname)
+            for field in user._meta.concrete_fields
+        )
+        return (user._state.db, field_values)
@@ -0,0 +1,27 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from rest_framework.authtoken.models import Token
+
+from user.authentication import invalidate_token, invalidate_user
+
+
+@receiver(post_delete, sender=Token)
+def invalidate_deleted_token(sender, instance, **kwargs):
+    """Stop accepting a token from the cache once it is deleted
+
+    Invalidating before the transaction commits would let a concurrent
+    request cache the old row again under the new generation.
+    """
+    key = instance.key
+    transaction.on_commit(lambda: invalidate_token(key))
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def invalidate_saved_user(sender, instance, created, **kwargs):
+    """Drop cached tokens when a user changes, e.g. is deactivated or
+    changes password"""
+    if not created:
+        transaction.on_commit(lambda: invalidate_user(instance))
@@ -0,0 +1,180 @@
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.test import APIClient
+
+from core.tests.utils import commit_hooks
+
+from user.authentication import CachedTokenAuthentication, token_cache, \
+    TokenUserCache
+
+
+ME_URL = reverse('user:me')
+
+
+class CachedTokenAuthenticationTests(TestCase):
+    """Test the cached token authentication backend"""
+
+    def setUp(self):
+        token_cache.clear()
+        self.user = get_user_model().objects.create_user(
+            email = 'test@outfitted.com',
+            first_name = 'Test',
+            surname = 'von Account',
+            password = 'test1234',
+        )
+        self.token = Token.objects.create(user=self.user)
+        self.auth = CachedTokenAuthentication()
+
+    def tearDown(self):
+        token_cache.clear()
+
+    def test_authenticate_caches_user(self):
+        """Test that a second lookup does not query the database"""
+        user, token = self.auth.authenticate_credentials(self.token.key)
+        self.assertEqual(user, self.user)
+        self.assertEqual(token.key, self.token.key)
+
+        with self.assertNumQueries(0):
+            user, _ = self.auth.authenticate_credentials(self.token.key)
+
+        self.assertEqual(user.email, self.user.email)
+
+    def test_invalid_token(self):
+        """Test that an unknown token fails and is not cached"""
+        with self.assertRaises(AuthenticationFailed):
+            self.auth.authenticate_credentials('notatoken')
+
+        self.assertIsNone(token_cache.get('notatoken'))
+
+    def test_deleted_token_invalidated(self):
+        """Test that a deleted token is no longer accepted"""
+        key = self.token.key
+        self.auth.authenticate_credentials(key)
+        with commit_hooks():
+            self.token.delete()
+
+        with self.assertRaises(AuthenticationFailed):
+            self.auth.authenticate_credentials(key)
+
+    def test_deactivated_user_invalidated(self):
+        """Test that a deactivated user is no longer accepted"""
+        self.auth.authenticate_credentials(self.token.key)
+        self.user.is_active = False
+        with commit_hooks():
+            self.user.save()
+
+        with self.assertRaises(AuthenticationFailed):
+            self.auth.authenticate_credentials(self.token.key)
+
+    def test_password_change_invalidates(self):
+        """Test that changing the password drops the cached entry"""
+        self.auth.authenticate_credentials(self.token.key)
+        self.user.set_password('newpass123')
+        with commit_hooks():
+            self.user.save()
+
+        self.assertIsNone(token_cache.get(self.token.key))
+
+    def test_invalidated_on_commit(self):
+        """Test cached entries are dropped only once the write commits"""
+        self.auth.authenticate_credentials(self.token.key)
+
+        with commit_hooks():
+            self.user.is_active = False
+            self.user.save()
+            self.assertIsNotNone(token_cache.get(self.token.key))
+
+        self.assertIsNone(token_cache.get(self.token.key))
+
+    @override_settings(TOKEN_CACHE_TTL=10)
+    def test_entries_expire(self):
+        """Test that cached entries expire after the TTL"""
+        with patch('time.monotonic', return_value=100):
+            self.auth.authenticate_credentials(self.token.key)
+        with patch('time.monotonic', return_value=111):
+            self.assertIsNone(token_cache.get(self.token.key))
+
+    @override_settings(TOKEN_CACHE_ALIAS='default')
+    def test_shared_cache_tier(self):
+        """Test that the shared tier answers when the local cache misses"""
+        self.auth.authenticate_credentials(self.token.key)
+        token_cache.clear()
+
+        with self.assertNumQueries(0):
+            user, _ = self.auth.authenticate_credentials(self.token.key)
+
+        self.assertEqual(user, self.user)
+        key = self.token.key
+        with commit_hooks():
+            self.token.delete()
+        with self.assertRaises(AuthenticationFailed):
+            self.auth.authenticate_credentials(key)
+        caches['default'].clear()
+
+    @override_settings(TOKEN_CACHE_ALIAS='default')
+    def test_invalidation_reaches_other_processes(self):
+        """Test a token deleted elsewhere stops matching local entries"""
+        key = self.token.key
+        self.auth.authenticate_credentials(key)
+        # Another process deletes the token, this process keeps its entry
+        with patch.object(token_cache, 'delete'), commit_hooks():
+            self.token.delete()
+        self.assertIsNotNone(token_cache.get(key))
+
+        with self.assertRaises(AuthenticationFailed):
+            self.auth.authenticate_credentials(key)
+        caches['default'].clear()
+
+    def test_update_keeps_newer_changes(self):
+        """Test updating the user does not save a stale cached copy"""
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        client.get(ME_URL)
+        # Another process changes the password, the cached entry stays
+        with patch('user.signals.invalidate_user'):
+            self.user.set_password('changed123')
+            self.user.save()
+
+        res = client.patch(ME_URL, {'first_name': 'New'})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.first_name, 'New')
+        self.assertTrue(self.user.check_password('changed123'))
+
+    def test_authenticated_request(self):
+        """Test that the API accepts a cached token"""
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+
+        res = client.get(ME_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        res = client.get(ME_URL)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data['email'], self.user.email)
+
+
+class TokenUserCacheTests(TestCase):
+    """Test the LRU cache behind the token authentication"""
+
+    @override_settings(TOKEN_CACHE_MAX_SIZE=2)
+    def test_least_recently_used_evicted(self):
+        """Test that the least recently used entry is evicted"""
+        cache = TokenUserCache()
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), 1)
+        self.assertEqual(cache.get('c'), 3)
@@ -1,7 +1,10 @@
-from rest_framework import generics, authentication, permissions
+from django.contrib.auth import get_user_model
+
+from rest_framework import generics, permissions
 from rest_framework.authtoken.views import ObtainAuthToken
 from rest_framework.settings import api_settings
 
+from user.authentication import CachedTokenAuthentication
 from user.serializers import UserSerializer, AuthTokenSerialzer
 
 
@@ -17,9 +20,13 @@ class CreateTokenView(ObtainAuthToken):
 class ManageUserView(generics.RetrieveUpdateAPIView):
     """Manage the authenticated user"""
     serializer_class = UserSerializer
-    authentication_classes = (authentication.TokenAuthentication,)
+    authentication_classes = (CachedTokenAuthentication,)
     permission_classes = (permissions.IsAuthenticated,)
 
     def get_object(self):
-        """Retrieve and return authentication user"""
-        return self.request.user
\ No newline at end of file
+        """Retrieve and return authentication user
+
+        The user is loaded again, request.user may come from the token
+        cache and saving a stale copy would revert newer changes.
+        """
+        return get_user_model().objects.get(pk=self.request.user.pk)
\ No newline at end of file